@@ -0,0 +1,184 @@
+"""Boots all six services in one process with local stand-ins for their dependencies.
+
+- Databases: one SQLite file per data service, or one database per service on an
+  embedded Postgres (``pgserver``, installed separately).
+- Redis: a shared fakeredis server behind ``redis.Redis.from_url``,
+  ``redis.asyncio.Redis.from_url`` and the pools ``platform_lib.redis_client`` builds.
+- HTTP: every ``httpx.AsyncClient`` is routed to the in-process ASGI apps by host name,
+  so the gateway -> service and case -> scoring hops run real handlers.
+- Scoring: ``compute_score`` is replaced by a deterministic stub (no random latency or
+  failures) that still emits ``score_updated``.
+- Schema: built from the models and stamped at the migration head, since the migrations
+  themselves are Postgres-only.
+"""
+
+import asyncio
+import os
+import tempfile
+import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType
+from typing import Any, AsyncIterator, Dict, Optional
+
+from benchmarks._services import load_service
+
+# Host names match the services' default *_SERVICE_URL settings.
+SERVICES = {
+    "auth-service": "auth-service",
+    "user-service": "user-service",
+    "case-service": "case-service",
+    "scoring-service": "scoring-service",
+    "audit-telemetry-service": "audit-telemetry-service",
+    "gateway": "gateway",
+}
+DATABASES = {
+    "user-service": "userdb",
+    "case-service": "casedb",
+    "audit-telemetry-service": "auditdb",
+}
+GATEWAY_URL = "http://gateway"
+
+
+def _database_urls(backend: str, workdir: Path) -> Dict[str, str]:
+    if backend == "sqlite":
+        return {
+            service: f"sqlite:///{workdir / f'{db}.sqlite'}" for service, db in DATABASES.items()
+        }
+    try:
+        import pgserver  # type: ignore[import-not-found]
+    except ImportError as exc:
+        raise SystemExit("--db postgres needs the pgserver package (pip install pgserver)") from exc
+    server = pgserver.get_server(str(workdir / "pgdata"), cleanup_mode="stop")
+    for db in DATABASES.values():
+        server.psql(f"DROP DATABASE IF EXISTS {db};")
+        server.psql(f"CREATE DATABASE {db};")
+    socket_dir = workdir / "pgdata"
+    return {
+        service: f"postgresql+psycopg2://postgres@/{db}?host={socket_dir}"
+        for service, db in DATABASES.items()
+    }
+
+
+def create_schema(module: ModuleType) -> None:
+    from alembic.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    # SQLModel.metadata is shared by every loaded service, so each database gets all tables.
+    module.SQLModel.metadata.create_all(module.engine)
+    with module.engine.begin() as connection:
+        MigrationContext.configure(connection).stamp(
+            ScriptDirectory(str(module.MIGRATIONS_DIR)), "heads"
+        )
+
+
+def install_fake_redis() -> None:
+    import fakeredis
+    import redis
+    import redis.asyncio
+
+    server = fakeredis.FakeServer()
+
+    def sync_from_url(url: str, **kwargs: Any) -> Any:
+        return fakeredis.FakeRedis(server=server, **kwargs)
+
+    def async_from_url(url: str, **kwargs: Any) -> Any:
+        return fakeredis.FakeAsyncRedis(server=server, **kwargs)
+
+    def blocking_pool_from_url(url: str, **kwargs: Any) -> Any:
+        # Fake connections never go stale, and their health-check PING recurses.
+        kwargs.pop("health_check_interval", None)
+        return fakeredis.FakeAsyncRedis(
+            server=server, connection_pool_class=redis.asyncio.BlockingConnectionPool, **kwargs
+        ).connection_pool
+
+    redis.Redis.from_url = sync_from_url  # type: ignore[method-assign,assignment]
+    redis.asyncio.Redis.from_url = async_from_url  # type: ignore[method-assign,assignment]
+    redis.asyncio.BlockingConnectionPool.from_url = (  # type: ignore[method-assign]
+        blocking_pool_from_url
+    )
+
+
+def _install_scoring_stub(scoring: ModuleType, latency_ms: float) -> None:
+    async def compute_score(case_id: uuid.UUID, idempotency_key: Optional[str]) -> dict:
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        score = round(0.1 + (case_id.int % 8900) / 10000, 4)
+        await scoring.emit_event(
+            "score_updated",
+            {
+                "case_id": str(case_id),
+                "score": score,
+                "owner": None,
+                "idempotency_key": idempotency_key,
+                "model_version": scoring.MODEL_VERSION,
+                "updated_at": datetime.utcnow().isoformat(),
+            },
+        )
+        return {"case_id": case_id, "score": score, "updated_at": datetime.utcnow()}
+
+    scoring.compute_score = compute_score  # type: ignore[attr-defined]
+
+
+def route_httpx(apps: Dict[str, Any]) -> None:
+    import httpx
+    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+
+    # Instrument first: the services' lifespans would otherwise swap httpx.AsyncClient for the
+    # instrumented class and undo the routing below.
+    HTTPXClientInstrumentor().instrument()
+
+    transports = {host: httpx.ASGITransport(app=app) for host, app in apps.items()}
+
+    class InProcessTransport(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            return await transports[request.url.host].handle_async_request(request)
+
+    transport = InProcessTransport()
+    base = httpx.AsyncClient
+
+    class InProcessClient(base):  # type: ignore[valid-type,misc]
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            kwargs["transport"] = transport
+            super().__init__(*args, **kwargs)
+
+    httpx.AsyncClient = InProcessClient  # type: ignore[misc]
+
+
+@asynccontextmanager
+async def running_platform(
+    db: str = "sqlite", scoring_latency_ms: float = 0.0, workdir: Optional[Path] = None
+) -> AsyncIterator[Dict[str, ModuleType]]:
+    """Load, start and yield the service modules keyed by service name; stop them on exit."""
+    with tempfile.TemporaryDirectory(prefix="platform-bench-") as tmp:
+        root = workdir or Path(tmp)
+        urls = _database_urls(db, root)
+        # Quiet, exporter-free services: the benchmark measures request handling only.
+        # auth-service signs with its HS256 default here, so services accept kid-less tokens.
+        os.environ.update(
+            {
+                "LOG_LEVEL": "ERROR",
+                "TRACE_EXPORTER": "none",
+                "RATE_LIMIT_ENABLED": "false",
+                "JWT_ACCEPT_SHARED_SECRET": "true",
+            }
+        )
+        install_fake_redis()
+        modules: Dict[str, ModuleType] = {}
+        for service in SERVICES:
+            if service in urls:
+                os.environ["DATABASE_URL"] = urls[service]
+            modules[service] = load_service(service)
+            if service in urls:
+                create_schema(modules[service])
+        _install_scoring_stub(modules["scoring-service"], scoring_latency_ms)
+        route_httpx({host: modules[service].app for service, host in SERVICES.items()})
+        audit = modules["audit-telemetry-service"]
+        # Partitions must exist before the first insert on Postgres (no-op on SQLite).
+        await asyncio.to_thread(audit.run_maintenance, audit.engine)
+        async with AsyncExitStack() as stack:
+            for module in modules.values():
+                await stack.enter_async_context(module.app.router.lifespan_context(module.app))
+            await asyncio.gather(*(module.lifespan.wait_ready() for module in modules.values()))
+            yield modules
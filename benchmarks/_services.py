@@ -0,0 +1,52 @@
+import importlib.util
+import statistics
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def load_service(service: str, module_name: str = "main") -> ModuleType:
+    """Import ``services/<service>/app/<module_name>.py`` under a unique module name."""
+    libs = str(ROOT / "libs")
+    if libs not in sys.path:
+        sys.path.insert(0, libs)
+    name = f"{service.replace('-', '_')}_{module_name}"
+    if name in sys.modules:
+        return sys.modules[name]
+    # Other modules import app.main; they get the already-loaded one rather than a copy.
+    main = load_service(service) if module_name != "main" else None
+    service_root = ROOT / "services" / service
+    spec = importlib.util.spec_from_file_location(name, service_root / "app" / f"{module_name}.py")
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load service {service}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    # Every service has its own top-level "app" package; isolate it while this one loads.
+    _forget_app_package()
+    sys.path.insert(0, str(service_root))
+    if main is not None:
+        importlib.import_module("app")
+        sys.modules["app.main"] = main
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(service_root))
+        _forget_app_package()
+    return module
+
+
+def _forget_app_package() -> None:
+    for key in [key for key in sys.modules if key == "app" or key.startswith("app.")]:
+        del sys.modules[key]
+
+
+def percentiles(samples_ms: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples_ms)
+    if len(ordered) < 2:
+        value = ordered[0] if ordered else 0.0
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
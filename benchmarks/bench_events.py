@@ -0,0 +1,69 @@
+"""Encode/decode throughput of the case-events envelope versus the legacy JSON fields.
+
+    python -m benchmarks.bench_events --iterations 200000
+"""
+
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict
+
+from benchmarks._services import ROOT  # noqa: F401  (puts the repo root on sys.path)
+from libs.platform_lib.events import EventEnvelope, decode_event, encode_event
+
+PAYLOADS: Dict[str, dict] = {
+    "case_created": {"case_id": str(uuid.uuid4()), "owner_id": str(uuid.uuid4())},
+    "score_updated": {
+        "case_id": str(uuid.uuid4()),
+        "score": 0.8123,
+        "owner": {
+            "id": str(uuid.uuid4()),
+            "email": "analyst@example.com",
+            "role": "analyst",
+            "full_name": "Analyst Example",
+            "created_at": datetime.utcnow().isoformat(),
+        },
+        "idempotency_key": "case-001",
+        "model_version": "mock-1",
+        "updated_at": datetime.utcnow().isoformat(),
+    },
+}
+
+
+def rate(fn: Callable[[], object], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'event':<16}{'codec':<10}{'bytes':>8}{'encode/s':>14}{'decode/s':>14}")
+    for event_type, payload in PAYLOADS.items():
+        envelope = EventEnvelope(
+            type=event_type, payload=payload, producer="bench", trace_id="f" * 32
+        )
+        packed = {b"event_type": event_type.encode(), b"data": encode_event(envelope)}
+        legacy = {
+            b"event_type": event_type.encode(),
+            b"payload": json.dumps(payload).encode(),
+            b"created_at": datetime.utcnow().isoformat().encode(),
+        }
+        for codec, fields, encode in (
+            ("msgpack", packed, lambda: encode_event(envelope)),
+            ("json", legacy, lambda: json.dumps(payload)),
+        ):
+            size = sum(len(key) + len(value) for key, value in fields.items())
+            encode_rate = rate(encode, args.iterations)
+            decode_rate = rate(lambda: decode_event(fields), args.iterations)
+            print(f"{event_type:<16}{codec:<10}{size:>8}{encode_rate:>14,.0f}{decode_rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
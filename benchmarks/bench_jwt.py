@@ -0,0 +1,85 @@
+"""Sign and verify throughput per JWT algorithm, and the cost of platform_lib's decode path.
+
+``jose`` rows call python-jose directly with a pre-parsed key; ``decode_jwt_token`` rows go
+through the shared verifier (header parse, `kid` lookup in the cached key set, timing hook).
+RS256 is shown for comparison only; the key set accepts ES256. python-jose has no EdDSA.
+
+    python -m benchmarks.bench_jwt --iterations 5000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Tuple
+
+from jose import jwk, jwt
+
+from benchmarks._services import ROOT  # noqa: F401  (puts the repo root on sys.path)
+from libs.platform_lib import auth
+from libs.platform_lib.auth import decode_jwt_token, key_set
+
+SECRET = "bench-secret"
+
+
+def rate(fn: Callable[[], object], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - started)
+
+
+def private_key(algorithm: str) -> Tuple[Any, Any]:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+    if algorithm == "HS256":
+        key = jwk.construct(SECRET, algorithm)
+        return key, key
+    generated: Any = (
+        ec.generate_private_key(ec.SECP256R1())
+        if algorithm == "ES256"
+        else rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    )
+    pem = generated.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    key = jwk.construct(pem, algorithm)
+    return key, key.public_key()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5_000)
+    args = parser.parse_args()
+
+    # The HS256 row measures the legacy kid-less path, which is off by default.
+    auth.JWT_SECRET = SECRET
+    auth.JWT_ACCEPT_SHARED_SECRET = True
+    claims: Dict[str, Any] = {
+        "sub": "analyst@example.com",
+        "role": "analyst",
+        "exp": datetime.utcnow() + timedelta(hours=1),
+    }
+    print(f"{'algorithm':<10}{'sign/s':>12}{'verify/s':>12}{'decode_jwt_token/s':>20}")
+    for algorithm in ("HS256", "ES256", "RS256"):
+        signing, verifying = private_key(algorithm)
+        headers = {} if algorithm == "HS256" else {"kid": algorithm.lower()}
+        token = jwt.encode(claims, signing, algorithm=algorithm, headers=headers)
+        sign = rate(
+            lambda: jwt.encode(claims, signing, algorithm=algorithm, headers=headers),
+            args.iterations,
+        )
+        verify = rate(lambda: jwt.decode(token, verifying, algorithms=[algorithm]), args.iterations)
+        shared = "-"
+        if algorithm != "RS256":
+            if headers:
+                public = {**verifying.to_dict(), "kid": headers["kid"], "alg": algorithm}
+                key_set.load({"keys": [public]})
+            shared = f"{rate(lambda: decode_jwt_token(token), args.iterations):,.0f}"
+        print(f"{algorithm:<10}{sign:>12,.0f}{verify:>12,.0f}{shared:>20}")
+
+
+if __name__ == "__main__":
+    main()
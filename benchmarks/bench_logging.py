@@ -0,0 +1,128 @@
+"""Per-request cost of HTTP access logging, before and after the queue-based pipeline.
+
+Each configuration serves the same trivial endpoint in-process (httpx ASGI transport) and
+reports the best-of-rounds mean request time and the overhead relative to an app without
+logging. ``--write-delay-us`` makes every write block, as a backpressured stdout pipe does.
+
+    python -m benchmarks.bench_logging --requests 5000 --sink /tmp/bench.log --write-delay-us 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import IO, Any, Callable, Dict, Optional
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks._services import ROOT  # noqa: F401  (puts the repo root on sys.path)
+from libs.platform_lib.http_logging import HttpLoggingMiddleware
+from libs.platform_lib.logging import configure_logging, stop_logging
+
+
+class LegacyJsonFormatter(logging.Formatter):
+    # The formatter as it was before the queue pipeline, for comparison.
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "logger": record.name,
+            "service_name": os.getenv("SERVICE_NAME", "unknown"),
+        }
+        if hasattr(record, "request_id"):
+            payload["request_id"] = record.request_id
+        if hasattr(record, "trace_id"):
+            payload["trace_id"] = record.trace_id
+        return json.dumps(payload)
+
+
+class SlowSink:
+    def __init__(self, sink: IO[str], delay_s: float) -> None:
+        self.sink = sink
+        self.delay_s = delay_s
+
+    def write(self, text: str) -> int:
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        return self.sink.write(text)
+
+    def flush(self) -> None:
+        self.sink.flush()
+
+
+def build_app(sample_rate: Optional[float]) -> FastAPI:
+    app = FastAPI()
+    if sample_rate is not None:
+        app.add_middleware(HttpLoggingMiddleware, sample_rate=sample_rate)
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"ok": True}
+
+    return app
+
+
+async def mean_request_ms(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(requests // 10, 200)):
+            await client.get("/ping")
+        started = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/ping")
+    return (time.perf_counter() - started) * 1000 / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--sink", default=os.devnull, help="file the log lines are written to")
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    parser.add_argument("--write-delay-us", type=float, default=0.0)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    with open(args.sink, "a", encoding="utf-8") as target:
+        sink: Any = SlowSink(target, args.write_delay_us / 1_000_000)
+
+        def legacy() -> None:
+            handler = logging.StreamHandler(sink)
+            handler.setFormatter(LegacyJsonFormatter())
+            root.handlers = [handler]
+
+        def pipeline() -> None:
+            configure_logging(sink)
+            root.setLevel(logging.INFO)
+
+        configs: Dict[str, tuple[Callable[[], None], Optional[float]]] = {
+            "no logging": (lambda: None, None),
+            "sync stream + json": (legacy, 1.0),
+            "queue + orjson": (pipeline, 1.0),
+            f"queue + sampled {args.sample_rate:g}": (pipeline, args.sample_rate),
+            "middleware, nothing sampled": (pipeline, 0.0),
+        }
+        # Rounds interleave the configurations so drift on a busy machine hits all of them.
+        results: Dict[str, list] = {name: [] for name in configs}
+        for _ in range(args.rounds):
+            for name, (setup, sample_rate) in configs.items():
+                root.handlers = []
+                setup()
+                mean_ms = asyncio.run(mean_request_ms(build_app(sample_rate), args.requests))
+                results[name].append(mean_ms)
+                stop_logging()
+        baseline = min(results["no logging"])
+        print(f"{'configuration':<30}{'ms/request':>12}{'overhead µs':>14}")
+        for name, samples in results.items():
+            best = min(samples)
+            print(f"{name:<30}{best:>12.3f}{(best - baseline) * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
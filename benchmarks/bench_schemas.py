@@ -0,0 +1,72 @@
+"""Validation throughput of jsonschema.validate versus the precompiled schema registry.
+
+    python -m benchmarks.bench_schemas --iterations 20000
+"""
+
+import argparse
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+import jsonschema
+
+from benchmarks._services import ROOT  # noqa: F401  (puts the repo root on sys.path)
+from libs.platform_lib.schemas import SchemaRegistry, load_schema
+
+INSTANCES: Dict[str, Dict[str, Any]] = {
+    "case_v2": {
+        "id": str(uuid.uuid4()),
+        "title": "Suspicious transfer",
+        "description": "Flagged by rules engine",
+        "status": "OPEN",
+        "priority": "high",
+        "score": 0.42,
+        "owner_id": str(uuid.uuid4()),
+        "created_at": datetime.utcnow().isoformat(),
+    },
+    "score_updated_v1": {
+        "case_id": str(uuid.uuid4()),
+        "score": 0.8123,
+        "idempotency_key": "case-001",
+        "model_version": "mock-1",
+        "updated_at": datetime.utcnow().isoformat(),
+    },
+}
+
+
+def rate(fn: Callable[[], object], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    registry = SchemaRegistry()
+    print(f"{'schema':<18}{'jsonschema/s':>14}{'compiled/s':>14}{'batch/s':>14}{'speedup':>10}")
+    for name, instance in INSTANCES.items():
+        schema = load_schema(name)
+        validator = registry.validator(name)
+        batch = [instance] * args.batch
+        baseline = rate(lambda: jsonschema.validate(instance, schema), args.iterations)
+        compiled = rate(lambda: validator(instance), args.iterations)
+        batched = (
+            rate(
+                lambda: registry.validate_batch(name, batch), max(args.iterations // args.batch, 1)
+            )
+            * args.batch
+        )
+        print(
+            f"{name:<18}{baseline:>14,.0f}{compiled:>14,.0f}{batched:>14,.0f}"
+            f"{compiled / baseline:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
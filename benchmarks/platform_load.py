@@ -0,0 +1,197 @@
+"""End-to-end load test of the platform through the gateway, all services in-process.
+
+Each virtual user logs in once, then repeatedly renews its access token with the refresh
+token, creates a case, polls it (revalidating with If-None-Match) and lists the audit log.
+Per-route throughput and p50/p95/p99 are printed and compared against a stored baseline; a
+regression beyond ``--tolerance`` exits 1, and a missing baseline exits 2::
+
+    python -m benchmarks.platform_load --concurrency 16 --duration 20
+    python -m benchmarks.platform_load --db postgres --save-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks._platform import GATEWAY_URL, running_platform
+from benchmarks._services import ROOT, percentiles
+
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baselines" / "platform_load.json"
+LOGIN = {"username": "analyst@example.com", "password": "analyst123"}
+
+
+class Recorder:
+    def __init__(self, warmup_until: float) -> None:
+        self.warmup_until = warmup_until
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def call(
+        self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs: Any
+    ) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if started >= self.warmup_until:
+            self.samples[route].append(elapsed_ms)
+            if response is None or response.status_code >= 400:
+                self.errors[route] += 1
+        return response
+
+
+async def virtual_user(
+    client: httpx.AsyncClient, recorder: Recorder, deadline: float, polls: int
+) -> None:
+    refresh_token: Optional[str] = None
+    while time.perf_counter() < deadline:
+        if refresh_token is None:
+            tokens = await recorder.call(
+                client, "POST /v1/auth/login", "POST", "/v1/auth/login", data=LOGIN
+            )
+        else:
+            tokens = await recorder.call(
+                client,
+                "POST /v1/auth/refresh",
+                "POST",
+                "/v1/auth/refresh",
+                json={"refresh_token": refresh_token},
+            )
+        if tokens is None or tokens.status_code != 200:
+            refresh_token = None
+            continue
+        refresh_token = tokens.json()["refresh_token"]
+        headers = {"Authorization": f"Bearer {tokens.json()['access_token']}"}
+        created = await recorder.call(
+            client,
+            "POST /v1/cases",
+            "POST",
+            "/v1/cases",
+            json={"title": "load test", "owner_id": str(uuid.uuid4())},
+            headers={**headers, "Idempotency-Key": str(uuid.uuid4())},
+        )
+        if created is not None and created.status_code == 200:
+            case_url = f"/v1/cases/{created.json()['id']}"
+            etag: Optional[str] = None
+            for _ in range(polls):
+                poll_headers = dict(headers)
+                if etag:
+                    poll_headers["If-None-Match"] = etag
+                polled = await recorder.call(
+                    client, "GET /v1/cases/{id}", "GET", case_url, headers=poll_headers
+                )
+                if polled is not None:
+                    etag = polled.headers.get("etag", etag)
+        await recorder.call(
+            client, "GET /v1/audit", "GET", "/v1/audit", params={"limit": 50}, headers=headers
+        )
+
+
+def summarize(recorder: Recorder, seconds: float) -> Dict[str, Dict[str, float]]:
+    routes: Dict[str, Dict[str, float]] = {}
+    for route, samples in sorted(recorder.samples.items()):
+        routes[route] = {
+            "count": len(samples),
+            "errors": recorder.errors[route],
+            "rps": len(samples) / seconds,
+            **percentiles(samples),
+        }
+    return routes
+
+
+def print_report(routes: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'route':<24}{'count':>8}{'errors':>8}{'req/s':>10}", end="")
+    print(f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route, stats in routes.items():
+        print(
+            f"{route:<24}{stats['count']:>8.0f}{stats['errors']:>8.0f}{stats['rps']:>10.1f}"
+            f"{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}"
+        )
+
+
+def compare(
+    routes: Dict[str, Dict[str, float]], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    regressions = []
+    print(f"\n{'route':<24}{'req/s Δ':>10}{'p95 Δ':>10}{'p99 Δ':>10}")
+    for route, stats in routes.items():
+        before = baseline["routes"].get(route)
+        if not before:
+            continue
+        rps_delta = stats["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+        p95_delta = stats["p95"] / before["p95"] - 1 if before["p95"] else 0.0
+        p99_delta = stats["p99"] / before["p99"] - 1 if before["p99"] else 0.0
+        flag = ""
+        if rps_delta < -tolerance or p95_delta > tolerance:
+            regressions.append(route)
+            flag = "  REGRESSION"
+        print(f"{route:<24}{rps_delta:>+10.1%}{p95_delta:>+10.1%}{p99_delta:>+10.1%}{flag}")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    async with running_platform(db=args.db, scoring_latency_ms=args.scoring_latency_ms):
+        async with httpx.AsyncClient(base_url=GATEWAY_URL, timeout=30.0) as client:
+            started = time.perf_counter()
+            warmup_until = started + args.warmup
+            deadline = warmup_until + args.duration
+            recorder = Recorder(warmup_until)
+            await asyncio.gather(
+                *(
+                    virtual_user(client, recorder, deadline, args.polls)
+                    for _ in range(args.concurrency)
+                )
+            )
+            measured = time.perf_counter() - warmup_until
+    return summarize(recorder, measured)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds first")
+    parser.add_argument("--polls", type=int, default=3, help="case polls per iteration")
+    parser.add_argument("--db", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--scoring-latency-ms", type=float, default=0.0)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    routes = asyncio.run(run(args))
+    print_report(routes)
+    config = {
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "polls": args.polls,
+        "db": args.db,
+        "scoring_latency_ms": args.scoring_latency_ms,
+    }
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({"config": config, "routes": routes}, indent=2) + "\n")
+        print(f"\nbaseline written to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"\nno baseline at {args.baseline}; record one with --save-baseline", file=sys.stderr)
+        sys.exit(2)
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("config") != config:
+        print(f"\nwarning: baseline was recorded with {baseline.get('config')}")
+    if compare(routes, baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
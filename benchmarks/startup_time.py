@@ -0,0 +1,137 @@
+"""Cold-start time of each service, from a fresh interpreter to a passing readiness check.
+
+Every run starts a new Python process per service and reports three milestones: the module
+import, the lifespan handing control back (the process is live), and readiness (every
+dependency open and the migration check passed). Databases are SQLite files, or one database
+per service on an embedded ``pgserver`` with ``--db postgres``; Redis is fakeredis and peers
+are stubbed, as in ``benchmarks.platform_load``::
+
+    python -m benchmarks.startup_time --runs 5
+    python -m benchmarks.startup_time --db postgres --service case-service
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks._platform import (
+    SERVICES,
+    _database_urls,
+    create_schema,
+    install_fake_redis,
+    route_httpx,
+)
+from benchmarks._services import ROOT, load_service
+
+MILESTONES = ("import", "live", "ready")
+
+
+async def _stub_peer(scope: Dict[str, Any], receive: Any, send: Any) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def measure(service: str) -> Dict[str, Any]:
+    # Patched before the import so module-level clients are fake; this preloads redis-py.
+    install_fake_redis()
+    started = time.perf_counter()
+    module = load_service(service)
+    imported = time.perf_counter()
+    route_httpx({host: _stub_peer for host in SERVICES.values()})
+    async with module.app.router.lifespan_context(module.app):
+        live = time.perf_counter()
+        await module.lifespan.wait_ready()
+        ready = time.perf_counter()
+    dependencies = {
+        name: seconds * 1000
+        for name, seconds in module.lifespan.durations.items()
+        if name != "ready"
+    }
+    return {
+        "import": (imported - started) * 1000,
+        "live": (live - started) * 1000,
+        "ready": (ready - started) * 1000,
+        "dependencies": dependencies,
+    }
+
+
+def run_child(service: str, database_url: str) -> Dict[str, Any]:
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "LOG_LEVEL": "ERROR",
+        "TRACE_EXPORTER": "none",
+    }
+    if database_url:
+        env["DATABASE_URL"] = database_url
+    result = subprocess.run(  # nosec B603 - fixed argv, same interpreter
+        [sys.executable, "-m", "benchmarks.startup_time", "--child", service],
+        env=env,
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def prepare(db: str, workdir: Path) -> Dict[str, str]:
+    urls = _database_urls(db, workdir)
+    for service, url in urls.items():
+        os.environ["DATABASE_URL"] = url
+        create_schema(load_service(service))
+    return urls
+
+
+def print_report(results: Dict[str, List[Dict[str, Any]]]) -> None:
+    print(f"{'service':<26}" + "".join(f"{name + ' ms':>12}" for name in MILESTONES), end="")
+    print("   slowest dependency")
+    for service, runs in results.items():
+        medians = [statistics.median(run[name] for run in runs) for name in MILESTONES]
+        dependencies: Dict[str, List[float]] = {}
+        for run in runs:
+            for name, value in run["dependencies"].items():
+                dependencies.setdefault(name, []).append(value)
+        slowest = max(
+            ((name, statistics.median(values)) for name, values in dependencies.items()),
+            key=lambda item: item[1],
+            default=None,
+        )
+        line = f"{service:<26}" + "".join(f"{value:>12.1f}" for value in medians)
+        if slowest:
+            line += f"   {slowest[0]} ({slowest[1]:.1f} ms)"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3, help="cold starts per service")
+    parser.add_argument("--db", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--service", action="append", choices=list(SERVICES))
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(measure(args.child))))
+        return
+    services = args.service or list(SERVICES)
+    with tempfile.TemporaryDirectory(prefix="startup-bench-") as tmp:
+        urls = prepare(args.db, Path(tmp))
+        results = {
+            service: [run_child(service, urls.get(service, "")) for _ in range(args.runs)]
+            for service in services
+        }
+    print_report(results)
+    print(f"\nmedian of {args.runs} cold starts per service ({args.db})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,34 @@
 """Shared utilities for services."""
 
-from .auth import decode_jwt_token, require_role
-from .http_logging import HttpLoggingMiddleware
-from .logging import configure_logging
-from .request_id import request_id_middleware
-from .schemas import load_schema
-from .tracing import configure_tracing
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Re-exports resolve on first access so that importing one submodule (e.g. platform_lib.auth)
+# does not pull in OpenTelemetry, the schema registry and the rest.
+_EXPORTS = {
+    "configure_logging": ".logging",
+    "HttpLoggingMiddleware": ".http_logging",
+    "decode_jwt_token": ".auth",
+    "require_role": ".auth",
+    "request_id_middleware": ".request_id",
+    "load_schema": ".schemas",
+    "configure_tracing": ".tracing",
+}
+
+if TYPE_CHECKING:
+    from .auth import decode_jwt_token, require_role
+    from .http_logging import HttpLoggingMiddleware
+    from .logging import configure_logging
+    from .request_id import request_id_middleware
+    from .schemas import load_schema
+    from .tracing import configure_tracing
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+
 
 __all__ = [
     "configure_logging",
@@ -1,15 +1,135 @@
+import asyncio
+import logging
 import os
-from typing import Callable, Dict, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, Request, status
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
+
+from .lifespan import Dependency
+from .timing import timed
+
+if TYPE_CHECKING:
+    import httpx
+
+# auth-service's JWKS document. When unset, only shared-secret (HS256) tokens verify, unless
+# keys are loaded in-process (auth-service publishes its own signing keys this way).
+JWKS_URL = os.getenv("JWKS_URL", "")
+JWKS_REFRESH_SECONDS = float(os.getenv("JWKS_REFRESH_SECONDS", "300"))
+# An unknown `kid` triggers an early refresh, at most this often, so a freshly rotated key is
+# picked up without letting arbitrary tokens drive traffic to auth-service.
+JWKS_MIN_REFRESH_SECONDS = float(os.getenv("JWKS_MIN_REFRESH_SECONDS", "10"))
+ASYMMETRIC_ALGORITHMS = ("ES256",)
+# Tokens without a `kid` are the legacy HS256 tokens signed with JWT_SECRET. They are rejected
+# unless this rollout flag is set for deployments whose auth-service still signs HS256; the flag
+# and this path go once no deployment does.
+JWT_ACCEPT_SHARED_SECRET = os.getenv("JWT_ACCEPT_SHARED_SECRET", "false").lower() == "true"
+JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+
+logger = logging.getLogger("auth")
+
+
+class KeySet(Dependency):
+    """Public verification keys by `kid`, fetched from JWKS_URL and refreshed in the background.
+
+    Lookups are a dict read; the network is only touched by `open` and `refresh_forever`.
+    """
+
+    name = "jwks"
+
+    def __init__(
+        self,
+        url: str = JWKS_URL,
+        refresh_seconds: float = JWKS_REFRESH_SECONDS,
+        min_refresh_seconds: float = JWKS_MIN_REFRESH_SECONDS,
+    ) -> None:
+        self.url = url
+        self.refresh_seconds = refresh_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self._keys: Dict[str, Tuple[Any, str]] = {}
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def get(self, kid: str) -> Optional[Tuple[Any, str]]:
+        return self._keys.get(kid)
+
+    def load(self, jwks: Dict[str, Any]) -> None:
+        keys = {}
+        for entry in jwks.get("keys", []):
+            algorithm = entry.get("alg")
+            # Only asymmetric keys: an "oct" entry must never turn into an HMAC secret.
+            if "kid" in entry and algorithm in ASYMMETRIC_ALGORITHMS:
+                keys[entry["kid"]] = (jwk.construct(entry, algorithm), algorithm)
+        # Swapped in one assignment so concurrent lookups see the old or the new set.
+        self._keys = keys
+
+    async def fetch(self) -> None:
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(timeout=5.0)
+        response = await self._client.get(self.url)
+        response.raise_for_status()
+        self.load(response.json())
+        logger.info("jwks_refreshed keys=%s", ",".join(sorted(self._keys)))
+
+    async def open(self) -> None:
+        if not self.url:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        await self.fetch()
+
+    async def refresh_forever(self) -> None:
+        if not self.url or self._wake is None:
+            return
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.refresh_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.fetch()
+            except Exception as exc:
+                # Keep verifying with the cached keys until auth-service answers again.
+                logger.warning("jwks_refresh_failed error=%s", exc)
+            await asyncio.sleep(self.min_refresh_seconds)
+
+    def request_refresh(self) -> None:
+        # Called from request handlers, which may run in the threadpool.
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+key_set = KeySet()
+
+
+def _decode(token: str) -> Dict:
+    kid = jwt.get_unverified_header(token).get("kid")
+    if kid is None:
+        if not JWT_ACCEPT_SHARED_SECRET:
+            raise JWTError("Shared-secret tokens are disabled")
+        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    entry = key_set.get(kid)
+    if entry is None:
+        key_set.request_refresh()
+        raise JWTError("Unknown key id")
+    key, algorithm = entry
+    return jwt.decode(token, key, algorithms=[algorithm])
 
 
 def decode_jwt_token(token: str) -> Dict:
-    secret = os.getenv("JWT_SECRET", "dev-secret")
-    algorithm = os.getenv("JWT_ALGORITHM", "HS256")
     try:
-        return jwt.decode(token, secret, algorithms=[algorithm])
+        with timed("jwt_decode"):
+            return _decode(token)
     except JWTError as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
@@ -0,0 +1,227 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from prometheus_client import Counter, Gauge
+
+from .events import TYPE_FIELD, EventDecodeError, EventEnvelope, decode_event
+from .streams import case_event_streams
+
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+SSE_MAX_SUBSCRIBERS = int(os.getenv("SSE_MAX_SUBSCRIBERS", "10000"))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+BROADCAST_READ_COUNT = int(os.getenv("BROADCAST_READ_COUNT", "500"))
+BROADCAST_BLOCK_MS = int(os.getenv("BROADCAST_BLOCK_MS", "5000"))
+
+SUBSCRIBERS = Gauge("event_subscribers", "Open event stream subscriptions in this process")
+DELIVERED = Counter("event_subscriber_messages_total", "Events queued to subscribers", ["type"])
+DROPPED_SUBSCRIBERS = Counter(
+    "event_subscribers_dropped_total", "Subscriptions closed because the client fell behind"
+)
+
+logger = logging.getLogger("broadcast")
+
+
+class TooManySubscribers(RuntimeError):
+    pass
+
+
+class Subscription:
+    def __init__(self, case_id: Optional[str], owner_id: Optional[str], queue_size: int) -> None:
+        self.case_id = case_id
+        self.owner_id = owner_id
+        # None marks the end: the broadcaster stopped or this subscriber overflowed.
+        self.queue: "asyncio.Queue[Optional[EventEnvelope]]" = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+    async def events(
+        self, heartbeat: float = SSE_HEARTBEAT_SECONDS
+    ) -> AsyncIterator[Optional[EventEnvelope]]:
+        """Yields events, and None after `heartbeat` idle seconds so the caller can ping."""
+        while True:
+            try:
+                envelope = await asyncio.wait_for(self.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if envelope is None:
+                return
+            yield envelope
+
+
+def _owner_of(payload: Dict[str, Any]) -> Optional[str]:
+    owner = payload.get("owner")
+    return payload.get("owner_id") or (owner.get("id") if isinstance(owner, dict) else None)
+
+
+class EventBroadcaster:
+    """Fans events from the case event streams out to in-process subscribers.
+
+    One XREAD loop per process, however many clients are connected: subscribers are indexed
+    by case and owner id, so an event costs a dict lookup rather than a scan of every
+    connection. A subscriber whose queue is full is closed instead of blocking the others;
+    its client reconnects.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        event_types: Iterable[str],
+        streams: Optional[List[str]] = None,
+        queue_size: int = SSE_QUEUE_SIZE,
+        max_subscribers: int = SSE_MAX_SUBSCRIBERS,
+    ) -> None:
+        # A redis.asyncio client without decode_responses (envelopes are msgpack).
+        self.client = client
+        self.event_types = {event_type.encode("utf-8") for event_type in event_types}
+        self.streams = streams or case_event_streams()
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._all: Set[Subscription] = set()
+        self._by_case: Dict[str, Set[Subscription]] = {}
+        self._by_owner: Dict[str, Set[Subscription]] = {}
+        self._count = 0
+
+    def subscribe(
+        self, case_id: Optional[str] = None, owner_id: Optional[str] = None
+    ) -> Subscription:
+        if self._count >= self.max_subscribers:
+            raise TooManySubscribers(f"{self._count} subscribers already connected")
+        subscription = Subscription(case_id, owner_id, self.queue_size)
+        self._index(subscription).add(subscription)
+        self._count += 1
+        SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        index = self._index(subscription)
+        if subscription not in index:
+            return
+        index.discard(subscription)
+        for key, table in (
+            (subscription.case_id, self._by_case),
+            (subscription.owner_id, self._by_owner),
+        ):
+            if key is not None and not table.get(key, True):
+                del table[key]
+        self._count -= 1
+        SUBSCRIBERS.dec()
+
+    def _index(self, subscription: Subscription) -> Set[Subscription]:
+        # A subscription filtering on both ids is indexed by case and checked for owner.
+        if subscription.case_id is not None:
+            return self._by_case.setdefault(subscription.case_id, set())
+        if subscription.owner_id is not None:
+            return self._by_owner.setdefault(subscription.owner_id, set())
+        return self._all
+
+    def publish(self, envelope: EventEnvelope) -> None:
+        case_id = envelope.payload.get("case_id")
+        owner_id = _owner_of(envelope.payload)
+        targets = [
+            *self._by_case.get(str(case_id), ()),
+            *self._by_owner.get(str(owner_id), ()),
+            *self._all,
+        ]
+        for subscription in targets:
+            if subscription.owner_id is not None and subscription.owner_id != owner_id:
+                continue
+            try:
+                subscription.queue.put_nowait(envelope)
+                DELIVERED.labels(envelope.type).inc()
+            except asyncio.QueueFull:
+                self._drop(subscription)
+
+    def _drop(self, subscription: Subscription) -> None:
+        subscription.overflowed = True
+        DROPPED_SUBSCRIBERS.inc()
+        self._end(subscription)
+
+    def _end(self, subscription: Subscription) -> None:
+        self.unsubscribe(subscription)
+        # Make room for the end marker; an overflowed client has missed events anyway.
+        while subscription.overflowed and not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        try:
+            subscription.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    async def _start_ids(self) -> Dict[str, Any]:
+        # Resolved once: re-sending "$" on every XREAD would skip entries added in between.
+        ids = {}
+        for stream in self.streams:
+            last = await self.client.xrevrange(stream, count=1)
+            ids[stream] = last[0][0] if last else "0-0"
+        return ids
+
+    async def run(self) -> None:
+        ids: Optional[Dict[str, Any]] = None
+        try:
+            while True:
+                try:
+                    if ids is None:
+                        ids = await self._start_ids()
+                    response = await self.client.xread(
+                        ids, count=BROADCAST_READ_COUNT, block=BROADCAST_BLOCK_MS
+                    )
+                except Exception:
+                    logger.exception("broadcast_read_failed")
+                    await asyncio.sleep(1)
+                    continue
+                for stream, messages in response or []:
+                    key = stream.decode("utf-8") if isinstance(stream, bytes) else stream
+                    for message_id, fields in messages:
+                        ids[key] = message_id
+                        self._dispatch(fields)
+        finally:
+            self.close()
+
+    def _dispatch(self, fields: Dict[Any, Any]) -> None:
+        # Routed on the plain event_type field; other event types are never decoded.
+        event_type = fields.get(TYPE_FIELD.encode("utf-8"), fields.get(TYPE_FIELD))
+        if isinstance(event_type, str):
+            event_type = event_type.encode("utf-8")
+        if event_type not in self.event_types or not self._count:
+            return
+        try:
+            envelope = decode_event(fields)
+        except EventDecodeError:
+            logger.warning("broadcast_undecodable_event type=%s", event_type)
+            return
+        self.publish(envelope)
+
+    def close(self) -> None:
+        subscriptions = list(self._all)
+        for table in (self._by_case, self._by_owner):
+            for subscribers in table.values():
+                subscriptions.extend(subscribers)
+        for subscription in subscriptions:
+            self._end(subscription)
+
+
+def sse_message(envelope: EventEnvelope) -> bytes:
+    data = json.dumps(
+        {**envelope.payload, "occurred_at": envelope.occurred_at}, separators=(",", ":")
+    )
+    return f"event: {envelope.type}\ndata: {data}\n\n".encode("utf-8")
+
+
+SSE_HEARTBEAT = b": keepalive\n\n"
+
+
+async def sse_stream(
+    broadcaster: EventBroadcaster, subscription: Subscription
+) -> AsyncIterator[bytes]:
+    try:
+        # Sent at once so clients (and the gateway) see headers and know the stream is live.
+        yield b"retry: 3000\n\n"
+        async for envelope in subscription.events():
+            yield SSE_HEARTBEAT if envelope is None else sse_message(envelope)
+        if subscription.overflowed:
+            # Events were missed; the client should re-read current state after reconnecting.
+            yield b"event: overflow\ndata: {}\n\n"
+    finally:
+        broadcaster.unsubscribe(subscription)
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._evict()
+
+    def _evict(self) -> None:
+        now = self._clock()
+        while self._entries:
+            oldest_key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[oldest_key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight(Generic[V]):
+    """Merges concurrent calls for the same key into a single in-flight computation.
+
+    If the caller running the computation is cancelled, its waiters are not: the first of them
+    to wake starts the computation again and the rest wait for it.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, "asyncio.Future[V]"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[V]]) -> V:
+        while (future := self._inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not future.cancelled() or (task is not None and task.cancelling()):
+                    raise
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so an unobserved failure does not log "exception never retrieved".
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+
+class CachedLoader(Generic[V]):
+    """TTL cache in front of a SingleFlight: hits skip work, concurrent misses share it."""
+
+    def __init__(self, cache: TTLCache[V]) -> None:
+        self.cache = cache
+        self._flight: SingleFlight[V] = SingleFlight()
+
+    async def get_or_load(self, key: Hashable, fn: Callable[[], Awaitable[V]]) -> V:
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        async def _load() -> V:
+            value = await fn()
+            self.cache.set(key, value)
+            return value
+
+        return await self._flight.do(key, _load)
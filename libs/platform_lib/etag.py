@@ -0,0 +1,46 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Iterable, Optional, Tuple, Union
+
+from fastapi import Request, Response
+
+Version = Union[int, datetime]
+
+
+def _version_text(version: Version) -> str:
+    return version.isoformat() if isinstance(version, datetime) else str(version)
+
+
+def entity_etag(resource: str, entity_id: Any, version: Version) -> str:
+    # The resource name covers the representation (e.g. "case.v1" vs "case.v2").
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{resource}|{entity_id}|{_version_text(version)}".encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def collection_etag(resource: str, items: Iterable[Tuple[Any, Version]], variant: str = "") -> str:
+    # Hashes (id, version) pairs in response order, so additions, removals, edits and
+    # reordering all change the tag; `variant` carries anything else shaping the body.
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{resource}|{variant}".encode("utf-8"))
+    for entity_id, version in items:
+        digest.update(f"|{entity_id}:{_version_text(version)}".encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2), so W/ prefixes are ignored.
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Optional[Response]:
+    # Handlers call this before building response models, so a match skips serialization.
+    response.headers["ETag"] = etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
@@ -0,0 +1,204 @@
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+import msgpack
+from opentelemetry import trace
+
+from .schemas import SchemaValidationError, get_registry
+from .streams import stream_for_key
+
+# Version of the envelope layout itself; payload layouts are versioned per event type.
+ENVELOPE_VERSION = 1
+EVENT_SCHEMA_VERSIONS: Dict[str, int] = {
+    "case_created": 1,
+    "score_updated": 1,
+    "score_pending": 1,
+}
+DATA_FIELD = "data"
+TYPE_FIELD = "event_type"
+EVENT_VALIDATION_SAMPLE_RATE = float(os.getenv("EVENT_VALIDATION_SAMPLE_RATE", "0.01"))
+
+logger = logging.getLogger("events")
+
+Fields = Mapping[Any, Any]
+
+
+class EventDecodeError(ValueError):
+    pass
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def _current_trace_id() -> Optional[str]:
+    context = trace.get_current_span().get_span_context()
+    return format(context.trace_id, "032x") if context.is_valid else None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} in an event payload")
+
+
+@dataclass(frozen=True)
+class EventEnvelope:
+    type: str
+    payload: Dict[str, Any]
+    producer: str
+    schema_version: int = 1
+    occurred_at: int = field(default_factory=_now_ms)
+    trace_id: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "envelope_version": ENVELOPE_VERSION,
+            "type": self.type,
+            "schema_version": self.schema_version,
+            "producer": self.producer,
+            "occurred_at": self.occurred_at,
+            "trace_id": self.trace_id,
+            "payload": self.payload,
+        }
+
+
+def encode_event(envelope: EventEnvelope) -> bytes:
+    # Positional array rather than a map: field names would otherwise dominate small events.
+    return msgpack.packb(
+        [
+            ENVELOPE_VERSION,
+            envelope.type,
+            envelope.schema_version,
+            envelope.producer,
+            envelope.occurred_at,
+            envelope.trace_id,
+            envelope.payload,
+        ],
+        default=_default,
+        use_bin_type=True,
+    )
+
+
+def _field(fields: Fields, name: str) -> Optional[Union[str, bytes]]:
+    value = fields.get(name)
+    if value is None:
+        value = fields.get(name.encode("utf-8"))
+    return value
+
+
+def _text(value: Union[str, bytes, None]) -> Optional[str]:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def decode_event(fields: Fields) -> EventEnvelope:
+    data = _field(fields, DATA_FIELD)
+    if data is None:
+        return _decode_legacy(fields)
+    if isinstance(data, str):
+        raise EventDecodeError("Binary envelope was read by a client with decode_responses=True")
+    try:
+        decoded = msgpack.unpackb(data, raw=False)
+    except (ValueError, msgpack.ExtraData) as exc:
+        raise EventDecodeError("Malformed event envelope") from exc
+    if not isinstance(decoded, list) or not decoded or decoded[0] != ENVELOPE_VERSION:
+        raise EventDecodeError("Unsupported event envelope version")
+    if len(decoded) != 7 or not isinstance(decoded[6], dict):
+        raise EventDecodeError("Malformed event envelope")
+    _, event_type, schema_version, producer, occurred_at, trace_id, payload = decoded
+    return EventEnvelope(
+        type=event_type,
+        payload=payload,
+        producer=producer,
+        schema_version=schema_version,
+        occurred_at=occurred_at,
+        trace_id=trace_id,
+    )
+
+
+def _decode_legacy(fields: Fields) -> EventEnvelope:
+    # Entries written before the envelope existed: JSON "payload" plus ISO "created_at".
+    raw = _text(_field(fields, "payload"))
+    try:
+        payload = json.loads(raw) if raw is not None else {}
+    except ValueError:
+        payload = {"raw": raw}
+    if not isinstance(payload, dict):
+        payload = {"raw": payload}
+    created_at = _text(_field(fields, "created_at"))
+    occurred_at = (
+        int(datetime.fromisoformat(created_at).timestamp() * 1000) if created_at else _now_ms()
+    )
+    return EventEnvelope(
+        type=_text(_field(fields, TYPE_FIELD)) or "unknown",
+        payload=payload,
+        producer="unknown",
+        schema_version=0,
+        occurred_at=occurred_at,
+    )
+
+
+class EventProducer:
+    def __init__(
+        self,
+        client: Any,
+        producer: str,
+        stream_for: Callable[[str], str] = stream_for_key,
+        maxlen: Optional[int] = None,
+        validation_rate: float = EVENT_VALIDATION_SAMPLE_RATE,
+    ) -> None:
+        # Sync or redis.asyncio client; with the latter, publish and publish_many return
+        # awaitables.
+        self.client = client
+        self.producer = producer
+        self.stream_for = stream_for
+        self.maxlen = maxlen
+        self.validation_rate = validation_rate
+
+    def envelope(self, event_type: str, payload: Dict[str, Any]) -> EventEnvelope:
+        schema_version = EVENT_SCHEMA_VERSIONS.get(event_type, 1)
+        if event_type in EVENT_SCHEMA_VERSIONS:
+            try:
+                get_registry().validate_sampled(
+                    event_type, payload, self.validation_rate, schema_version
+                )
+            except SchemaValidationError as exc:
+                # Sampled checks surface drift without failing the request that emits the event.
+                logger.warning("event_schema_mismatch producer=%s %s", self.producer, exc)
+        return EventEnvelope(
+            type=event_type,
+            payload=payload,
+            producer=self.producer,
+            schema_version=schema_version,
+            trace_id=_current_trace_id(),
+        )
+
+    def _entry(self, envelope: EventEnvelope, key: str) -> Tuple[str, Dict[str, Any]]:
+        # event_type stays a plain field so consumers can route without decoding.
+        return self.stream_for(key), {TYPE_FIELD: envelope.type, DATA_FIELD: encode_event(envelope)}
+
+    def publish(self, event_type: str, payload: Dict[str, Any], key: Optional[str] = None) -> Any:
+        stream, fields = self._entry(
+            self.envelope(event_type, payload), key or str(payload["case_id"])
+        )
+        return self.client.xadd(stream, fields, maxlen=self.maxlen, approximate=True)
+
+    def publish_many(
+        self, events: Iterable[Tuple[str, Dict[str, Any]]], key: Optional[str] = None
+    ) -> Any:
+        # One round-trip for the whole batch; no MULTI/EXEC since events are independent.
+        pipeline = self.client.pipeline(transaction=False)
+        for event_type, payload in events:
+            stream, fields = self._entry(
+                self.envelope(event_type, payload), key or str(payload["case_id"])
+            )
+            pipeline.xadd(stream, fields, maxlen=self.maxlen, approximate=True)
+        return pipeline.execute()
@@ -1,33 +1,77 @@
 import logging
-from typing import Callable
+import os
+import random
+import time
+from typing import Any, Dict, Optional
 
-from fastapi import Request
 from opentelemetry import trace
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
-
-
-class HttpLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        logger = logging.getLogger("http")
-        request_id = getattr(request.state, "request_id", None)
-        trace_id = trace.get_current_span().get_span_context().trace_id
-        logger.info(
-            "request_started",
-            extra={
-                "request_id": request_id,
-                "trace_id": trace_id,
-                "path": request.url.path,
-                "method": request.method,
-            },
-        )
-        response = await call_next(request)
-        logger.info(
-            "request_completed",
-            extra={
-                "request_id": request_id,
-                "trace_id": trace_id,
-                "status_code": response.status_code,
-            },
-        )
-        return response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Fraction of requests whose request_started/request_completed lines are kept. Errors
+# (5xx or unhandled exceptions) and requests slower than HTTP_LOG_SLOW_MS always log.
+HTTP_LOG_SAMPLE_RATE = float(os.getenv("HTTP_LOG_SAMPLE_RATE", "1.0"))
+HTTP_LOG_SLOW_MS = float(os.getenv("HTTP_LOG_SLOW_MS", "500"))
+
+logger = logging.getLogger("http")
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class HttpLoggingMiddleware:
+    # Plain ASGI rather than BaseHTTPMiddleware: no extra task or body stream per request.
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = HTTP_LOG_SAMPLE_RATE,
+        slow_ms: float = HTTP_LOG_SLOW_MS,
+    ) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        sampled = self.sample_rate >= 1 or random.random() < self.sample_rate  # nosec B311
+        context = trace.get_current_span().get_span_context()
+        extra: Dict[str, Any] = {
+            "request_id": _header(scope, b"x-request-id"),
+            "trace_id": format(context.trace_id, "032x") if context.is_valid else None,
+            "path": scope["path"],
+            "method": scope["method"],
+        }
+        if sampled:
+            logger.info("request_started", extra=extra)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            extra["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            logger.exception("request_failed", extra=extra)
+            raise
+        duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        if sampled or status_code >= 500 or duration_ms >= self.slow_ms:
+            # RequestIdMiddleware runs inside this one and records a generated id in the
+            # request state; unsampled lines carry method and path so they stand alone.
+            extra["request_id"] = scope.get("state", {}).get("request_id", extra["request_id"])
+            extra["status_code"] = status_code
+            extra["duration_ms"] = duration_ms
+            logger.log(
+                logging.WARNING if status_code >= 500 else logging.INFO,
+                "request_completed",
+                extra=extra,
+            )
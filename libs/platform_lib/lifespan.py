@@ -0,0 +1,361 @@
+import asyncio
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse
+from prometheus_client import Gauge
+
+from .logging import configure_logging
+from .tracing import configure_tracing
+
+if TYPE_CHECKING:
+    import httpx
+
+# Dependencies that fail to open are retried with exponential backoff until shutdown; the
+# service stays live (and unready) meanwhile instead of crash-looping.
+STARTUP_RETRY_INITIAL_SECONDS = float(os.getenv("STARTUP_RETRY_INITIAL_SECONDS", "0.5"))
+STARTUP_RETRY_MAX_SECONDS = float(os.getenv("STARTUP_RETRY_MAX_SECONDS", "10"))
+# Connections opened (and held together, so they are distinct) before the service is ready.
+DB_WARM_CONNECTIONS = int(os.getenv("DB_WARM_CONNECTIONS", "2"))
+# Compare the database's Alembic revision with the migrations shipped in the image.
+MIGRATION_CHECK = os.getenv("MIGRATION_CHECK", "true").lower() == "true"
+HTTP_POOL_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "100"))
+HTTP_POOL_MAX_KEEPALIVE = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "20"))
+HTTP_WARMUP_TIMEOUT_SECONDS = float(os.getenv("HTTP_WARMUP_TIMEOUT_SECONDS", "2"))
+# Upper bound on waiting for background tasks to stop at shutdown.
+SHUTDOWN_TIMEOUT_SECONDS = float(os.getenv("SHUTDOWN_TIMEOUT_SECONDS", "10"))
+# Tasks still running this long after a cancel are cancelled again.
+SHUTDOWN_RECANCEL_SECONDS = 0.5
+
+SERVICE_READY = Gauge("service_ready", "1 while the service reports ready")
+STARTUP_DURATION = Gauge(
+    "service_startup_seconds",
+    "Seconds from lifespan start until each dependency opened ('ready' for the whole service)",
+    ["dependency"],
+)
+
+logger = logging.getLogger("lifespan")
+
+
+class MigrationsPending(RuntimeError):
+    pass
+
+
+@lru_cache(maxsize=None)
+def _expected_heads(migrations_dir: str) -> Tuple[str, ...]:
+    from alembic.script import ScriptDirectory
+
+    return tuple(sorted(ScriptDirectory(migrations_dir).get_heads()))
+
+
+def check_migrations(connection: Any, migrations_dir: Path) -> None:
+    # Schema changes are applied by `alembic upgrade head` ahead of the rollout; the service
+    # only refuses to report ready against a database that is behind (or ahead of) its code.
+    from alembic.migration import MigrationContext
+
+    expected = _expected_heads(str(migrations_dir))
+    current = tuple(sorted(MigrationContext.configure(connection).get_current_heads()))
+    if current != expected:
+        raise MigrationsPending(
+            f"database revision {', '.join(current) or 'none'}, expected {', '.join(expected)}"
+        )
+
+
+class Dependency(ABC):
+    name = "dependency"
+
+    @abstractmethod
+    async def open(self) -> None: ...
+
+    async def close(self) -> None:
+        return None
+
+
+class Database(Dependency):
+    name = "database"
+
+    def __init__(
+        self,
+        engine: Any,
+        migrations_dir: Optional[Path] = None,
+        warm_connections: int = DB_WARM_CONNECTIONS,
+    ) -> None:
+        self.engine = engine
+        self.migrations_dir = migrations_dir if MIGRATION_CHECK else None
+        self.warm_connections = max(1, warm_connections)
+
+    def _open(self) -> None:
+        from sqlalchemy import text
+
+        connections = []
+        try:
+            for _ in range(self.warm_connections):
+                connection = self.engine.connect()
+                connections.append(connection)
+                connection.execute(text("SELECT 1"))
+            if self.migrations_dir is not None:
+                check_migrations(connections[0], self.migrations_dir)
+        finally:
+            for connection in connections:
+                connection.close()
+
+    async def open(self) -> None:
+        await asyncio.to_thread(self._open)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self.engine.dispose)
+
+
+class Redis(Dependency):
+    name = "redis"
+
+    def __init__(self, client: Any) -> None:
+        self.client = client
+
+    def _is_async(self) -> bool:
+        import redis.asyncio
+
+        return isinstance(self.client, redis.asyncio.Redis)
+
+    async def open(self) -> None:
+        # PING opens the first pooled connection.
+        if self._is_async():
+            await self.client.ping()
+        else:
+            await asyncio.to_thread(self.client.ping)
+
+    async def close(self) -> None:
+        if self._is_async():
+            await self.client.aclose()
+        else:
+            await asyncio.to_thread(self.client.close)
+
+
+class HttpClientPool(Dependency):
+    """One keep-alive `httpx.AsyncClient` per service instead of one per request.
+
+    The client is built on first use (startup normally), after tracing has instrumented httpx.
+    """
+
+    def __init__(
+        self,
+        name: str = "http",
+        timeout: float = 10.0,
+        warm_urls: Sequence[str] = (),
+        max_connections: int = HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_POOL_MAX_KEEPALIVE,
+    ) -> None:
+        self.name = name
+        self.timeout = timeout
+        self.warm_urls = list(warm_urls)
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                # Shared by every request this service makes, so it must not keep one caller's
+                # cookies (e.g. read_primary_until) and send them for the next.
+                cookies=CookieJar(DefaultCookiePolicy(allowed_domains=[])),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                ),
+            )
+        return self._client
+
+    async def open(self) -> None:
+        client = self.client
+        # Best effort: peers that are still starting must not hold this service's readiness.
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(client.get(url), HTTP_WARMUP_TIMEOUT_SECONDS)
+                for url in self.warm_urls
+            ),
+            return_exceptions=True,
+        )
+        for url, result in zip(self.warm_urls, results):
+            if isinstance(result, Exception):
+                logger.info("http_warmup_skipped url=%s error=%s", url, type(result).__name__)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class Warmup(Dependency):
+    # CPU-bound preparation (compiling validators, loading models) run off the event loop.
+    def __init__(self, name: str, func: Callable[[], Any]) -> None:
+        self.name = name
+        self.func = func
+
+    async def open(self) -> None:
+        await asyncio.to_thread(self.func)
+
+
+class ServiceLifespan:
+    """FastAPI lifespan shared by the services.
+
+    Startup configures logging and tracing, then returns at once so the process serves
+    `/health/live` immediately. Dependencies open concurrently in the background; once all of
+    them are open the `background` coroutines start and `/health/ready` turns 200. A
+    background coroutine that raises turns the service unready again.
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        dependencies: Sequence[Dependency] = (),
+        background: Sequence[Callable[[], Coroutine[Any, Any, Any]]] = (),
+    ) -> None:
+        self.service_name = service_name
+        self.dependencies = list(dependencies)
+        self.background = list(background)
+        self.states: Dict[str, str] = {}
+        # Seconds from lifespan start until each dependency opened, plus "ready".
+        self.durations: Dict[str, float] = {}
+        self.router = self._build_router()
+        self._ready = asyncio.Event()
+        self._started = 0.0
+        self._tasks: List["asyncio.Task[Any]"] = []
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    async def wait_ready(self) -> None:
+        await self._ready.wait()
+
+    async def _open(self, dependency: Dependency) -> None:
+        delay = STARTUP_RETRY_INITIAL_SECONDS
+        while True:
+            try:
+                await dependency.open()
+            except Exception as exc:
+                # Only the exception type is exposed on /health/ready; details go to the log.
+                self.states[dependency.name] = f"failed: {type(exc).__name__}"
+                logger.warning(
+                    "startup_dependency_failed dependency=%s retry_in=%.1fs error=%s",
+                    dependency.name,
+                    delay,
+                    exc,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, STARTUP_RETRY_MAX_SECONDS)
+            else:
+                self.states[dependency.name] = "ready"
+                self._record(dependency.name)
+                return
+
+    def _record(self, name: str) -> None:
+        self.durations[name] = time.perf_counter() - self._started
+        STARTUP_DURATION.labels(name).set(self.durations[name])
+
+    async def _start(self) -> None:
+        await asyncio.gather(*(self._open(dependency) for dependency in self.dependencies))
+        self._tasks = []
+        for run in self.background:
+            task = asyncio.create_task(run(), name=getattr(run, "__name__", "background"))
+            task.add_done_callback(self._background_done)
+            self._tasks.append(task)
+        self._record("ready")
+        SERVICE_READY.set(1)
+        self._ready.set()
+        logger.info(
+            "service_ready service=%s seconds=%.3f", self.service_name, self.durations["ready"]
+        )
+
+    def _background_done(self, task: "asyncio.Task[Any]") -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        exc = task.exception()
+        logger.error("background_task_failed task=%s", task.get_name(), exc_info=exc)
+        self.states[task.get_name()] = f"failed: {type(exc).__name__}"
+        self._ready.clear()
+        SERVICE_READY.set(0)
+
+    async def _stop_tasks(self, tasks: Sequence["asyncio.Task[Any]"]) -> None:
+        # A cancel that lands as an awaited call completes can be lost (asyncio.wait_for on
+        # 3.11), leaving the task running and marked "cancelling"; so cancel until it stops.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + SHUTDOWN_TIMEOUT_SECONDS
+        pending = {task for task in tasks if not task.done()}
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                logger.error(
+                    "shutdown_tasks_stuck tasks=%s", ",".join(task.get_name() for task in pending)
+                )
+                break
+            for task in pending:
+                task.cancel()
+            _, pending = await asyncio.wait(
+                pending, timeout=min(SHUTDOWN_RECANCEL_SECONDS, remaining)
+            )
+        for task in tasks:
+            if task.done() and not task.cancelled():
+                # Retrieved so asyncio does not log "exception was never retrieved" at exit.
+                task.exception()
+
+    @asynccontextmanager
+    async def __call__(self, app: FastAPI) -> AsyncIterator[None]:
+        self._started = time.perf_counter()
+        configure_logging()
+        configure_tracing(self.service_name)
+        self.states = {dependency.name: "pending" for dependency in self.dependencies}
+        starter = asyncio.create_task(self._start(), name="startup")
+        try:
+            yield
+        finally:
+            # uvicorn runs this only after it has stopped serving, so no probe sees it; it
+            # keeps is_ready and the gauge honest while the pools close.
+            self._ready.clear()
+            SERVICE_READY.set(0)
+            await self._stop_tasks([starter, *self._tasks])
+            for dependency in reversed(self.dependencies):
+                try:
+                    await dependency.close()
+                except Exception:
+                    logger.exception("shutdown_dependency_failed dependency=%s", dependency.name)
+
+    def _build_router(self) -> APIRouter:
+        router = APIRouter()
+
+        @router.get("/health/live", include_in_schema=False)
+        async def live() -> Dict[str, str]:
+            return {"status": "ok"}
+
+        @router.get("/health/ready", include_in_schema=False)
+        async def ready() -> JSONResponse:
+            body = {
+                "status": "ready" if self.is_ready else "starting",
+                "dependencies": self.states,
+            }
+            return JSONResponse(body, status_code=200 if self.is_ready else 503)
+
+        return router
@@ -1,31 +1,103 @@
-import json
+import atexit
+import copy
 import logging
 import os
-from datetime import datetime
-from typing import Any, Dict
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Any, Dict, Optional
+
+import orjson
+
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Per-record attributes copied into the JSON line when a caller passes them via `extra`.
+EXTRA_FIELDS = ("request_id", "trace_id", "method", "path", "status_code", "duration_ms")
+
+_listener: Optional[QueueListener] = None
 
 
 class JsonFormatter(logging.Formatter):
+    def __init__(self, service_name: Optional[str] = None) -> None:
+        super().__init__()
+        self.service_name = service_name or os.getenv("SERVICE_NAME", "unknown")
+        self._second = -1
+        self._second_text = ""
+
+    def _timestamp(self, created: float) -> str:
+        # Records are formatted after the fact on the listener thread, so the time comes from
+        # the record; the seconds part is rendered once per second.
+        second = int(created)
+        if second != self._second:
+            self._second = second
+            self._second_text = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        micros = min(int((created - second) * 1_000_000), 999_999)
+        return f"{self._second_text}.{micros:06d}"
+
     def format(self, record: logging.LogRecord) -> str:
         payload: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "message": record.getMessage(),
             "logger": record.name,
-            "service_name": os.getenv("SERVICE_NAME", "unknown"),
+            "service_name": self.service_name,
         }
-        if hasattr(record, "request_id"):
-            payload["request_id"] = record.request_id
-        if hasattr(record, "trace_id"):
-            payload["trace_id"] = record.trace_id
+        for name in EXTRA_FIELDS:
+            value = record.__dict__.get(name)
+            if value is not None:
+                payload[name] = value
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
-        return json.dumps(payload)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return orjson.dumps(payload, default=str).decode("utf-8")
+
+
+class DroppingQueueHandler(QueueHandler):
+    def __init__(self, log_queue: "queue.Queue[Any]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve only what cannot cross threads safely (args, exc_info); the JSON
+        # formatting itself happens on the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # Never block the event loop on a slow stdout; shed lines instead.
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def stop_logging() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# Flushes queued lines on interpreter exit.
+atexit.register(stop_logging)
 
 
-def configure_logging() -> None:
-    handler = logging.StreamHandler()
+def configure_logging(stream: Optional[IO[str]] = None) -> None:
+    global _listener
+    handler = logging.StreamHandler(stream)
     handler.setFormatter(JsonFormatter())
+    log_queue: "queue.Queue[Any]" = queue.Queue(LOG_QUEUE_SIZE)
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
     root = logging.getLogger()
     root.setLevel(os.getenv("LOG_LEVEL", "INFO"))
-    root.handlers = [handler]
+    root.handlers = [DroppingQueueHandler(log_queue)]
+    # Swap before stopping so a reconfigure drains the previous queue without losing lines.
+    stop_logging()
+    _listener = listener
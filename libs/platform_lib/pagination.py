@@ -0,0 +1,19 @@
+import base64
+import uuid
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
@@ -0,0 +1,119 @@
+import logging
+import os
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .auth import decode_jwt_token
+
+# `X-Profile: <service-name>` from an admin token profiles that one request in the named
+# service; the response body is replaced by a speedscope flame graph. Naming the service
+# lets the header travel through the gateway to the hop that should be profiled.
+PROFILE_HEADER = b"x-profile"
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "true").lower() == "true"
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+PROFILE_ROLES = ("admin",)
+
+logger = logging.getLogger("profiling")
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _is_authorized(scope: Scope) -> bool:
+    auth_header = _header(scope, b"authorization") or ""
+    if not auth_header.startswith("Bearer "):
+        return False
+    try:
+        payload = decode_jwt_token(auth_header.split(" ", 1)[1])
+    except HTTPException:
+        return False
+    return payload.get("role") in PROFILE_ROLES
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        service_name: str,
+        enabled: bool = PROFILING_ENABLED,
+        interval_ms: float = PROFILE_INTERVAL_MS,
+    ) -> None:
+        self.app = app
+        self.service_name = service_name
+        self.enabled = enabled
+        self.interval = interval_ms / 1000
+        self._busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not self.enabled
+            or _header(scope, PROFILE_HEADER) != self.service_name
+            or not _is_authorized(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+        if self._busy:
+            # The sampler hooks the event loop thread; overlapping profiles would blur together.
+            await _respond(send, 429, b"A profile is already running", b"text/plain")
+            return
+        self._busy = True
+        try:
+            await self._profile(scope, receive, send)
+        finally:
+            self._busy = False
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        status = 500
+
+        async def capture(message: Message) -> None:
+            # The handler's own body is discarded; only its status is reported back.
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        # async_mode="enabled" attributes samples to this request's task only, not to other
+        # requests sharing the loop. Work handed to the threadpool shows up as the await.
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            profiler.stop()
+        logger.info("request_profiled", extra={"path": scope["path"], "status_code": status})
+        await _respond(
+            send,
+            200,
+            profiler.output(SpeedscopeRenderer()).encode("utf-8"),
+            b"application/json",
+            [
+                (b"x-profiled-status", str(status).encode("latin-1")),
+                (
+                    b"content-disposition",
+                    f'attachment; filename="{self.service_name}.speedscope.json"'.encode("latin-1"),
+                ),
+            ],
+        )
+
+
+async def _respond(
+    send: Send, status: int, body: bytes, content_type: bytes, extra: Optional[Headers] = None
+) -> None:
+    headers: Headers = [
+        (b"content-type", content_type),
+        (b"content-length", str(len(body)).encode("latin-1")),
+        *(extra or []),
+    ]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
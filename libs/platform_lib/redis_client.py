@@ -0,0 +1,235 @@
+import asyncio
+import os
+import time
+from typing import Any, List, Optional, Set, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+# How long a command waits for a free connection before failing with ConnectionError.
+REDIS_POOL_TIMEOUT_SECONDS = float(os.getenv("REDIS_POOL_TIMEOUT_SECONDS", "5"))
+# Idle connections are PINGed before reuse after this long, so a dead socket is replaced
+# instead of failing the request that picks it up.
+REDIS_HEALTH_CHECK_SECONDS = int(os.getenv("REDIS_HEALTH_CHECK_SECONDS", "30"))
+REDIS_CONNECT_TIMEOUT_SECONDS = float(os.getenv("REDIS_CONNECT_TIMEOUT_SECONDS", "2"))
+# Must exceed the longest BLOCK a caller uses (XREAD/XREADGROUP loops block for 2-5 s).
+REDIS_SOCKET_TIMEOUT_SECONDS = float(os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", "10"))
+REDIS_AUTOPIPELINE = os.getenv("REDIS_AUTOPIPELINE", "true").lower() == "true"
+# 0 gathers the commands issued in the same event-loop iteration; >0 waits that long.
+REDIS_AUTOPIPELINE_WINDOW_MS = float(os.getenv("REDIS_AUTOPIPELINE_WINDOW_MS", "0"))
+REDIS_AUTOPIPELINE_MAX_COMMANDS = int(os.getenv("REDIS_AUTOPIPELINE_MAX_COMMANDS", "500"))
+
+# Commands that block or change connection state must not share a pipeline with others.
+UNPIPELINED_COMMANDS = frozenset(
+    {
+        "BLMOVE",
+        "BLMPOP",
+        "BLPOP",
+        "BRPOP",
+        "BRPOPLPUSH",
+        "BZMPOP",
+        "BZPOPMAX",
+        "BZPOPMIN",
+        "DISCARD",
+        "EXEC",
+        "MONITOR",
+        "MULTI",
+        "SELECT",
+        "UNWATCH",
+        "WAIT",
+        "WATCH",
+    }
+)
+
+COMMAND_SECONDS = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency as seen by the caller, including time queued for a pipeline",
+    ["client", "command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0),
+)
+COMMAND_ERRORS = Counter(
+    "redis_command_errors_total", "Redis commands that raised", ["client", "command"]
+)
+PIPELINE_COMMANDS = Histogram(
+    "redis_autopipeline_commands",
+    "Commands sent per automatic pipeline",
+    ["client"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+POOL_WAIT_SECONDS = Histogram(
+    "redis_pool_wait_seconds",
+    "Time spent waiting for a pooled Redis connection",
+    ["client"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+POOL_CONNECTIONS = Gauge(
+    "redis_pool_connections", "Redis pool connections by state", ["client", "state"]
+)
+
+Queued = Tuple[Tuple[Any, ...], dict, "asyncio.Future[Any]", float]
+
+
+def _command_name(args: Tuple[Any, ...]) -> str:
+    name = args[0]
+    return (name.decode("utf-8") if isinstance(name, bytes) else str(name)).upper()
+
+
+def _blocks(command: str, args: Tuple[Any, ...]) -> bool:
+    return command in UNPIPELINED_COMMANDS or (
+        command in ("XREAD", "XREADGROUP") and ("BLOCK" in args or b"BLOCK" in args)
+    )
+
+
+class AutoPipeline:
+    """Instruments a redis.asyncio client and batches its commands into pipelines.
+
+    Commands issued while a batch is open (the rest of the current event-loop iteration, or
+    REDIS_AUTOPIPELINE_WINDOW_MS) go out as one non-transactional pipeline: concurrent
+    requests that each XADD or GET share a round-trip instead of a connection apiece. Each
+    caller still awaits its own result or exception. Blocking and connection-state commands,
+    and explicit pipelines, bypass the batching and are only timed.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        name: str,
+        enabled: bool = REDIS_AUTOPIPELINE,
+        window_ms: float = REDIS_AUTOPIPELINE_WINDOW_MS,
+        max_commands: int = REDIS_AUTOPIPELINE_MAX_COMMANDS,
+    ) -> None:
+        self.client = client
+        self.name = name
+        self.enabled = enabled
+        self.window_ms = window_ms
+        self.max_commands = max_commands
+        self._execute = client.execute_command
+        self._pipeline = client.pipeline
+        self._queue: List[Queued] = []
+        self._scheduled: Optional[asyncio.Handle] = None
+        self._sending: Set["asyncio.Task[None]"] = set()
+
+    def install(self) -> Any:
+        # Command methods call self.execute_command, so an instance attribute catches them all.
+        self.client.execute_command = self.execute_command
+        self.client.pipeline = self.pipeline
+        return self.client
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        command = _command_name(args)
+        started = time.perf_counter()
+        if not self.enabled or self.client.connection is not None or _blocks(command, args):
+            try:
+                return await self._execute(*args, **options)
+            except Exception:
+                COMMAND_ERRORS.labels(self.name, command).inc()
+                raise
+            finally:
+                COMMAND_SECONDS.labels(self.name, command).observe(time.perf_counter() - started)
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Any]" = loop.create_future()
+        self._queue.append((args, options, future, started))
+        if len(self._queue) >= self.max_commands:
+            self._flush()
+        elif self._scheduled is None:
+            self._scheduled = (
+                loop.call_later(self.window_ms / 1000, self._flush)
+                if self.window_ms > 0
+                else loop.call_soon(self._flush)
+            )
+        return await future
+
+    def _flush(self) -> None:
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+        batch, self._queue = self._queue, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._send(batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch: List[Queued]) -> None:
+        PIPELINE_COMMANDS.labels(self.name).observe(len(batch))
+        pipe = self._pipeline(transaction=False)
+        for args, options, _, _ in batch:
+            pipe.execute_command(*args, **options)
+        try:
+            results: List[Any] = await pipe.execute(raise_on_error=False)
+        except Exception as exc:
+            # Connection-level failure: every command in the batch gets the error.
+            results = [exc] * len(batch)
+        finished = time.perf_counter()
+        for (args, _, future, started), result in zip(batch, results):
+            command = _command_name(args)
+            COMMAND_SECONDS.labels(self.name, command).observe(finished - started)
+            if isinstance(result, Exception):
+                COMMAND_ERRORS.labels(self.name, command).inc()
+            if future.done():
+                # The caller was cancelled; the command still ran.
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Any = None) -> Any:
+        pipe = self._pipeline(transaction=transaction, shard_hint=shard_hint)
+        execute = pipe.execute
+
+        async def timed_execute(raise_on_error: bool = True) -> Any:
+            started = time.perf_counter()
+            try:
+                return await execute(raise_on_error=raise_on_error)
+            except Exception:
+                COMMAND_ERRORS.labels(self.name, "PIPELINE").inc()
+                raise
+            finally:
+                COMMAND_SECONDS.labels(self.name, "PIPELINE").observe(time.perf_counter() - started)
+
+        pipe.execute = timed_execute
+        return pipe
+
+
+def instrument_pool(pool: Any, name: str) -> None:
+    get_connection = pool.get_connection
+
+    async def timed_get_connection(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await get_connection(*args, **kwargs)
+        finally:
+            POOL_WAIT_SECONDS.labels(name).observe(time.perf_counter() - started)
+
+    pool.get_connection = timed_get_connection
+    # Read at scrape time from the pool's own bookkeeping.
+    POOL_CONNECTIONS.labels(name, "in_use").set_function(lambda: len(pool._in_use_connections))
+    POOL_CONNECTIONS.labels(name, "idle").set_function(lambda: len(pool._available_connections))
+    POOL_CONNECTIONS.labels(name, "max").set(pool.max_connections)
+
+
+def create_redis(
+    url: str,
+    name: str,
+    decode_responses: bool = False,
+    max_connections: int = REDIS_MAX_CONNECTIONS,
+    autopipeline: bool = REDIS_AUTOPIPELINE,
+) -> Any:
+    """An instrumented, auto-pipelining redis.asyncio client over a bounded blocking pool."""
+    import redis.asyncio as redis_asyncio
+
+    pool = redis_asyncio.BlockingConnectionPool.from_url(
+        url,
+        max_connections=max_connections,
+        timeout=REDIS_POOL_TIMEOUT_SECONDS,
+        health_check_interval=REDIS_HEALTH_CHECK_SECONDS,
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT_SECONDS,
+        socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_keepalive=True,
+        retry_on_timeout=True,
+        decode_responses=decode_responses,
+    )
+    instrument_pool(pool, name)
+    # from_pool hands the pool to the client, so aclose() also disconnects it.
+    client = redis_asyncio.Redis.from_pool(pool)
+    return AutoPipeline(client, name, enabled=autopipeline).install()
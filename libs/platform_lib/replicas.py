@@ -0,0 +1,264 @@
+"""Read-replica routing for SQLAlchemy engines.
+
+Read-only handlers open their session on `ReplicaRouter.read_engine()`, which round-robins
+over the replicas currently in rotation. A replica leaves the rotation when its lag, checked
+every REPLICA_LAG_CHECK_SECONDS, passes REPLICA_MAX_LAG_SECONDS or cannot be measured, and
+returns once it catches up. With no replica in rotation, reads use the primary.
+
+Read-your-writes: `ReadYourWritesMiddleware` notes any request that commits on the primary.
+The same client's reads then go to the primary for READ_YOUR_WRITES_SECONDS. The client is
+the token subject within this process, plus a cookie for other replicas of the service.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import os
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from prometheus_client import Counter, Gauge
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .lifespan import Dependency
+
+REPLICA_DATABASE_URLS = [
+    url.strip() for url in os.getenv("REPLICA_DATABASE_URLS", "").split(",") if url.strip()
+]
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "5"))
+# Should cover REPLICA_MAX_LAG_SECONDS plus one check interval: a replica can fall that far
+# behind before it is taken out of rotation.
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+READ_YOUR_WRITES_COOKIE = "read_primary_until"
+# Bounds the in-process map of recent writers; expired entries are pruned past this size.
+READ_YOUR_WRITES_MAX_CLIENTS = 10000
+
+REPLICA_LAG = Gauge("db_replica_lag_seconds", "Replication lag at the last check", ["replica"])
+REPLICA_IN_ROTATION = Gauge(
+    "db_replica_in_rotation", "1 while the replica serves reads, 0 while it is skipped", ["replica"]
+)
+ROUTED_READS = Counter("db_routed_reads_total", "Read sessions by the engine chosen", ["target"])
+
+logger = logging.getLogger("replicas")
+
+LagProbe = Callable[[Any, Any], Optional[float]]
+
+
+def postgres_lag(primary: Any, replica: Any) -> Optional[float]:
+    """Seconds the standby's replay is behind, or 0 once it has replayed the primary's WAL.
+
+    None (out of rotation) when the target is not a standby: it replays no WAL, so its data
+    may have nothing to do with the primary's.
+    """
+    from sqlalchemy import text
+
+    # An idle primary writes no WAL, so replay time alone would read as growing lag.
+    with primary.connect() as connection:
+        primary_lsn = connection.execute(text("SELECT pg_current_wal_lsn()::text")).scalar()
+    with replica.connect() as connection:
+        behind, seconds = connection.execute(
+            text(
+                "SELECT pg_wal_lsn_diff(CAST(:lsn AS pg_lsn), pg_last_wal_replay_lsn()),"
+                " EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+            ),
+            {"lsn": primary_lsn},
+        ).one()
+    if behind is None:
+        logger.warning("replica_not_a_standby replica=%s", replica.url.host or replica.url)
+        return None
+    if behind <= 0:
+        return 0.0
+    return float(seconds or 0.0)
+
+
+def default_lag_probe(primary: Any, replica: Any) -> Optional[float]:
+    if replica.dialect.name == "postgresql":
+        return postgres_lag(primary, replica)
+    # Other backends (SQLite in tests) have no replication to measure; only reachability.
+    from sqlalchemy import text
+
+    with replica.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return 0.0
+
+
+class Replica:
+    def __init__(self, engine: Any) -> None:
+        self.engine = engine
+        self.name = engine.url.host or engine.url.database or "replica"
+        self.lag: Optional[float] = None
+        # Out of rotation until the first check has measured it.
+        self.in_rotation = False
+
+
+class _RequestRouting:
+    __slots__ = ("read_primary", "wrote")
+
+    def __init__(self, read_primary: bool) -> None:
+        self.read_primary = read_primary
+        self.wrote = False
+
+
+_routing: ContextVar[Optional[_RequestRouting]] = ContextVar("replica_routing", default=None)
+
+
+class ReplicaRouter(Dependency):
+    name = "replicas"
+
+    def __init__(
+        self,
+        primary: Any,
+        replicas: Sequence[Any] = (),
+        max_lag_seconds: float = REPLICA_MAX_LAG_SECONDS,
+        check_seconds: float = REPLICA_LAG_CHECK_SECONDS,
+        read_your_writes_seconds: float = READ_YOUR_WRITES_SECONDS,
+        lag_probe: LagProbe = default_lag_probe,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        from sqlalchemy import event
+
+        self.primary = primary
+        self.replicas = [Replica(engine) for engine in replicas]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.lag_probe = lag_probe
+        self.clock = clock
+        self._turn = itertools.count()
+        # client -> clock() until which its reads go to the primary
+        self._writes: Dict[str, float] = {}
+        if self.replicas:
+            event.listen(primary, "commit", self._on_commit)
+
+    @staticmethod
+    def _on_commit(connection: Any) -> None:
+        # Runs in the handler's context, including sync handlers on the threadpool.
+        routing = _routing.get()
+        if routing is not None:
+            routing.wrote = True
+
+    def read_engine(self) -> Any:
+        """Engine for a read-only session in the current request."""
+        routing = _routing.get()
+        if routing is not None and routing.read_primary:
+            ROUTED_READS.labels("primary_after_write").inc()
+            return self.primary
+        candidates: List[Replica] = [replica for replica in self.replicas if replica.in_rotation]
+        if not candidates:
+            ROUTED_READS.labels("primary").inc()
+            return self.primary
+        ROUTED_READS.labels("replica").inc()
+        return candidates[next(self._turn) % len(candidates)].engine
+
+    def recently_wrote(self, client: Optional[str]) -> bool:
+        return client is not None and self._writes.get(client, 0.0) > self.clock()
+
+    def record_write(self, client: Optional[str]) -> float:
+        now = self.clock()
+        until = now + self.read_your_writes_seconds
+        if client is not None:
+            if len(self._writes) >= READ_YOUR_WRITES_MAX_CLIENTS:
+                self._writes = {key: value for key, value in self._writes.items() if value > now}
+            self._writes[client] = until
+        return until
+
+    async def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                lag = await asyncio.to_thread(self.lag_probe, self.primary, replica.engine)
+            except Exception as exc:
+                logger.warning("replica_lag_check_failed replica=%s error=%s", replica.name, exc)
+                lag = None
+            in_rotation = lag is not None and lag <= self.max_lag_seconds
+            if in_rotation != replica.in_rotation:
+                logger.warning(
+                    "replica_rotation_changed replica=%s in_rotation=%s lag=%s",
+                    replica.name,
+                    in_rotation,
+                    lag,
+                )
+            replica.lag, replica.in_rotation = lag, in_rotation
+            if lag is not None:
+                REPLICA_LAG.labels(replica.name).set(lag)
+            REPLICA_IN_ROTATION.labels(replica.name).set(int(in_rotation))
+
+    async def open(self) -> None:
+        # Never fails startup: unreachable replicas stay out of rotation and reads use the
+        # primary until monitor_forever finds them healthy.
+        await self.check()
+
+    async def monitor_forever(self) -> None:
+        if not self.replicas:
+            return
+        while True:
+            await asyncio.sleep(self.check_seconds)
+            await self.check()
+
+    async def close(self) -> None:
+        for replica in self.replicas:
+            await asyncio.to_thread(replica.engine.dispose)
+
+
+def _client_key(headers: Headers) -> Optional[str]:
+    from jose import JWTError, jwt
+
+    authorization = headers.get("authorization", "")
+    if not authorization.startswith("Bearer "):
+        return None
+    try:
+        # Only a routing hint; handlers still verify the token.
+        claims = jwt.get_unverified_claims(authorization.split(" ", 1)[1])
+    except JWTError:
+        return None
+    subject = claims.get("sub")
+    return str(subject) if subject else None
+
+
+def _cookie_until(headers: Headers, window: float, now: float) -> float:
+    cookie: SimpleCookie = SimpleCookie()
+    try:
+        cookie.load(headers.get("cookie", ""))
+        until = float(cookie[READ_YOUR_WRITES_COOKIE].value)
+    except (KeyError, ValueError):
+        return 0.0
+    # Issued values are at most one window (rounded up) ahead; anything later is not ours.
+    return until if until <= now + window + 1 else 0.0
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp, router: ReplicaRouter) -> None:
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.router.replicas:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        client = _client_key(headers)
+        window = self.router.read_your_writes_seconds
+        now = self.router.clock()
+        routing = _RequestRouting(
+            self.router.recently_wrote(client) or _cookie_until(headers, window, now) > now
+        )
+        token = _routing.set(routing)
+
+        async def send_marking_writes(message: Message) -> None:
+            if message["type"] == "http.response.start" and routing.wrote:
+                until = self.router.record_write(client)
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={math.ceil(until)}; Max-Age={math.ceil(window)};"
+                    " Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_marking_writes)
+        finally:
+            _routing.reset(token)
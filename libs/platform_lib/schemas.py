@@ -1,9 +1,104 @@
 import json
+import random
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import fastjsonschema
+
+SCHEMA_DIR = Path(__file__).resolve().parent.parent / "schemas"
+VERSIONED_NAME = re.compile(r"^(?P<name>.+)_v(?P<version>\d+)$")
+
+SchemaKey = Tuple[str, int]
+
+
+class SchemaValidationError(ValueError):
+    def __init__(self, schema: str, message: str, path: str = "") -> None:
+        super().__init__(f"{schema}: {message}")
+        self.schema = schema
+        self.message = message
+        self.path = path
+
+
+def _split_name(file_stem: str) -> SchemaKey:
+    match = VERSIONED_NAME.match(file_stem)
+    if match:
+        return match.group("name"), int(match.group("version"))
+    return file_stem, 1
+
+
+class SchemaRegistry:
+    def __init__(self, schema_dir: Path = SCHEMA_DIR) -> None:
+        self._schemas: Dict[SchemaKey, Dict[str, Any]] = {}
+        self._files: Dict[str, SchemaKey] = {}
+        self._validators: Dict[SchemaKey, Callable[[Any], Any]] = {}
+        for path in sorted(schema_dir.glob("*.json")):
+            key = _split_name(path.stem)
+            with path.open("r", encoding="utf-8") as handle:
+                self._schemas[key] = json.load(handle)
+            self._files[path.stem] = key
+
+    def _key(self, name: str, version: Optional[int]) -> SchemaKey:
+        if version is None:
+            key = self._files.get(name)
+            if key is not None:
+                return key
+            versions = [v for schema_name, v in self._schemas if schema_name == name]
+            if not versions:
+                raise KeyError(f"Unknown schema: {name}")
+            return name, max(versions)
+        if (name, version) not in self._schemas:
+            raise KeyError(f"Unknown schema: {name} v{version}")
+        return name, version
+
+    def schema(self, name: str, version: Optional[int] = None) -> Dict[str, Any]:
+        return self._schemas[self._key(name, version)]
+
+    def validator(self, name: str, version: Optional[int] = None) -> Callable[[Any], Any]:
+        key = self._key(name, version)
+        validator = self._validators.get(key)
+        if validator is None:
+            # Formats are not asserted, matching jsonschema.validate's default behaviour.
+            validator = fastjsonschema.compile(self._schemas[key], use_formats=False)
+            self._validators[key] = validator
+        return validator
+
+    def compile_all(self) -> None:
+        for name, version in self._schemas:
+            self.validator(name, version)
+
+    def validate(self, name: str, instance: Any, version: Optional[int] = None) -> None:
+        try:
+            self.validator(name, version)(instance)
+        except fastjsonschema.JsonSchemaValueException as exc:
+            raise SchemaValidationError(name, exc.message, exc.name) from exc
+
+    def validate_batch(
+        self, name: str, instances: Iterable[Any], version: Optional[int] = None
+    ) -> List[Tuple[int, SchemaValidationError]]:
+        validator = self.validator(name, version)
+        errors: List[Tuple[int, SchemaValidationError]] = []
+        for index, instance in enumerate(instances):
+            try:
+                validator(instance)
+            except fastjsonschema.JsonSchemaValueException as exc:
+                errors.append((index, SchemaValidationError(name, exc.message, exc.name)))
+        return errors
+
+    def validate_sampled(
+        self, name: str, instance: Any, rate: float, version: Optional[int] = None
+    ) -> bool:
+        if rate <= 0 or (rate < 1 and random.random() >= rate):  # nosec B311 - sampling only
+            return False
+        self.validate(name, instance, version)
+        return True
+
+
+@lru_cache(maxsize=1)
+def get_registry() -> SchemaRegistry:
+    return SchemaRegistry()
 
 
 def load_schema(name: str) -> Dict[str, Any]:
-    schema_path = Path(__file__).resolve().parent.parent / "schemas" / f"{name}.json"
-    with schema_path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return get_registry().schema(name)
@@ -0,0 +1,19 @@
+import os
+import zlib
+from typing import List
+
+CASE_EVENTS_STREAM = "case-events"
+CASE_EVENTS_SHARDS = int(os.getenv("CASE_EVENTS_SHARDS", "1"))
+
+
+def case_event_streams(shards: int = CASE_EVENTS_SHARDS) -> List[str]:
+    if shards <= 1:
+        return [CASE_EVENTS_STREAM]
+    return [f"{CASE_EVENTS_STREAM}:{shard}" for shard in range(shards)]
+
+
+def stream_for_key(key: str, shards: int = CASE_EVENTS_SHARDS) -> str:
+    if shards <= 1:
+        return CASE_EVENTS_STREAM
+    # crc32 rather than hash(): producers in different processes must agree on the shard.
+    return f"{CASE_EVENTS_STREAM}:{zlib.crc32(key.encode('utf-8')) % shards}"
@@ -0,0 +1,151 @@
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from prometheus_client import Histogram
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Server-Timing exposes internal latencies and upstream host names to callers, so it is opt-in
+# (e.g. for local debugging). The histograms are recorded either way.
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+
+OPERATION_DURATION = Histogram(
+    "platform_operation_duration_seconds",
+    "Time spent in instrumented hot paths",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class RequestTimings:
+    def __init__(self) -> None:
+        # operation -> [total milliseconds, calls]
+        self.operations: Dict[str, List[float]] = {}
+        self.upstream: List[str] = []
+
+    def add(self, operation: str, ms: float) -> None:
+        entry = self.operations.get(operation)
+        if entry is None:
+            self.operations[operation] = [ms, 1]
+        else:
+            entry[0] += ms
+            entry[1] += 1
+
+    def header(self, total_ms: Optional[float] = None) -> str:
+        metrics = []
+        for operation, (ms, calls) in self.operations.items():
+            metric = f"{operation};dur={ms:.2f}"
+            if calls > 1:
+                metric += f';desc="{calls:.0f} calls"'
+            metrics.append(metric)
+        if total_ms is not None:
+            metrics.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(metrics + self.upstream)
+
+
+# Set per request by ServerTimingMiddleware. Threadpool handlers and middleware tasks run in
+# copies of the request context, so they share (and mutate) the same RequestTimings.
+_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _timings.get()
+
+
+def record(operation: str, seconds: float) -> None:
+    OPERATION_DURATION.labels(operation).observe(seconds)
+    timings = _timings.get()
+    if timings is not None:
+        timings.add(operation, seconds * 1000)
+
+
+@contextmanager
+def timed(operation: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(operation, time.perf_counter() - started)
+
+
+def timed_call(operation: str) -> Callable[[F], F]:
+    def decorate(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with timed(operation):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timed(operation):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def merge_server_timing(header: Optional[str], prefix: str) -> None:
+    # Folds a downstream hop's metrics into this request's header as "<prefix>.<name>", so
+    # the gateway response carries the whole call tree. Metric names are HTTP tokens, so the
+    # prefix must not contain separators; desc values written here never contain commas.
+    timings = _timings.get()
+    if not header or timings is None:
+        return
+    for metric in header.split(","):
+        metric = metric.strip()
+        if metric:
+            timings.upstream.append(f"{prefix}.{metric}")
+
+
+def instrument_engine(engine: Any) -> None:
+    # Times every statement the engine runs, whichever Session issued it, as "db".
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _started(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._platform_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finished(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_platform_started", None)
+        if started is not None:
+            record("db", time.perf_counter() - started)
+
+
+class ServerTimingMiddleware:
+    # Must wrap everything it should measure, so services add it last (outermost).
+    def __init__(self, app: ASGIApp, enabled: bool = SERVER_TIMING_ENABLED) -> None:
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        timings = RequestTimings()
+        token = _timings.set(timings)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.enabled:
+                total_ms = (time.perf_counter() - started) * 1000
+                MutableHeaders(scope=message).append("Server-Timing", timings.header(total_ms))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _timings.reset(token)
@@ -1,22 +1,327 @@
 import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence
 
 from opentelemetry import trace
-from opentelemetry.exporter.jaeger.thrift import JaegerExporter
+from opentelemetry.context import Context
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
 from opentelemetry.sdk.resources import SERVICE_NAME, Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import (
+    ALWAYS_OFF,
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import Link, SpanContext, SpanKind, StatusCode, TraceFlags
+from opentelemetry.util.types import Attributes
+from prometheus_client import Counter
 
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "jaeger")  # jaeger | otlp | none
+TRACE_SAMPLE_RATIO = float(os.getenv("TRACE_SAMPLE_RATIO", "1.0"))
+# Caps new (root) traces per second per process; 0 disables the cap.
+TRACE_RATE_LIMIT_PER_SECOND = float(os.getenv("TRACE_RATE_LIMIT_PER_SECOND", "0"))
+# Unsampled requests are still recorded locally and exported when they fail or run slow.
+# Off by default: every unsampled span then becomes a recording span, so attributes, events
+# and the per-trace buffer cost CPU and memory on all requests, not just the sampled ones.
+TRACE_KEEP_ERRORS_AND_SLOW = os.getenv("TRACE_KEEP_ERRORS_AND_SLOW", "false").lower() == "true"
+TRACE_SLOW_MS = float(os.getenv("TRACE_SLOW_MS", "1000"))
+TRACE_TAIL_BUFFER_TRACES = int(os.getenv("TRACE_TAIL_BUFFER_TRACES", "1000"))
+TRACE_TAIL_BUFFER_SPANS = int(os.getenv("TRACE_TAIL_BUFFER_SPANS", "256"))
+# Standard OTel names for the batch processor settings.
+BSP_MAX_QUEUE_SIZE = int(os.getenv("OTEL_BSP_MAX_QUEUE_SIZE", "2048"))
+BSP_MAX_EXPORT_BATCH_SIZE = int(os.getenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", "512"))
+BSP_SCHEDULE_DELAY_MS = int(os.getenv("OTEL_BSP_SCHEDULE_DELAY", "5000"))
+BSP_EXPORT_TIMEOUT_MS = int(os.getenv("OTEL_BSP_EXPORT_TIMEOUT", "30000"))
 
-def configure_tracing(service_name: str) -> None:
-    tracer_provider = TracerProvider(resource=Resource.create({SERVICE_NAME: service_name}))
-    exporter = JaegerExporter(
-        agent_host_name=os.getenv("JAEGER_HOST", "jaeger"),
-        agent_port=int(os.getenv("JAEGER_PORT", "6831")),
+SPANS_DROPPED = Counter("otel_spans_dropped_total", "Spans lost before export", ["reason"])
+SPANS_TAIL_KEPT = Counter(
+    "otel_spans_tail_kept_total", "Unsampled spans exported because the request failed or ran slow"
+)
+
+
+class RecordUnsampled(Sampler):
+    # Turns DROP into RECORD_ONLY so the tail processor can still see the span end. The cost
+    # is that unsampled spans are fully recorded too; build_sampler only uses this when
+    # TRACE_KEEP_ERRORS_AND_SLOW is set.
+    def __init__(self, delegate: Sampler) -> None:
+        self.delegate = delegate
+
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state: Optional[trace.TraceState] = None,
+    ) -> SamplingResult:
+        result = self.delegate.should_sample(
+            parent_context, trace_id, name, kind, attributes, links, trace_state
+        )
+        if result.decision is Decision.DROP:
+            return SamplingResult(Decision.RECORD_ONLY, result.attributes, result.trace_state)
+        return result
+
+    def get_description(self) -> str:
+        return f"RecordUnsampled{{{self.delegate.get_description()}}}"
+
+
+class RateLimitedSampler(Sampler):
+    # Token bucket over the delegate's positive decisions; burst equals one second's budget.
+    def __init__(
+        self,
+        delegate: Sampler,
+        per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.delegate = delegate
+        self.per_second = per_second
+        self.clock = clock
+        self._tokens = per_second
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _take(self) -> bool:
+        with self._lock:
+            now = self.clock()
+            elapsed, self._updated = now - self._updated, now
+            self._tokens = min(self.per_second, self._tokens + elapsed * self.per_second)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state: Optional[trace.TraceState] = None,
+    ) -> SamplingResult:
+        result = self.delegate.should_sample(
+            parent_context, trace_id, name, kind, attributes, links, trace_state
+        )
+        if result.decision.is_sampled() and self.per_second > 0 and not self._take():
+            return SamplingResult(Decision.DROP, None, result.trace_state)
+        return result
+
+    def get_description(self) -> str:
+        return f"RateLimited{{{self.per_second}/s,{self.delegate.get_description()}}}"
+
+
+def build_sampler(
+    ratio: float = TRACE_SAMPLE_RATIO,
+    per_second: float = TRACE_RATE_LIMIT_PER_SECOND,
+    keep_errors_and_slow: bool = TRACE_KEEP_ERRORS_AND_SLOW,
+) -> Sampler:
+    root: Sampler = RateLimitedSampler(TraceIdRatioBased(ratio), per_second)
+    not_sampled: Sampler = ALWAYS_OFF
+    if keep_errors_and_slow:
+        root = RecordUnsampled(root)
+        not_sampled = RecordUnsampled(ALWAYS_OFF)
+    return ParentBased(
+        root,
+        remote_parent_not_sampled=not_sampled,
+        local_parent_not_sampled=not_sampled,
+    )
+
+
+def _as_sampled(span: ReadableSpan) -> ReadableSpan:
+    context = span.get_span_context()
+    return ReadableSpan(
+        name=span.name,
+        context=SpanContext(
+            context.trace_id,
+            context.span_id,
+            context.is_remote,
+            TraceFlags(TraceFlags.SAMPLED),
+            context.trace_state,
+        ),
+        parent=span.parent,
+        resource=span.resource,
+        attributes=span.attributes,
+        events=span.events,
+        links=span.links,
+        kind=span.kind,
+        status=span.status,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        instrumentation_scope=span.instrumentation_scope,
+    )
+
+
+class QueueDepth:
+    """Approximate number of spans waiting in a batch processor's queue.
+
+    The processor forwarding spans calls ``put``; the exporter calls ``take`` as each batch is
+    picked up. A full batch processor discards its oldest span, so ``put`` reports that as a
+    drop and leaves the depth unchanged.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._depth = 0
+        self._lock = threading.Lock()
+
+    def put(self) -> bool:
+        with self._lock:
+            if self._depth >= self.max_size:
+                return False
+            self._depth += 1
+            return True
+
+    def take(self, count: int) -> None:
+        with self._lock:
+            self._depth = max(0, self._depth - count)
+
+
+class TailKeepSpanProcessor(SpanProcessor):
+    """Forwards sampled spans to a batch processor and holds recorded-only spans per trace.
+
+    When the local root span (no parent, or a remote one) ends, the held spans are exported
+    if any of them errored or the root took at least ``slow_ms``; otherwise they are dropped.
+    Queue overflows are counted when ``depth`` is shared with the delegate's exporter.
+    """
+
+    def __init__(
+        self,
+        delegate: BatchSpanProcessor,
+        depth: Optional[QueueDepth] = None,
+        slow_ms: float = TRACE_SLOW_MS,
+        max_traces: int = TRACE_TAIL_BUFFER_TRACES,
+        max_spans: int = TRACE_TAIL_BUFFER_SPANS,
+    ) -> None:
+        self.delegate = delegate
+        self.depth = depth
+        self.slow_ns = int(slow_ms * 1_000_000)
+        self.max_traces = max_traces
+        self.max_spans = max_spans
+        self._pending: "OrderedDict[int, List[ReadableSpan]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_start(self, span, parent_context: Optional[Context] = None) -> None:
+        self.delegate.on_start(span, parent_context)
+
+    def _forward(self, span: ReadableSpan) -> None:
+        if self.depth is not None and not self.depth.put():
+            SPANS_DROPPED.labels("queue_full").inc()
+        self.delegate.on_end(span)
+
+    def _hold(self, span: ReadableSpan) -> Optional[List[ReadableSpan]]:
+        trace_id = span.get_span_context().trace_id
+        with self._lock:
+            spans = self._pending.get(trace_id)
+            if spans is None:
+                if len(self._pending) >= self.max_traces:
+                    _, evicted = self._pending.popitem(last=False)
+                    SPANS_DROPPED.labels("tail_buffer_full").inc(len(evicted))
+                spans = self._pending[trace_id] = []
+            if len(spans) < self.max_spans:
+                spans.append(span)
+            else:
+                SPANS_DROPPED.labels("tail_buffer_full").inc()
+            if span.parent is None or span.parent.is_remote:
+                return self._pending.pop(trace_id)
+        return None
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.get_span_context().trace_flags.sampled:
+            self._forward(span)
+            return
+        finished = self._hold(span)
+        if finished is None:
+            return
+        duration = (span.end_time or 0) - (span.start_time or 0)
+        failed = any(held.status.status_code is StatusCode.ERROR for held in finished)
+        if failed or duration >= self.slow_ns:
+            SPANS_TAIL_KEPT.inc(len(finished))
+            for held in finished:
+                self._forward(_as_sampled(held))
+
+    def shutdown(self) -> None:
+        self.delegate.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.delegate.force_flush(timeout_millis)
+
+
+class CountingSpanExporter(SpanExporter):
+    def __init__(self, delegate: SpanExporter, depth: Optional[QueueDepth] = None) -> None:
+        self.delegate = delegate
+        self.depth = depth
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if self.depth is not None:
+            self.depth.take(len(spans))
+        try:
+            result = self.delegate.export(spans)
+        except Exception:
+            SPANS_DROPPED.labels("export_failed").inc(len(spans))
+            raise
+        if result is SpanExportResult.FAILURE:
+            SPANS_DROPPED.labels("export_failed").inc(len(spans))
+        return result
+
+    def shutdown(self) -> None:
+        self.delegate.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.delegate.force_flush(timeout_millis)
+
+
+def build_exporter(kind: str = TRACE_EXPORTER) -> Optional[SpanExporter]:
+    if kind == "none":
+        return None
+    if kind == "otlp":
+        # Endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* variables.
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter()
+    if kind == "jaeger":
+        from opentelemetry.exporter.jaeger.thrift import JaegerExporter
+
+        return JaegerExporter(
+            agent_host_name=os.getenv("JAEGER_HOST", "jaeger"),
+            agent_port=int(os.getenv("JAEGER_PORT", "6831")),
+        )
+    raise ValueError(f"Unknown TRACE_EXPORTER: {kind}")
+
+
+def build_tracer_provider(
+    service_name: str,
+    exporter: Optional[SpanExporter] = None,
+    sampler: Optional[Sampler] = None,
+) -> TracerProvider:
+    tracer_provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: service_name}),
+        sampler=sampler or build_sampler(),
     )
-    tracer_provider.add_span_processor(BatchSpanProcessor(exporter))
-    trace.set_tracer_provider(tracer_provider)
+    if exporter is not None:
+        depth = QueueDepth(BSP_MAX_QUEUE_SIZE)
+        processor = BatchSpanProcessor(
+            CountingSpanExporter(exporter, depth),
+            max_queue_size=BSP_MAX_QUEUE_SIZE,
+            schedule_delay_millis=BSP_SCHEDULE_DELAY_MS,
+            max_export_batch_size=BSP_MAX_EXPORT_BATCH_SIZE,
+            export_timeout_millis=BSP_EXPORT_TIMEOUT_MS,
+        )
+        tracer_provider.add_span_processor(TailKeepSpanProcessor(processor, depth))
+    return tracer_provider
+
+
+def configure_tracing(service_name: str) -> None:
+    trace.set_tracer_provider(build_tracer_provider(service_name, build_exporter()))
     HTTPXClientInstrumentor().instrument()
 
 
@@ -0,0 +1,170 @@
+"""Partition maintenance for the range-partitioned ``auditevent`` table.
+
+Creates partitions ahead of time and drops (or detaches) expired ones, so
+retention never needs a bulk DELETE. The service runs this periodically; it
+can also be run by hand or from a CronJob::
+
+    python -m app.partitions --ahead 3 --retention-days 90 --detach
+"""
+
+import argparse
+import logging
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+AUDIT_PARTITION_INTERVAL = os.getenv("AUDIT_PARTITION_INTERVAL", "month")
+AUDIT_PARTITIONS_AHEAD = int(os.getenv("AUDIT_PARTITIONS_AHEAD", "3"))
+AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "90"))
+AUDIT_ROLLUP_RETENTION_DAYS = int(os.getenv("AUDIT_ROLLUP_RETENTION_DAYS", "400"))
+AUDIT_DETACH_EXPIRED = os.getenv("AUDIT_DETACH_EXPIRED", "false").lower() == "true"
+
+PARENT_TABLE = "auditevent"
+# Arbitrary constant shared by every replica so only one runs maintenance at a time.
+MAINTENANCE_LOCK_ID = 0x4A7D17
+BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+logger = logging.getLogger("audit.partitions")
+
+Bounds = Tuple[datetime, datetime]
+
+
+def partition_start(moment: datetime, interval: str) -> datetime:
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "day":
+        return day
+    if interval == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unsupported partition interval: {interval}")
+
+
+def next_start(start: datetime, interval: str) -> datetime:
+    if interval == "day":
+        return start + timedelta(days=1)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def partition_name(start: datetime, interval: str) -> str:
+    suffix = start.strftime("%Y%m%d") if interval == "day" else start.strftime("%Y%m")
+    return f"{PARENT_TABLE}_p{suffix}"
+
+
+def existing_partitions(conn: Connection) -> Dict[str, Bounds]:
+    rows = conn.execute(
+        text(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+            "FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = :parent"
+        ),
+        {"parent": PARENT_TABLE},
+    ).all()
+    partitions: Dict[str, Bounds] = {}
+    for name, bound in rows:
+        match = BOUND_PATTERN.search(bound or "")
+        if match:
+            partitions[name] = (
+                datetime.fromisoformat(match.group(1)),
+                datetime.fromisoformat(match.group(2)),
+            )
+    return partitions
+
+
+def ensure_partitions(conn: Connection, now: datetime, ahead: int, interval: str) -> List[str]:
+    existing = existing_partitions(conn)
+    created: List[str] = []
+    start = partition_start(now, interval)
+    for _ in range(ahead + 1):
+        end = next_start(start, interval)
+        # Ranges already covered (e.g. monthly partitions after switching to daily) are skipped.
+        overlaps = any(lower < end and start < upper for lower, upper in existing.values())
+        if not overlaps:
+            name = partition_name(start, interval)
+            conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "  # nosec B608
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                )
+            )
+            existing[name] = (start, end)
+            created.append(name)
+        start = end
+    return created
+
+
+def expire_partitions(
+    conn: Connection, now: datetime, retention_days: int, detach: bool
+) -> List[str]:
+    cutoff = now - timedelta(days=retention_days)
+    expired: List[str] = []
+    for name, (_, upper) in sorted(existing_partitions(conn).items()):
+        if upper > cutoff:
+            continue
+        if detach:
+            conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        else:
+            conn.execute(text(f"DROP TABLE {name}"))
+        expired.append(name)
+    return expired
+
+
+def run_maintenance(
+    engine: Engine,
+    now: Optional[datetime] = None,
+    ahead: int = AUDIT_PARTITIONS_AHEAD,
+    retention_days: int = AUDIT_RETENTION_DAYS,
+    interval: str = AUDIT_PARTITION_INTERVAL,
+    detach: bool = AUDIT_DETACH_EXPIRED,
+) -> Tuple[List[str], List[str]]:
+    if engine.dialect.name != "postgresql":
+        return [], []
+    now = now or datetime.utcnow()
+    with engine.begin() as conn:
+        locked = conn.execute(
+            text("SELECT pg_try_advisory_xact_lock(:lock_id)"), {"lock_id": MAINTENANCE_LOCK_ID}
+        ).scalar()
+        if not locked:
+            return [], []
+        # DDL on the parent queues behind long reads; fail fast instead of stalling ingestion.
+        conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+        created = ensure_partitions(conn, now, ahead, interval)
+        expired = expire_partitions(conn, now, retention_days, detach)
+        # Rollups are tiny (one row per minute and event type), so a DELETE is fine here.
+        conn.execute(
+            text("DELETE FROM auditeventrollup WHERE bucket < :cutoff"),
+            {"cutoff": now - timedelta(days=AUDIT_ROLLUP_RETENTION_DAYS)},
+        )
+    if created or expired:
+        logger.info("audit_partitions created=%s expired=%s", created, expired)
+    return created, expired
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain auditevent partitions.")
+    parser.add_argument("--ahead", type=int, default=AUDIT_PARTITIONS_AHEAD)
+    parser.add_argument("--retention-days", type=int, default=AUDIT_RETENTION_DAYS)
+    parser.add_argument("--interval", choices=["day", "month"], default=AUDIT_PARTITION_INTERVAL)
+    parser.add_argument("--detach", action="store_true", default=AUDIT_DETACH_EXPIRED)
+    args = parser.parse_args(argv)
+
+    from app.main import engine
+
+    created, expired = run_maintenance(
+        engine,
+        ahead=args.ahead,
+        retention_days=args.retention_days,
+        interval=args.interval,
+        detach=args.detach,
+    )
+    print(f"created={created} expired={expired}")
+
+
+if __name__ == "__main__":
+    main()
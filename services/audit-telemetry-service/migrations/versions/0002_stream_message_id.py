@@ -0,0 +1,28 @@
+"""stream message id
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("auditevent", sa.Column("stream", sa.String(), nullable=True))
+    op.add_column("auditevent", sa.Column("message_id", sa.String(), nullable=True))
+    op.create_unique_constraint(
+        "uq_auditevent_stream_message_id", "auditevent", ["stream", "message_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_auditevent_stream_message_id", "auditevent", type_="unique")
+    op.drop_column("auditevent", "message_id")
+    op.drop_column("auditevent", "stream")
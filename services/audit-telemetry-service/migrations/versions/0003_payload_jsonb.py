@@ -0,0 +1,46 @@
+"""payload jsonb and query indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rows written before producers JSON-encoded payloads are kept under {"raw": ...}.
+    op.alter_column(
+        "auditevent",
+        "payload",
+        type_=postgresql.JSONB(),
+        postgresql_using=(
+            "CASE WHEN payload IS JSON OBJECT THEN payload::jsonb "
+            "ELSE jsonb_build_object('raw', payload) END"
+        ),
+    )
+    op.create_index(
+        "ix_auditevent_event_type_created_at", "auditevent", ["event_type", "created_at"]
+    )
+    op.create_index("ix_auditevent_created_at_id", "auditevent", ["created_at", "id"])
+    op.create_index(
+        "ix_auditevent_payload",
+        "auditevent",
+        ["payload"],
+        postgresql_using="gin",
+        postgresql_ops={"payload": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_auditevent_payload", table_name="auditevent")
+    op.drop_index("ix_auditevent_created_at_id", table_name="auditevent")
+    op.drop_index("ix_auditevent_event_type_created_at", table_name="auditevent")
+    op.alter_column("auditevent", "payload", type_=sa.String(), postgresql_using="payload::text")
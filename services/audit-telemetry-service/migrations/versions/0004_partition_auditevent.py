@@ -0,0 +1,135 @@
+"""partition auditevent by created_at and add rollups
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    "ix_auditevent_event_type_created_at",
+    "ix_auditevent_created_at_id",
+    "ix_auditevent_payload",
+)
+
+
+def _next_month(start: datetime) -> datetime:
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def _create_indexes() -> None:
+    op.create_index(
+        "ix_auditevent_event_type_created_at", "auditevent", ["event_type", "created_at"]
+    )
+    op.create_index("ix_auditevent_created_at_id", "auditevent", ["created_at", "id"])
+    op.create_index(
+        "ix_auditevent_payload",
+        "auditevent",
+        ["payload"],
+        postgresql_using="gin",
+        postgresql_ops={"payload": "jsonb_path_ops"},
+    )
+
+
+def upgrade() -> None:
+    for index in INDEXES:
+        op.drop_index(index, table_name="auditevent")
+    op.drop_constraint("uq_auditevent_stream_message_id", "auditevent", type_="unique")
+    op.execute("ALTER TABLE auditevent RENAME CONSTRAINT auditevent_pkey TO auditevent_legacy_pkey")
+    op.rename_table("auditevent", "auditevent_legacy")
+
+    op.execute(
+        """
+        CREATE TABLE auditevent (
+            id uuid NOT NULL,
+            event_type varchar NOT NULL,
+            payload jsonb NOT NULL,
+            stream varchar,
+            message_id varchar,
+            created_at timestamp NOT NULL,
+            CONSTRAINT auditevent_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT uq_auditevent_stream_message_id UNIQUE (stream, message_id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    _create_indexes()
+
+    # Monthly partitions from the oldest legacy row through three months ahead; the
+    # service's maintenance job (app.partitions) keeps extending the range afterwards.
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM auditevent_legacy")).scalar()
+    now = datetime.utcnow()
+    start = (oldest or now).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    horizon = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(3):
+        horizon = _next_month(horizon)
+    while start <= horizon:
+        end = _next_month(start)
+        op.execute(
+            f"CREATE TABLE auditevent_p{start:%Y%m} PARTITION OF auditevent "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+
+    op.execute(
+        "INSERT INTO auditevent (id, event_type, payload, stream, message_id, created_at) "
+        "SELECT id, event_type, payload, stream, message_id, created_at FROM auditevent_legacy"
+    )
+    op.drop_table("auditevent_legacy")
+
+    op.create_table(
+        "auditeventrollup",
+        sa.Column("bucket", sa.DateTime(), primary_key=True),
+        sa.Column("event_type", sa.String(), primary_key=True),
+        sa.Column("event_count", sa.BigInteger(), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO auditeventrollup (bucket, event_type, event_count) "
+        "SELECT date_trunc('minute', created_at), event_type, count(*) "
+        "FROM auditevent GROUP BY 1, 2"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("auditeventrollup")
+    op.rename_table("auditevent", "auditevent_partitioned")
+    for index in INDEXES:
+        op.execute(f"ALTER INDEX {index} RENAME TO {index}_partitioned")
+    op.execute(
+        "ALTER TABLE auditevent_partitioned "
+        "RENAME CONSTRAINT auditevent_pkey TO auditevent_partitioned_pkey"
+    )
+    op.execute(
+        "ALTER TABLE auditevent_partitioned RENAME CONSTRAINT uq_auditevent_stream_message_id "
+        "TO uq_auditevent_partitioned_stream_message_id"
+    )
+    op.create_table(
+        "auditevent",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("stream", sa.String(), nullable=True),
+        sa.Column("message_id", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("stream", "message_id", name="uq_auditevent_stream_message_id"),
+    )
+    _create_indexes()
+    op.execute(
+        "INSERT INTO auditevent (id, event_type, payload, stream, message_id, created_at) "
+        "SELECT id, event_type, payload, stream, message_id, created_at "
+        "FROM auditevent_partitioned"
+    )
+    # Dropping the parent drops every attached partition.
+    op.drop_table("auditevent_partitioned")
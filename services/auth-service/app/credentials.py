@@ -0,0 +1,162 @@
+"""Password hashing and the credential stores auth-service checks logins against.
+
+Hashes are scrypt with a per-hash salt and cost, stored as
+``scrypt$<log2 n>$<r>$<p>$<salt>$<digest>``, so raising PASSWORD_HASH_COST only affects
+new hashes. Hashing runs on a dedicated thread pool: a burst of logins queues there instead
+of stalling the event loop (and the refreshes it serves) or the default executor.
+
+Produce a hash for a credentials file with::
+
+    python -m app.credentials hash 'correct horse battery staple'
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional
+
+# log2 of the scrypt CPU/memory cost; 14 is ~50 ms and 16 MiB per hash on a modern core.
+PASSWORD_HASH_COST = int(os.getenv("PASSWORD_HASH_COST", "14"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+# JSON object of {"<username>": {"password_hash": "...", "role": "..."}}. When unset, the demo
+# users below are hashed at startup.
+CREDENTIALS_FILE = os.getenv("CREDENTIALS_FILE", "")
+
+DEMO_USERS = {
+    "admin@example.com": {"password": "admin123", "role": "admin"},
+    "analyst@example.com": {"password": "analyst123", "role": "analyst"},
+    "viewer@example.com": {"password": "viewer123", "role": "viewer"},
+}
+
+_hash_pool = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password: str, salt: bytes, cost: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=2**cost, r=r, p=p, maxmem=256 * r * 2**cost
+    )
+
+
+def hash_password(password: str, cost: int = PASSWORD_HASH_COST) -> str:
+    salt = secrets.token_bytes(16)
+    return f"scrypt${cost}$8$1${_b64(salt)}${_b64(_scrypt(password, salt, cost, 8, 1))}"
+
+
+@lru_cache(maxsize=None)
+def _dummy_hash() -> str:
+    return hash_password(secrets.token_urlsafe(16))
+
+
+def verify_password(password: str, password_hash: Optional[str]) -> bool:
+    if password_hash is None:
+        # Unknown usernames cost as much as a wrong password.
+        verify_password(password, _dummy_hash())
+        return False
+    try:
+        scheme, cost, r, p, salt, digest = password_hash.split("$")
+        if scheme != "scrypt":
+            return False
+        candidate = _scrypt(password, _unb64(salt), int(cost), int(r), int(p))
+        return hmac.compare_digest(candidate, _unb64(digest))
+    except ValueError:
+        # Malformed hash (or base64 padding error, a ValueError subclass).
+        return False
+
+
+async def verify_password_async(password: str, password_hash: Optional[str]) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_pool, verify_password, password, password_hash
+    )
+
+
+@dataclass(frozen=True)
+class Credential:
+    username: str
+    password_hash: str
+    role: str
+
+
+class CredentialStore(ABC):
+    """Looks up credentials by username; subclass for a database- or directory-backed store."""
+
+    @abstractmethod
+    async def get(self, username: str) -> Optional[Credential]: ...
+
+    def load(self) -> None:
+        # Blocking preparation, run once during startup.
+        return None
+
+
+class StaticCredentialStore(CredentialStore):
+    def __init__(self, credentials: Optional[Dict[str, Credential]] = None) -> None:
+        self.credentials = dict(credentials or {})
+
+    async def get(self, username: str) -> Optional[Credential]:
+        return self.credentials.get(username)
+
+
+class DemoCredentialStore(StaticCredentialStore):
+    def load(self) -> None:
+        self.credentials = {
+            username: Credential(username, hash_password(user["password"]), user["role"])
+            for username, user in DEMO_USERS.items()
+        }
+
+
+class FileCredentialStore(StaticCredentialStore):
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+
+    def load(self) -> None:
+        with open(self.path, encoding="utf-8") as handle:
+            users = json.load(handle)
+        self.credentials = {
+            username: Credential(username, user["password_hash"], user["role"])
+            for username, user in users.items()
+        }
+
+
+def create_store() -> CredentialStore:
+    return FileCredentialStore(CREDENTIALS_FILE) if CREDENTIALS_FILE else DemoCredentialStore()
+
+
+async def authenticate(
+    store: CredentialStore, username: str, password: str
+) -> Optional[Credential]:
+    credential = await store.get(username)
+    valid = await verify_password_async(password, credential.password_hash if credential else None)
+    return credential if credential and valid else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="auth-service credential tools")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    hash_command = subcommands.add_parser("hash", help="print the hash of a password")
+    hash_command.add_argument("password")
+    hash_command.add_argument("--cost", type=int, default=PASSWORD_HASH_COST)
+    args = parser.parse_args()
+    print(hash_password(args.password, args.cost))
+
+
+if __name__ == "__main__":
+    main()
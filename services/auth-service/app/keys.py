@@ -0,0 +1,93 @@
+"""Signing keys for auth-service tokens and the JWKS document that publishes them.
+
+Keys are PEM files (EC P-256, PKCS#8) in JWT_SIGNING_KEYS_DIR; each file's stem is its `kid`.
+Rotation is file based: add the new key, and remove the old one once the tokens it signed
+have expired. A new key is published at once but only signs after JWT_KEY_ACTIVATION_SECONDS,
+so every verifier has refreshed its key set before the first token carrying its `kid` arrives.
+
+Without a directory an ephemeral key is generated at startup; that suits a single replica
+only, since every replica would publish and sign with a different key.
+"""
+
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from jose import jwk, jwt
+
+JWT_SIGNING_KEYS_DIR = os.getenv("JWT_SIGNING_KEYS_DIR", "")
+# Longer than the verifiers' JWKS_REFRESH_SECONDS.
+JWT_KEY_ACTIVATION_SECONDS = float(os.getenv("JWT_KEY_ACTIVATION_SECONDS", "360"))
+JWT_KEYS_RELOAD_SECONDS = float(os.getenv("JWT_KEYS_RELOAD_SECONDS", "60"))
+
+logger = logging.getLogger("auth.keys")
+
+
+def generate_pem() -> bytes:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    return ec.generate_private_key(ec.SECP256R1()).private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+class SigningKeys:
+    def __init__(self, algorithm: str = "ES256", keys_dir: str = JWT_SIGNING_KEYS_DIR) -> None:
+        self.algorithm = algorithm
+        self.keys_dir = Path(keys_dir) if keys_dir else None
+        # (kid, created, private key), oldest first.
+        self._keys: List[Tuple[str, float, Any]] = []
+        self._jwks: Dict[str, Any] = {"keys": []}
+        self._mtimes: Dict[str, float] = {}
+
+    def _read_dir(self, keys_dir: Path) -> List[Tuple[str, float, Any]]:
+        mtimes = {path.stem: path.stat().st_mtime for path in keys_dir.glob("*.pem")}
+        if mtimes == self._mtimes:
+            return self._keys
+        self._mtimes = mtimes
+        keys = [
+            (kid, created, jwk.construct((keys_dir / f"{kid}.pem").read_bytes(), self.algorithm))
+            for kid, created in mtimes.items()
+        ]
+        return sorted(keys, key=lambda entry: entry[1])
+
+    def reload(self) -> None:
+        if self.keys_dir is not None:
+            keys = self._read_dir(self.keys_dir)
+            if not keys:
+                raise RuntimeError(f"No *.pem signing keys in {self.keys_dir}")
+        elif self._keys:
+            return
+        else:
+            logger.warning("jwt_ephemeral_signing_key reason=JWT_SIGNING_KEYS_DIR unset")
+            keys = [(uuid.uuid4().hex, 0.0, jwk.construct(generate_pem(), self.algorithm))]
+        if keys is self._keys:
+            return
+        self._keys = keys
+        self._jwks = {
+            "keys": [
+                {**key.public_key().to_dict(), "kid": kid, "use": "sig", "alg": self.algorithm}
+                for kid, _, key in keys
+            ]
+        }
+        logger.info("jwt_signing_keys_loaded kids=%s", ",".join(kid for kid, _, _ in keys))
+
+    def current(self, now: Optional[float] = None) -> Tuple[str, Any]:
+        now = time.time() if now is None else now
+        active = [entry for entry in self._keys if now - entry[1] >= JWT_KEY_ACTIVATION_SECONDS]
+        # Before any key has been published long enough (a fresh deployment), use the oldest.
+        kid, _, key = active[-1] if active else self._keys[0]
+        return kid, key
+
+    def jwks(self) -> Dict[str, Any]:
+        return self._jwks
+
+    def sign(self, claims: Dict[str, Any]) -> str:
+        kid, key = self.current()
+        return jwt.encode(claims, key, algorithm=self.algorithm, headers={"kid": kid})
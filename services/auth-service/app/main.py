@@ -1,66 +1,141 @@
+import asyncio
+import logging
 import os
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict
 
-from fastapi import Depends, FastAPI, HTTPException, status
+from app.credentials import authenticate, create_store
+from app.keys import JWT_KEYS_RELOAD_SECONDS, SigningKeys
+from app.refresh import InvalidRefreshToken, RefreshTokens
+from fastapi import Depends, FastAPI, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import jwt
+from platform_lib.auth import ASYMMETRIC_ALGORITHMS, key_set
 from platform_lib.http_logging import HttpLoggingMiddleware
-from platform_lib.logging import configure_logging
+from platform_lib.lifespan import Redis, ServiceLifespan, Warmup
+from platform_lib.profiling import ProfilingMiddleware
+from platform_lib.redis_client import create_redis
 from platform_lib.request_id import RequestIdMiddleware
-from platform_lib.tracing import configure_tracing, instrument_app
+from platform_lib.timing import ServerTimingMiddleware
+from platform_lib.tracing import instrument_app
 from prometheus_fastapi_instrumentator import Instrumentator
 from pydantic import BaseModel
 
-configure_logging()
-configure_tracing("auth-service")
+JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "15"))
+JWKS_MAX_AGE_SECONDS = int(os.getenv("JWKS_MAX_AGE_SECONDS", "300"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+
+logger = logging.getLogger("auth-service")
+
+# ES256 tokens carry the `kid` of a key published on the JWKS endpoint; HS256 keeps signing
+# with the shared JWT_SECRET.
+signing_keys = SigningKeys(JWT_ALGORITHM) if JWT_ALGORITHM in ASYMMETRIC_ALGORITHMS else None
+credential_store = create_store()
+redis_client = create_redis(REDIS_URL, "auth-service", decode_responses=True)
+refresh_tokens = RefreshTokens(redis_client)
+
+
+def load_signing_keys() -> None:
+    if signing_keys is not None:
+        signing_keys.reload()
+        # This service verifies its own tokens (profiling) from memory, not via its JWKS URL.
+        key_set.load(signing_keys.jwks())
 
-app = FastAPI(title="Auth Service", version="1.0.0", openapi_url="/v1/auth/openapi.json")
+
+async def reload_signing_keys() -> None:
+    while signing_keys is not None:
+        await asyncio.sleep(JWT_KEYS_RELOAD_SECONDS)
+        try:
+            await asyncio.to_thread(load_signing_keys)
+        except Exception as exc:
+            logger.warning("jwt_signing_keys_reload_failed error=%s", exc)
+
+
+lifespan = ServiceLifespan(
+    "auth-service",
+    [
+        Warmup("signing-keys", load_signing_keys),
+        Warmup("credentials", credential_store.load),
+        Redis(redis_client),
+    ],
+    background=[reload_signing_keys],
+)
+app = FastAPI(
+    title="Auth Service",
+    version="1.0.0",
+    openapi_url="/v1/auth/openapi.json",
+    lifespan=lifespan,
+)
+app.include_router(lifespan.router)
 app.add_middleware(RequestIdMiddleware)
 app.add_middleware(HttpLoggingMiddleware)
+app.add_middleware(ProfilingMiddleware, service_name="auth-service")
+app.add_middleware(ServerTimingMiddleware)
 instrument_app(app)
 Instrumentator().instrument(app).expose(app)
 
-JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret")
-JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
-JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "15"))
-
 
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str
     expires_in: int
     role: str
+    refresh_token: str
+    refresh_expires_in: int
 
 
-FAKE_USERS = {
-    "admin@example.com": {"password": "admin123", "role": "admin"},
-    "analyst@example.com": {"password": "analyst123", "role": "analyst"},
-    "viewer@example.com": {"password": "viewer123", "role": "viewer"},
-}
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 
-def authenticate_user(username: str, password: str) -> Optional[dict]:
-    user = FAKE_USERS.get(username)
-    if not user or user["password"] != password:
-        return None
-    return {"sub": username, "role": user["role"]}
+def token_response(
+    claims: Dict[str, Any], refresh_token: str, refresh_expires_in: int
+) -> TokenResponse:
+    expire = datetime.utcnow() + timedelta(minutes=JWT_EXPIRE_MINUTES)
+    payload = {**claims, "exp": expire}
+    if signing_keys is not None:
+        token = signing_keys.sign(payload)
+    else:
+        token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)  # nosec B106 - dev only
+    return TokenResponse(
+        access_token=token,
+        token_type="bearer",  # nosec B106 - OAuth token type label, not a password/secret
+        expires_in=JWT_EXPIRE_MINUTES * 60,
+        role=claims["role"],
+        refresh_token=refresh_token,
+        refresh_expires_in=refresh_expires_in,
+    )
 
 
 @app.post("/v1/auth/login", response_model=TokenResponse)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()) -> TokenResponse:
-    user = authenticate_user(form_data.username, form_data.password)
-    if not user:
+    credential = await authenticate(credential_store, form_data.username, form_data.password)
+    if credential is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    expire = datetime.utcnow() + timedelta(minutes=JWT_EXPIRE_MINUTES)
-    payload = {**user, "exp": expire}
-    token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)    # nosec B106 - demo-only default, overridden in prod
-    return TokenResponse(       
-        access_token=token,
-        token_type="bearer",    # nosec B106 - OAuth token type label, not a password/secret
-        expires_in=JWT_EXPIRE_MINUTES * 60,
-        role=user["role"],
-    )
+    claims = {"sub": credential.username, "role": credential.role}
+    refresh_token, refresh_expires_in = await refresh_tokens.issue(claims)
+    return token_response(claims, refresh_token, refresh_expires_in)
+
+
+@app.post("/v1/auth/refresh", response_model=TokenResponse)
+async def refresh(body: RefreshRequest) -> TokenResponse:
+    # No password check: the fast path for clients whose access token expired.
+    try:
+        claims, refresh_token, refresh_expires_in = await refresh_tokens.rotate(body.refresh_token)
+    except InvalidRefreshToken as exc:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
+        ) from exc
+    return token_response(claims, refresh_token, refresh_expires_in)
+
+
+@app.get("/v1/auth/.well-known/jwks.json")
+async def jwks(response: Response) -> dict:
+    # Verifiers refresh on their own schedule; the max-age only bounds shared caches.
+    response.headers["Cache-Control"] = f"public, max-age={JWKS_MAX_AGE_SECONDS}"
+    return signing_keys.jwks() if signing_keys is not None else {"keys": []}
 
 
 @app.get("/v1/auth/health")
@@ -0,0 +1,88 @@
+"""Refresh tokens: opaque, single use, rotated on every refresh and kept in Redis.
+
+A login starts a token family (`auth:refresh_family:<id>`, expiring after
+REFRESH_FAMILY_MAX_SECONDS however often it rotates). Each token is stored under the SHA-256
+of its value for REFRESH_TOKEN_TTL_SECONDS, so a Redis dump holds no usable tokens.
+Presenting a token claims it with SET NX; presenting it again means it leaked (or a client
+replayed it), and the whole family is revoked, including the token that replaced it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import secrets
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+REFRESH_TOKEN_TTL_SECONDS = int(os.getenv("REFRESH_TOKEN_TTL_SECONDS", str(14 * 24 * 3600)))
+REFRESH_FAMILY_MAX_SECONDS = int(os.getenv("REFRESH_FAMILY_MAX_SECONDS", str(30 * 24 * 3600)))
+
+TOKEN_KEY = "auth:refresh:{}"
+USED_KEY = "auth:refresh_used:{}"
+FAMILY_KEY = "auth:refresh_family:{}"
+
+logger = logging.getLogger("auth.refresh")
+
+
+class InvalidRefreshToken(Exception):
+    pass
+
+
+class RefreshTokenReused(InvalidRefreshToken):
+    pass
+
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class RefreshTokens:
+    def __init__(
+        self,
+        client: Any,
+        ttl_seconds: int = REFRESH_TOKEN_TTL_SECONDS,
+        family_max_seconds: int = REFRESH_FAMILY_MAX_SECONDS,
+    ) -> None:
+        # A redis.asyncio client with decode_responses=True.
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.family_max_seconds = family_max_seconds
+
+    async def issue(
+        self, claims: Dict[str, Any], family: Optional[str] = None, ttl: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """Store a new token for `claims`; returns the token and its lifetime in seconds."""
+        token = secrets.token_urlsafe(32)
+        async with self.client.pipeline(transaction=False) as pipe:
+            if family is None:
+                family = uuid.uuid4().hex
+                pipe.set(FAMILY_KEY.format(family), 1, ex=self.family_max_seconds)
+            ttl = min(self.ttl_seconds, ttl or self.family_max_seconds)
+            record = json.dumps({"family": family, "claims": claims})
+            pipe.set(TOKEN_KEY.format(_digest(token)), record, ex=ttl)
+            await pipe.execute()
+        return token, ttl
+
+    async def rotate(self, token: str) -> Tuple[Dict[str, Any], str, int]:
+        """Consume `token` and issue its successor; returns the claims, new token and TTL."""
+        digest = _digest(token)
+        record = await self.client.get(TOKEN_KEY.format(digest))
+        if record is None:
+            raise InvalidRefreshToken("unknown or expired refresh token")
+        data = json.loads(record)
+        family_key = FAMILY_KEY.format(data["family"])
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(USED_KEY.format(digest), 1, nx=True, ex=self.ttl_seconds)
+            pipe.ttl(family_key)
+            claimed, family_ttl = await pipe.execute()
+        if not claimed:
+            await self.client.delete(family_key)
+            logger.warning(
+                "refresh_token_reused family=%s sub=%s", data["family"], data["claims"].get("sub")
+            )
+            raise RefreshTokenReused("refresh token already used; family revoked")
+        if family_ttl <= 0:
+            raise InvalidRefreshToken("refresh token family revoked or expired")
+        new_token, ttl = await self.issue(data["claims"], data["family"], family_ttl)
+        return data["claims"], new_token, ttl
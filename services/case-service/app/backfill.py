@@ -0,0 +1,170 @@
+"""Offline bulk re-scoring of every case in case-db.
+
+Run from the case-service image, e.g.::
+
+    python -m app.backfill --chunk-size 2000 --checkpoint /tmp/backfill.json
+    python -m app.backfill --dry-run --output /tmp/scores.jsonl
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+import httpx
+from app.main import INTERNAL_TOKEN, SCORING_SERVICE_TOKEN, SCORING_URL, Case, engine
+from sqlalchemy import text
+from sqlmodel import select
+
+logger = logging.getLogger("backfill")
+
+# Two bind parameters per row; keeps a single UPDATE well under Postgres' 65535 limit.
+MAX_CHUNK_SIZE = 10000
+
+ScoredRow = Tuple[uuid.UUID, float]
+
+
+def load_checkpoint(path: Optional[Path]) -> Tuple[Optional[uuid.UUID], int]:
+    if path is None or not path.exists():
+        return None, 0
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return uuid.UUID(data["last_case_id"]), int(data.get("processed", 0))
+
+
+def save_checkpoint(path: Optional[Path], last_case_id: uuid.UUID, processed: int) -> None:
+    if path is None:
+        return
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(
+        json.dumps({"last_case_id": str(last_case_id), "processed": processed}), encoding="utf-8"
+    )
+    os.replace(tmp_path, path)
+
+
+def stream_case_ids(after: Optional[uuid.UUID], chunk_size: int) -> Iterator[List[uuid.UUID]]:
+    query = select(Case.id).order_by(Case.id)
+    if after is not None:
+        query = query.where(Case.id > after)
+    # stream_results uses a server-side (named) cursor so the table is never materialised.
+    with engine.connect().execution_options(stream_results=True, yield_per=chunk_size) as conn:
+        for partition in conn.execute(query).partitions():
+            yield [row[0] for row in partition]
+
+
+def score_chunk(client: httpx.Client, case_ids: List[uuid.UUID]) -> Tuple[str, List[ScoredRow]]:
+    headers = {}
+    if SCORING_SERVICE_TOKEN:
+        headers["Authorization"] = f"Bearer {SCORING_SERVICE_TOKEN}"
+    else:
+        headers["X-Internal-Token"] = INTERNAL_TOKEN
+    response = client.post(
+        f"{SCORING_URL}/v1/scoring/batch",
+        json={"case_ids": [str(case_id) for case_id in case_ids]},
+        headers=headers,
+    )
+    response.raise_for_status()
+    data = response.json()
+    rows = [(uuid.UUID(item["case_id"]), float(item["score"])) for item in data["scores"]]
+    return data["model_version"], rows
+
+
+def bulk_update_scores(rows: Sequence[ScoredRow]) -> None:
+    if not rows:
+        return
+    values = ", ".join(
+        f"(CAST(:id_{i} AS uuid), CAST(:score_{i} AS double precision))" for i in range(len(rows))
+    )
+    params: Dict[str, object] = {}
+    for i, (case_id, score) in enumerate(rows):
+        params[f"id_{i}"] = str(case_id)
+        params[f"score_{i}"] = score
+    statement = text(
+        # Bumping version invalidates ETags that clients hold for these cases.
+        "UPDATE \"case\" SET score = v.score, status = 'SCORED', "  # nosec B608 - bind params only
+        'version = "case".version + 1 '
+        f"FROM (VALUES {values}) AS v (id, score) "
+        'WHERE "case".id = v.id'
+    )
+    with engine.begin() as conn:
+        conn.execute(statement, params)
+
+
+def write_scores(handle: TextIO, model_version: str, rows: Sequence[ScoredRow]) -> None:
+    for case_id, score in rows:
+        handle.write(
+            json.dumps({"case_id": str(case_id), "score": score, "model_version": model_version})
+        )
+        handle.write("\n")
+    handle.flush()
+
+
+def run(
+    chunk_size: int,
+    checkpoint: Optional[Path],
+    dry_run: bool,
+    output: Optional[Path],
+    timeout: float,
+    transport: Optional[httpx.BaseTransport] = None,
+) -> int:
+    last_case_id, processed = load_checkpoint(checkpoint)
+    if last_case_id is not None:
+        logger.info("backfill_resume after=%s processed=%d", last_case_id, processed)
+    handle = output.open("a", encoding="utf-8") if dry_run and output is not None else None
+    started = time.monotonic()
+    run_processed = 0
+    try:
+        with httpx.Client(timeout=timeout, transport=transport) as client:
+            for case_ids in stream_case_ids(last_case_id, chunk_size):
+                model_version, rows = score_chunk(client, case_ids)
+                if handle is not None:
+                    write_scores(handle, model_version, rows)
+                else:
+                    bulk_update_scores(rows)
+                run_processed += len(case_ids)
+                processed += len(case_ids)
+                if not dry_run:
+                    # A dry-run checkpoint would make the next real run skip these cases.
+                    save_checkpoint(checkpoint, case_ids[-1], processed)
+                elapsed = max(time.monotonic() - started, 1e-9)
+                logger.info(
+                    "backfill_progress model_version=%s processed=%d rate=%.1f rows/s",
+                    model_version,
+                    processed,
+                    run_processed / elapsed,
+                )
+    finally:
+        if handle is not None:
+            handle.close()
+    elapsed = max(time.monotonic() - started, 1e-9)
+    logger.info(
+        "backfill_completed processed=%d elapsed=%.1fs rate=%.1f rows/s",
+        processed,
+        elapsed,
+        run_processed / elapsed,
+    )
+    return processed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Re-score every case with the current model.")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--checkpoint", type=Path, default=None)
+    parser.add_argument("--dry-run", action="store_true", help="write scores to --output instead")
+    parser.add_argument("--output", type=Path, default=None, help="dry-run JSONL score file")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args(argv)
+    if not 0 < args.chunk_size <= MAX_CHUNK_SIZE:
+        parser.error(f"--chunk-size must be between 1 and {MAX_CHUNK_SIZE}")
+    if args.dry_run != (args.output is not None):
+        parser.error("--dry-run and --output must be used together")
+    if args.dry_run and args.checkpoint is not None:
+        parser.error("--checkpoint cannot be used with --dry-run")
+    run(args.chunk_size, args.checkpoint, args.dry_run, args.output, args.timeout)
+
+
+if __name__ == "__main__":
+    main()
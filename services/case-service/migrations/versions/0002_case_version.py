@@ -0,0 +1,23 @@
+"""add case row version
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A constant server default is a metadata-only change in Postgres 11+; no table rewrite.
+    op.add_column("case", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    op.drop_column("case", "version")
@@ -1,21 +1,24 @@
 import os
+import uuid
 from typing import Dict
 
 import httpx
+from app.views import BranchError, case_view
 from fastapi import FastAPI, Request, Response
-from platform_lib.auth import decode_jwt_token
+from fastapi.responses import JSONResponse, StreamingResponse
+from platform_lib.auth import decode_jwt_token, key_set
 from platform_lib.http_logging import HttpLoggingMiddleware
-from platform_lib.logging import configure_logging
+from platform_lib.lifespan import HttpClientPool, ServiceLifespan
+from platform_lib.profiling import ProfilingMiddleware
 from platform_lib.request_id import RequestIdMiddleware
-from platform_lib.tracing import configure_tracing, instrument_app
+from platform_lib.timing import ServerTimingMiddleware, merge_server_timing, timed_call
+from platform_lib.tracing import instrument_app
 from prometheus_fastapi_instrumentator import Instrumentator
-from slowapi import Limiter
+from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
-
-configure_logging()
-configure_tracing("gateway")
+from starlette.background import BackgroundTask
 
 SERVICE_URLS: Dict[str, str] = {
     "/v1/auth": os.getenv("AUTH_SERVICE_URL", "http://auth-service:8000"),
@@ -25,45 +28,96 @@ SERVICE_URLS: Dict[str, str] = {
     "/v1/audit": os.getenv("AUDIT_SERVICE_URL", "http://audit-telemetry-service:8000"),
 }
 
-limiter = Limiter(key_func=get_remote_address, default_limits=["60/minute"])
-app = FastAPI(title="Edge Gateway", version="1.0.0")
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+
+limiter = Limiter(
+    key_func=get_remote_address, default_limits=["60/minute"], enabled=RATE_LIMIT_ENABLED
+)
+upstream_pool = HttpClientPool(
+    "upstreams",
+    timeout=10.0,
+    warm_urls=[f"{url}/health/live" for url in dict.fromkeys(SERVICE_URLS.values())],
+)
+lifespan = ServiceLifespan(
+    "gateway", [upstream_pool, key_set], background=[key_set.refresh_forever]
+)
+app = FastAPI(title="Edge Gateway", version="1.0.0", lifespan=lifespan)
+app.include_router(lifespan.router)
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, limiter._rate_limit_exceeded_handler)
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.add_middleware(SlowAPIMiddleware)
 app.add_middleware(RequestIdMiddleware)
 app.add_middleware(HttpLoggingMiddleware)
+app.add_middleware(ProfilingMiddleware, service_name="gateway")
 instrument_app(app)
 Instrumentator().instrument(app).expose(app)
 
 
+# Event streams stay open between events (heartbeats come every SSE_HEARTBEAT_SECONDS), so
+# they get no read timeout.
+STREAM_TIMEOUT = httpx.Timeout(10.0, read=None)
+
+
+@timed_call("proxy")
 async def _proxy(request: Request, upstream_base: str) -> Response:
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        url = f"{upstream_base}{request.url.path}"
-        headers = dict(request.headers)
-        headers.pop("host", None)
-        if "x-request-id" not in {k.lower() for k in headers}:
-            headers["X-Request-Id"] = request.state.request_id
-        body = await request.body()
-        upstream_response = await client.request(
-            request.method,
-            url,
-            headers=headers,
-            content=body,
-            params=request.query_params,
-        )
+    url = f"{upstream_base}{request.url.path}"
+    headers = dict(request.headers)
+    headers.pop("host", None)
+    if "x-request-id" not in {k.lower() for k in headers}:
+        headers["X-Request-Id"] = request.state.request_id
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return await _proxy_stream(request, url, headers)
+    body = await request.body()
+    upstream_response = await upstream_pool.client.request(
+        request.method,
+        url,
+        headers=headers,
+        content=body,
+        params=request.query_params,
+    )
+    # The upstream's Server-Timing metrics are re-emitted under its host name by the gateway's
+    # own header rather than passed through.
+    merge_server_timing(
+        upstream_response.headers.get("server-timing"), httpx.URL(upstream_base).host
+    )
+    # Validators (ETag, If-None-Match) pass through untouched; 304s come from the owning service.
     return Response(
         content=upstream_response.content,
         status_code=upstream_response.status_code,
         headers={
-            k: v for k, v in upstream_response.headers.items() if k.lower() != "content-encoding"
+            k: v
+            for k, v in upstream_response.headers.items()
+            if k.lower() not in ("content-encoding", "server-timing")
         },
     )
 
 
+async def _proxy_stream(request: Request, url: str, headers: Dict[str, str]) -> Response:
+    # Chunks are relayed as they arrive rather than read into memory first.
+    client = upstream_pool.client
+    upstream_request = client.build_request(
+        request.method, url, headers=headers, params=request.query_params, timeout=STREAM_TIMEOUT
+    )
+    upstream_response = await client.send(upstream_request, stream=True)
+    return StreamingResponse(
+        upstream_response.aiter_raw(),
+        status_code=upstream_response.status_code,
+        headers={
+            k: v
+            for k, v in upstream_response.headers.items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        },
+        background=BackgroundTask(upstream_response.aclose),
+    )
+
+
+PUBLIC_PATHS = ("/v1/auth/login", "/v1/auth/refresh", "/v1/auth/.well-known/jwks.json")
+
+
 def _requires_auth(path: str) -> bool:
-    if path.startswith("/v1/auth/login"):
+    if path.startswith(PUBLIC_PATHS):
         return False
-    return any(path.startswith(prefix) for prefix in SERVICE_URLS)
+    return path.startswith("/v1/views") or any(path.startswith(prefix) for prefix in SERVICE_URLS)
 
 
 @app.middleware("http")
@@ -77,6 +131,38 @@ async def auth_middleware(request: Request, call_next):
     return await call_next(request)
 
 
+# Added after auth_middleware so that it wraps it and the token check is part of the timings.
+app.add_middleware(ServerTimingMiddleware)
+
+
+@app.get("/v1/views/cases/{case_id}")
+@limiter.limit("30/minute")
+async def case_detail_view(case_id: uuid.UUID, request: Request) -> Response:
+    headers = {**request.headers, "x-request-id": request.state.request_id}
+    try:
+        view = await case_view(
+            upstream_pool.client,
+            SERVICE_URLS["/v1/cases"],
+            SERVICE_URLS["/v1/users"],
+            SERVICE_URLS["/v1/audit"],
+            str(case_id),
+            headers,
+        )
+    except BranchError as exc:
+        # Without the case there is no view; pass its 4xx/5xx through, or 504/502.
+        if exc.response is not None:
+            return Response(
+                content=exc.response.content,
+                status_code=exc.response.status_code,
+                media_type=exc.response.headers.get("content-type"),
+            )
+        return JSONResponse(
+            {"detail": f"case-service {exc.reason}"},
+            status_code=504 if exc.reason == "timeout" else 502,
+        )
+    return JSONResponse(view)
+
+
 @app.api_route("/v1/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
 @limiter.limit("30/minute")
 async def gateway_proxy(path: str, request: Request) -> Response:
@@ -0,0 +1,134 @@
+"""Composition views: one gateway request fanned out to several upstreams.
+
+The case detail view replaces the UI's sequential case -> owner -> audit calls. The case and
+its audit events are fetched concurrently. The owner is fetched as soon as the case names
+it, while the audit request is still in flight. Each branch has its own timeout. The case is
+required: its failure is the view's failure. A slow or failing owner or audit branch yields a
+`null` section, a reason under `errors`, and `"partial": true`.
+
+Upstream requests carry the caller's token, so every section keeps its service's RBAC (a
+viewer gets the case and owner, and a 403 reason for the audit section).
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Dict, Mapping, Optional
+
+import httpx
+from platform_lib.timing import merge_server_timing, timed
+from prometheus_client import Counter
+
+VIEW_CASE_TIMEOUT_SECONDS = float(os.getenv("VIEW_CASE_TIMEOUT_SECONDS", "2"))
+VIEW_OWNER_TIMEOUT_SECONDS = float(os.getenv("VIEW_OWNER_TIMEOUT_SECONDS", "1"))
+VIEW_AUDIT_TIMEOUT_SECONDS = float(os.getenv("VIEW_AUDIT_TIMEOUT_SECONDS", "1"))
+VIEW_AUDIT_LIMIT = int(os.getenv("VIEW_AUDIT_LIMIT", "20"))
+# Request headers passed on to every branch.
+FORWARDED_HEADERS = ("authorization", "x-request-id")
+
+VIEW_BRANCH_FAILURES = Counter(
+    "gateway_view_branch_failures_total",
+    "Composition view branches that timed out or failed",
+    ["view", "branch", "reason"],
+)
+
+
+class BranchError(Exception):
+    def __init__(self, reason: str, response: Optional[httpx.Response] = None) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.response = response
+
+
+async def fetch_json(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: Mapping[str, str],
+    timeout: float,
+    params: Optional[Dict[str, Any]] = None,
+) -> Any:
+    try:
+        response = await asyncio.wait_for(client.get(url, headers=headers, params=params), timeout)
+    except asyncio.TimeoutError as exc:
+        raise BranchError("timeout") from exc
+    except httpx.HTTPError as exc:
+        raise BranchError("unavailable") from exc
+    merge_server_timing(response.headers.get("server-timing"), response.url.host)
+    if response.status_code != 200:
+        raise BranchError(f"status {response.status_code}", response)
+    try:
+        return response.json()
+    except ValueError as exc:
+        # No response attached: a 200 that is not JSON must not be passed through as the view.
+        raise BranchError("invalid response") from exc
+
+
+async def _branch(view: str, name: str, fetch: Awaitable[Any]) -> Any:
+    try:
+        with timed(f"view_{name}"):
+            return await fetch
+    except BranchError as exc:
+        VIEW_BRANCH_FAILURES.labels(view, name, exc.reason.split(" ")[0]).inc()
+        raise
+
+
+async def case_view(
+    client: httpx.AsyncClient,
+    case_url: str,
+    user_url: str,
+    audit_url: str,
+    case_id: str,
+    request_headers: Mapping[str, str],
+) -> Dict[str, Any]:
+    """Case, owner and recent audit events; raises BranchError when the case itself fails."""
+    headers = {name: request_headers[name] for name in FORWARDED_HEADERS if name in request_headers}
+    audit = asyncio.create_task(
+        _branch(
+            "case",
+            "audit",
+            fetch_json(
+                client,
+                f"{audit_url}/v1/audit",
+                headers,
+                VIEW_AUDIT_TIMEOUT_SECONDS,
+                params={"case_id": case_id, "limit": VIEW_AUDIT_LIMIT},
+            ),
+        )
+    )
+    try:
+        case = await _branch(
+            "case",
+            "case",
+            fetch_json(
+                client, f"{case_url}/v1/cases/{case_id}", headers, VIEW_CASE_TIMEOUT_SECONDS
+            ),
+        )
+    except BaseException:
+        # Whatever ends the view early (including the client going away), stop the audit call.
+        audit.cancel()
+        await asyncio.gather(audit, return_exceptions=True)
+        raise
+
+    owner_id = case.get("owner_id")
+    owner: Awaitable[Any] = (
+        _branch(
+            "case",
+            "owner",
+            fetch_json(
+                client, f"{user_url}/v1/users/{owner_id}", headers, VIEW_OWNER_TIMEOUT_SECONDS
+            ),
+        )
+        if owner_id
+        else asyncio.sleep(0, result=None)
+    )
+    sections: Dict[str, Any] = {"case": case}
+    errors: Dict[str, str] = {}
+    results = await asyncio.gather(owner, audit, return_exceptions=True)
+    for name, result in zip(("owner", "audit"), results):
+        if isinstance(result, BranchError):
+            sections[name] = None
+            errors[name] = result.reason
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            sections[name] = result
+    return {**sections, "partial": bool(errors), "errors": errors}
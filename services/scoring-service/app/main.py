@@ -3,35 +3,78 @@ import os
 import random
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-import httpx
-import redis
 from fastapi import FastAPI, Header, HTTPException, Request
-from platform_lib.auth import decode_jwt_token
+from platform_lib.auth import decode_jwt_token, key_set
+from platform_lib.cache import CachedLoader, TTLCache
+from platform_lib.events import EventProducer
 from platform_lib.http_logging import HttpLoggingMiddleware
-from platform_lib.logging import configure_logging
+from platform_lib.lifespan import HttpClientPool, Redis, ServiceLifespan
+from platform_lib.profiling import ProfilingMiddleware
+from platform_lib.redis_client import create_redis
 from platform_lib.request_id import RequestIdMiddleware
-from platform_lib.tracing import configure_tracing, instrument_app
+from platform_lib.timing import ServerTimingMiddleware, timed_call
+from platform_lib.tracing import instrument_app
 from prometheus_fastapi_instrumentator import Instrumentator
-
-configure_logging()
-configure_tracing("scoring-service")
+from pydantic import BaseModel, Field
 
 CASE_SERVICE_URL = os.getenv("CASE_SERVICE_URL", "http://case-service:8000")
 USER_SERVICE_URL = os.getenv("USER_SERVICE_URL", "http://user-service:8000")
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 SERVICE_TOKEN = os.getenv("SERVICE_TOKEN")
-
-redis_client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
-
-app = FastAPI(title="Scoring Service", version="1.0.0", openapi_url="/v1/scoring/openapi.json")
+MODEL_VERSION = os.getenv("MODEL_VERSION", "mock-1")
+SCORE_CACHE_TTL_SECONDS = float(os.getenv("SCORE_CACHE_TTL_SECONDS", "300"))
+SCORE_CACHE_MAX_ENTRIES = int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "10000"))
+# Matches the backfill's largest chunk; bounds the work and response size of one request.
+SCORE_BATCH_MAX_IDS = 10000
+
+# Only publishes msgpack envelopes, so responses are left binary rather than decoded as UTF-8.
+redis_client = create_redis(REDIS_URL, "scoring-service", decode_responses=False)
+event_producer = EventProducer(redis_client, "scoring-service")
+score_cache: CachedLoader[dict] = CachedLoader(
+    TTLCache(ttl_seconds=SCORE_CACHE_TTL_SECONDS, max_entries=SCORE_CACHE_MAX_ENTRIES)
+)
+
+peer_pool = HttpClientPool(
+    "peers",
+    timeout=2.0,
+    warm_urls=[f"{CASE_SERVICE_URL}/health/live", f"{USER_SERVICE_URL}/health/live"],
+)
+lifespan = ServiceLifespan(
+    "scoring-service",
+    [Redis(redis_client), peer_pool, key_set],
+    background=[key_set.refresh_forever],
+)
+app = FastAPI(
+    title="Scoring Service",
+    version="1.0.0",
+    openapi_url="/v1/scoring/openapi.json",
+    lifespan=lifespan,
+)
+app.include_router(lifespan.router)
 app.add_middleware(RequestIdMiddleware)
 app.add_middleware(HttpLoggingMiddleware)
+app.add_middleware(ProfilingMiddleware, service_name="scoring-service")
+app.add_middleware(ServerTimingMiddleware)
 instrument_app(app)
 Instrumentator().instrument(app).expose(app)
 
 
+class BatchScoreRequest(BaseModel):
+    case_ids: List[uuid.UUID] = Field(max_length=SCORE_BATCH_MAX_IDS)
+
+
+class BatchScore(BaseModel):
+    case_id: uuid.UUID
+    score: float
+
+
+class BatchScoreResponse(BaseModel):
+    model_version: str
+    scores: List[BatchScore]
+
+
 def internal_or_jwt(
     request: Request, internal_token: Optional[str] = Header(default=None, alias="X-Internal-Token")
 ) -> None:
@@ -51,57 +94,80 @@ async def fetch_case(case_id: uuid.UUID) -> Optional[dict]:
     if not SERVICE_TOKEN:
         return None
     headers = {"Authorization": f"Bearer {SERVICE_TOKEN}"}
-    async with httpx.AsyncClient(timeout=2.0) as client:
-        response = await client.get(f"{CASE_SERVICE_URL}/v1/cases/{case_id}", headers=headers)
-        if response.status_code != 200:
-            return None
-        return response.json()
+    response = await peer_pool.client.get(f"{CASE_SERVICE_URL}/v1/cases/{case_id}", headers=headers)
+    if response.status_code != 200:
+        return None
+    return response.json()
 
 
 async def fetch_user(user_id: uuid.UUID) -> Optional[dict]:
     if not SERVICE_TOKEN:
         return None
     headers = {"Authorization": f"Bearer {SERVICE_TOKEN}"}
-    async with httpx.AsyncClient(timeout=2.0) as client:
-        response = await client.get(f"{USER_SERVICE_URL}/v1/users/{user_id}", headers=headers)
-        if response.status_code != 200:
-            return None
-        return response.json()
+    response = await peer_pool.client.get(f"{USER_SERVICE_URL}/v1/users/{user_id}", headers=headers)
+    if response.status_code != 200:
+        return None
+    return response.json()
 
 
-def emit_event(event_type: str, payload: dict) -> None:
-    redis_client.xadd(
-        "case-events",
-        {"event_type": event_type, "payload": payload, "created_at": datetime.utcnow().isoformat()},
-    )
+def score_batch(case_ids: List[uuid.UUID]) -> List[float]:
+    return [round(random.uniform(0.1, 0.99), 4) for _ in case_ids]  # nosec B311 - mock score
 
 
-@app.post("/v1/scoring/{case_id}")
-async def score_case(
-    case_id: uuid.UUID,
-    request: Request,
-    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
-    internal_token: Optional[str] = Header(default=None, alias="X-Internal-Token"),
-) -> dict:
-    internal_or_jwt(request=request, internal_token=internal_token)
-    await asyncio.sleep(random.uniform(0.3, 1.2))   # nosec B311 - demo-only default, overridden in prod
-    if random.random() < 0.2:   # nosec B311 - demo-only default, overridden in prod
+@timed_call("emit_event")
+async def emit_event(event_type: str, payload: dict) -> None:
+    await event_producer.publish(event_type, payload)
+
+
+async def compute_score(case_id: uuid.UUID, idempotency_key: Optional[str]) -> dict:
+    await asyncio.sleep(random.uniform(0.3, 1.2))  # nosec B311 - demo-only simulated latency
+    if random.random() < 0.2:  # nosec B311 - demo-only default, overridden in prod
         raise HTTPException(status_code=503, detail="Scoring engine unavailable")
     case = await fetch_case(case_id)
     owner_id = case.get("owner_id") if case else None
     owner = await fetch_user(uuid.UUID(owner_id)) if owner_id else None
-    score = round(random.uniform(0.1, 0.99), 4)     # nosec B311 - non-security mock score
+    score = round(random.uniform(0.1, 0.99), 4)  # nosec B311 - non-security mock score
     payload = {
         "case_id": str(case_id),
         "score": score,
         "owner": owner,
         "idempotency_key": idempotency_key,
+        "model_version": MODEL_VERSION,
         "updated_at": datetime.utcnow().isoformat(),
     }
-    emit_event("score_updated", payload)
+    await emit_event("score_updated", payload)
     return {"case_id": case_id, "score": score, "updated_at": datetime.utcnow()}
 
 
+@app.post("/v1/scoring/batch", response_model=BatchScoreResponse)
+async def score_cases_batch(
+    body: BatchScoreRequest,
+    request: Request,
+    internal_token: Optional[str] = Header(default=None, alias="X-Internal-Token"),
+) -> BatchScoreResponse:
+    internal_or_jwt(request=request, internal_token=internal_token)
+    scores = score_batch(body.case_ids)
+    return BatchScoreResponse(
+        model_version=MODEL_VERSION,
+        scores=[
+            BatchScore(case_id=case_id, score=score)
+            for case_id, score in zip(body.case_ids, scores)
+        ],
+    )
+
+
+@app.post("/v1/scoring/{case_id}")
+async def score_case(
+    case_id: uuid.UUID,
+    request: Request,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
+    internal_token: Optional[str] = Header(default=None, alias="X-Internal-Token"),
+) -> dict:
+    internal_or_jwt(request=request, internal_token=internal_token)
+    cache_key = (case_id, MODEL_VERSION, idempotency_key)
+    return await score_cache.get_or_load(cache_key, lambda: compute_score(case_id, idempotency_key))
+
+
 @app.get("/v1/scoring/health")
 async def health() -> dict:
     return {"status": "ok"}
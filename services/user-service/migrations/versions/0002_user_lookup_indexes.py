@@ -0,0 +1,33 @@
+"""unique email and keyset pagination indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    duplicates = (
+        op.get_bind()
+        .execute(sa.text('SELECT email FROM "user" GROUP BY email HAVING count(*) > 1 LIMIT 10'))
+        .scalars()
+        .all()
+    )
+    if duplicates:
+        # Merging accounts is a product decision; refuse rather than pick a winner here.
+        raise RuntimeError(f"Resolve duplicate user emails before upgrading: {duplicates}")
+    op.create_unique_constraint("user_email_key", "user", ["email"])
+    op.create_index("ix_user_created_at_id", "user", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_created_at_id", table_name="user")
+    op.drop_constraint("user_email_key", "user", type_="unique")
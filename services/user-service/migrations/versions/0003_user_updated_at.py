@@ -0,0 +1,24 @@
+"""add user updated_at
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("user", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.execute('UPDATE "user" SET updated_at = created_at')
+    op.alter_column("user", "updated_at", nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column("user", "updated_at")
@@ -1,6 +1,88 @@
+import importlib
+import importlib.abc
+import importlib.util
+import os
 import sys
 from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import pytest
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+class _PlatformLibAlias(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    # Services import platform_lib, tests import libs.platform_lib. Both names resolve to one
+    # module object, so module state and Prometheus metrics are not created twice.
+    def find_spec(
+        self, fullname: str, path: Optional[Sequence[str]], target: Optional[ModuleType] = None
+    ) -> Any:
+        if fullname == "platform_lib" or fullname.startswith("platform_lib."):
+            return importlib.util.spec_from_loader(fullname, self)
+        return None
+
+    def create_module(self, spec: Any) -> ModuleType:
+        return importlib.import_module(f"libs.{spec.name}")
+
+    def exec_module(self, module: ModuleType) -> None:
+        pass
+
+
+sys.meta_path.insert(0, _PlatformLibAlias())
+
+
+@pytest.fixture(scope="session")
+def load_service(tmp_path_factory: pytest.TempPathFactory) -> Callable[..., ModuleType]:
+    """Imports services/<service>/app/<module>.py once per session.
+
+    Each service gets its own SQLite database with the model tables created, and no trace
+    exporter. The lifespan is not run: tests call handlers or use TestClient without `with`.
+    """
+    from benchmarks._services import load_service as load
+
+    workdir = tmp_path_factory.mktemp("services")
+    loaded: Dict[str, ModuleType] = {}
+
+    def _load(service: str, module: str = "main") -> ModuleType:
+        key = f"{service}/{module}"
+        if key not in loaded:
+            env = {
+                "DATABASE_URL": f"sqlite:///{workdir / service}.sqlite",
+                "TRACE_EXPORTER": "none",
+            }
+            saved = {name: os.environ.get(name) for name in env}
+            os.environ.update(env)
+            try:
+                loaded[key] = load(service, module)
+            finally:
+                for name, value in saved.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+            main = load(service) if module != "main" else loaded[key]
+            if hasattr(main, "engine") and hasattr(main, "SQLModel"):
+                main.SQLModel.metadata.create_all(main.engine)
+        return loaded[key]
+
+    return _load
+
+
+@pytest.fixture
+def bearer(monkeypatch: pytest.MonkeyPatch) -> Callable[..., Dict[str, str]]:
+    """Authorization headers with a shared-secret token for the given role."""
+    from jose import jwt
+
+    from libs.platform_lib import auth
+
+    monkeypatch.setattr(auth, "JWT_SECRET", "test-secret")
+    monkeypatch.setattr(auth, "JWT_ACCEPT_SHARED_SECRET", True)
+
+    def _headers(role: str = "admin", subject: str = "tester") -> Dict[str, str]:
+        token = jwt.encode({"sub": subject, "role": role}, "test-secret", algorithm="HS256")
+        return {"Authorization": f"Bearer {token}"}
+
+    return _headers
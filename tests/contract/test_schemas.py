@@ -1,8 +1,15 @@
 import uuid
 from datetime import datetime
+from typing import Any, Dict
 
 import pytest
 
+from libs.platform_lib.events import (
+    EVENT_SCHEMA_VERSIONS,
+    EventEnvelope,
+    decode_event,
+    encode_event,
+)
 from libs.platform_lib.schemas import load_schema
 
 jsonschema = pytest.importorskip("jsonschema")
@@ -62,3 +69,31 @@ def test_audit_event_schema() -> None:
         },
         schema,
     )
+
+
+EVENT_EXAMPLES: Dict[str, Dict[str, Any]] = {
+    "case_created": {"case_id": str(uuid.uuid4()), "owner_id": str(uuid.uuid4())},
+    "score_updated": {
+        "case_id": str(uuid.uuid4()),
+        "score": 0.5,
+        "owner": None,
+        "idempotency_key": None,
+        "model_version": "mock-1",
+        "updated_at": datetime.utcnow().isoformat(),
+    },
+    "score_pending": {"case_id": str(uuid.uuid4())},
+}
+
+
+@pytest.mark.parametrize("event_type", sorted(EVENT_SCHEMA_VERSIONS))
+def test_event_envelope_schema(event_type: str) -> None:
+    envelope = EventEnvelope(
+        type=event_type,
+        payload=EVENT_EXAMPLES[event_type],
+        producer="contract-test",
+        schema_version=EVENT_SCHEMA_VERSIONS[event_type],
+        trace_id="a" * 32,
+    )
+    decoded = decode_event({"data": encode_event(envelope)}).to_dict()
+    validate(decoded, load_schema("event_envelope"))
+    validate(decoded["payload"], load_schema(f"{event_type}_v{decoded['schema_version']}"))
@@ -0,0 +1,106 @@
+from typing import Any, Callable, List
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy.exc import DataError, OperationalError
+
+fakeredis = pytest.importorskip("fakeredis")
+
+STREAM = "case-events"
+
+
+@pytest.fixture
+def audit(load_service: Callable[..., Any], monkeypatch: pytest.MonkeyPatch) -> Any:
+    module = load_service("audit-telemetry-service")
+    monkeypatch.setattr(module, "AUDIT_CLAIM_MIN_IDLE_MS", 0)
+    monkeypatch.setattr(module, "AUDIT_MAX_DELIVERIES", 3)
+    return module
+
+
+@pytest.fixture
+def stored(audit: Any, monkeypatch: pytest.MonkeyPatch) -> List[bytes]:
+    """Stands in for the database: rejects entries whose body is "bad"."""
+    rows: List[bytes] = []
+
+    def store_events(stream: str, messages: List[Any]) -> int:
+        if any(data[b"body"] == b"bad" for _, data in messages):
+            raise DataError("INSERT INTO auditevent", {}, ValueError("invalid input"))
+        new = [data[b"body"] for _, data in messages if data[b"body"] not in rows]
+        rows.extend(new)
+        return len(new)
+
+    monkeypatch.setattr(audit, "store_events", store_events)
+    return rows
+
+
+def ingested() -> float:
+    return REGISTRY.get_sample_value("audit_events_ingested_total", {"stream": STREAM}) or 0.0
+
+
+async def read_batch(client: Any, bodies: List[str]) -> List[Any]:
+    await client.xgroup_create(STREAM, "audit-consumers", id="0", mkstream=True)
+    for body in bodies:
+        await client.xadd(STREAM, {"body": body})
+    [(_, messages)] = await client.xreadgroup(
+        "audit-consumers", "consumer-a", {STREAM: ">"}, count=10
+    )
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_rejected_row_does_not_fail_the_batch(audit: Any, stored: List[bytes]) -> None:
+    client = fakeredis.FakeAsyncRedis()
+    messages = await read_batch(client, ["one", "bad", "two"])
+    before = ingested()
+
+    await audit.process_messages(client, STREAM, messages)
+
+    assert stored == [b"one", b"two"]
+    assert ingested() - before == 2
+    pending = await client.xpending_range(STREAM, "audit-consumers", "-", "+", 10)
+    assert [entry["message_id"] for entry in pending] == [messages[1][0]]
+
+
+@pytest.mark.asyncio
+async def test_message_is_dead_lettered_after_max_deliveries(
+    audit: Any, stored: List[bytes]
+) -> None:
+    client = fakeredis.FakeAsyncRedis()
+    messages = await read_batch(client, ["bad", "one"])
+    await audit.process_messages(client, STREAM, messages)
+
+    await audit.reclaim_pending(client, STREAM)  # second delivery: still pending
+    assert await client.xlen(audit.AUDIT_DEAD_LETTER_STREAM) == 0
+    await audit.reclaim_pending(client, STREAM)  # third delivery: dead-lettered
+
+    assert stored == [b"one"]
+    assert await client.xpending_range(STREAM, "audit-consumers", "-", "+", 10) == []
+    [(_, fields)] = await client.xrange(audit.AUDIT_DEAD_LETTER_STREAM)
+    assert fields[b"body"] == b"bad"
+    assert fields[b"dead_letter_stream"] == STREAM.encode()
+    assert fields[b"dead_letter_id"] == messages[0][0]
+
+
+@pytest.mark.asyncio
+async def test_database_outage_leaves_the_batch_pending(
+    audit: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def unreachable(stream: str, messages: List[Any]) -> int:
+        raise OperationalError("INSERT INTO auditevent", {}, ConnectionError("refused"))
+
+    monkeypatch.setattr(audit, "store_events", unreachable)
+
+    client = fakeredis.FakeAsyncRedis()
+    messages = await read_batch(client, ["one", "two"])
+    with pytest.raises(OperationalError):
+        await audit.process_messages(client, STREAM, messages)
+    pending = await client.xpending_range(STREAM, "audit-consumers", "-", "+", 10)
+    assert len(pending) == 2
+    assert await client.xlen(audit.AUDIT_DEAD_LETTER_STREAM) == 0
+
+
+def test_background_loops_have_distinct_names(audit: Any) -> None:
+    # The names key /health/ready and the background_task_failed log.
+    names = [run.__name__ for run in audit.lifespan.background]
+    assert len(set(names)) == len(names)
+    assert {"partition_maintenance", "event_consumer"} <= set(names)
@@ -0,0 +1,106 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+
+class FakeConnection:
+    """Answers the pg_inherits query with `partitions` and records every other statement."""
+
+    def __init__(self, partitions: Dict[str, Tuple[str, str]]) -> None:
+        self.partitions = partitions
+        self.statements: List[str] = []
+
+    def execute(self, statement: Any, params: Optional[Dict[str, Any]] = None) -> Any:
+        sql = str(statement)
+        if "pg_inherits" in sql:
+            rows = [
+                (name, f"FOR VALUES FROM ('{lower}') TO ('{upper}')")
+                for name, (lower, upper) in self.partitions.items()
+            ]
+            return type("Result", (), {"all": lambda self: rows})()
+        self.statements.append(sql)
+        return None
+
+
+@pytest.fixture
+def partitions(load_service: Callable[..., Any]) -> Any:
+    return load_service("audit-telemetry-service", "partitions")
+
+
+def test_partition_bounds(partitions: Any) -> None:
+    moment = datetime(2026, 12, 31, 23, 59, 59)
+    assert partitions.partition_start(moment, "day") == datetime(2026, 12, 31)
+    assert partitions.partition_start(moment, "month") == datetime(2026, 12, 1)
+    assert partitions.next_start(datetime(2026, 12, 1), "month") == datetime(2027, 1, 1)
+    assert partitions.next_start(datetime(2026, 1, 1), "month") == datetime(2026, 2, 1)
+    assert partitions.next_start(datetime(2026, 12, 31), "day") == datetime(2027, 1, 1)
+    assert partitions.partition_name(datetime(2026, 12, 1), "month") == "auditevent_p202612"
+    assert partitions.partition_name(datetime(2026, 12, 31), "day") == "auditevent_p20261231"
+    with pytest.raises(ValueError):
+        partitions.partition_start(moment, "week")
+
+
+def test_ensure_partitions_rolls_over_the_year(partitions: Any) -> None:
+    conn = FakeConnection({})
+    created = partitions.ensure_partitions(conn, datetime(2026, 11, 15), 2, "month")
+    assert created == ["auditevent_p202611", "auditevent_p202612", "auditevent_p202701"]
+    assert "FROM ('2026-12-01T00:00:00') TO ('2027-01-01T00:00:00')" in conn.statements[1]
+
+
+def test_ensure_partitions_skips_ranges_already_covered(partitions: Any) -> None:
+    # A monthly partition still covers March after switching to daily partitions.
+    conn = FakeConnection({"auditevent_p202603": ("2026-03-01 00:00:00", "2026-04-01 00:00:00")})
+    created = partitions.ensure_partitions(conn, datetime(2026, 3, 30, 8), 3, "day")
+    assert created == ["auditevent_p20260401", "auditevent_p20260402"]
+    assert len(conn.statements) == 2
+
+
+def test_expire_partitions_at_the_retention_cutoff(partitions: Any) -> None:
+    conn = FakeConnection(
+        {
+            "auditevent_p202602": ("2026-02-01 00:00:00", "2026-03-01 00:00:00"),
+            # Ends exactly at the cutoff (2026-06-15 minus 90 days): every row is expired.
+            "auditevent_p20260317": ("2026-03-16 00:00:00", "2026-03-17 00:00:00"),
+            "auditevent_p202603": ("2026-03-01 00:00:00", "2026-04-01 00:00:00"),
+        }
+    )
+    now = datetime(2026, 6, 15)
+
+    expired = partitions.expire_partitions(conn, now, 90, detach=False)
+
+    assert expired == ["auditevent_p202602", "auditevent_p20260317"]
+    assert conn.statements == [
+        "DROP TABLE auditevent_p202602",
+        "DROP TABLE auditevent_p20260317",
+    ]
+    detached = FakeConnection({"auditevent_p202602": conn.partitions["auditevent_p202602"]})
+    partitions.expire_partitions(detached, now, 90, detach=True)
+    assert detached.statements == ["ALTER TABLE auditevent DETACH PARTITION auditevent_p202602"]
+
+
+def test_rollup_statement_counts_per_minute(load_service: Callable[..., Any]) -> None:
+    audit = load_service("audit-telemetry-service")
+    inserted = [
+        ("score_updated", datetime(2026, 3, 1, 12, 0, 59)),
+        ("case_created", datetime(2026, 3, 1, 12, 0, 1)),
+        ("case_created", datetime(2026, 3, 1, 12, 0, 30, 500)),
+        ("case_created", datetime(2026, 3, 1, 12, 1, 0)),
+    ]
+
+    compiled = audit.rollup_statement(inserted).compile(dialect=postgresql.dialect())
+
+    params = compiled.params
+    rows = [
+        (params[f"bucket_m{i}"], params[f"event_type_m{i}"], params[f"event_count_m{i}"])
+        for i in range(3)
+    ]
+    assert rows == [
+        (datetime(2026, 3, 1, 12, 0), "case_created", 2),
+        (datetime(2026, 3, 1, 12, 0), "score_updated", 1),
+        (datetime(2026, 3, 1, 12, 1), "case_created", 1),
+    ]
+    sql = str(compiled)
+    assert "ON CONFLICT (bucket, event_type) DO UPDATE" in sql
+    assert "event_count = (auditeventrollup.event_count + excluded.event_count)" in sql
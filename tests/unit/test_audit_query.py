@@ -0,0 +1,72 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, select
+
+START = datetime(2026, 3, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def audit(load_service: Callable[..., Any]) -> Any:
+    return load_service("audit-telemetry-service")
+
+
+@pytest.fixture
+def events(audit: Any) -> List[Tuple[datetime, uuid.UUID]]:
+    """case_created rows at three timestamps, 7 rows each, plus rows the filters exclude."""
+    rows = []
+    for offset in range(3):
+        for _ in range(7):
+            rows.append(("case_created", START + timedelta(seconds=offset)))
+            rows.append(("score_updated", START + timedelta(seconds=offset)))
+    rows.append(("case_created", START - timedelta(hours=1)))
+    with Session(audit.engine) as session:
+        session.execute(delete(audit.AuditEvent))
+        session.add_all(
+            audit.AuditEvent(event_type=event_type, payload={}, created_at=created_at)
+            for event_type, created_at in rows
+        )
+        session.commit()
+        matching = [
+            (event.created_at, event.id)
+            for event in session.exec(select(audit.AuditEvent)).all()
+            if event.event_type == "case_created" and event.created_at >= START
+        ]
+    return sorted(matching, reverse=True)
+
+
+def test_filtered_pages_have_no_gaps_or_duplicates(
+    audit: Any, events: List[Tuple[datetime, uuid.UUID]], bearer: Callable[..., Dict[str, str]]
+) -> None:
+    client = TestClient(audit.app)
+    params: Dict[str, Any] = {"event_type": "case_created", "since": START.isoformat(), "limit": 4}
+    seen: List[uuid.UUID] = []
+    pages = 0
+    while True:
+        response = client.get("/v1/audit", params=params, headers=bearer("analyst"))
+        assert response.status_code == 200
+        page = response.json()
+        assert all(event["event_type"] == "case_created" for event in page)
+        seen.extend(uuid.UUID(event["id"]) for event in page)
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    # Newest first, ties on created_at broken by id, each row exactly once.
+    assert seen == [row_id for _, row_id in events]
+    assert pages == 6  # 21 rows: five full pages and a last short one
+
+
+def test_case_filter_uses_jsonb_containment(audit: Any) -> None:
+    case_id = uuid.uuid4()
+    statement = audit.build_audit_query(case_id=case_id, limit=10)
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "payload @>" in sql
+    assert "ORDER BY auditevent.created_at DESC, auditevent.id DESC" in sql
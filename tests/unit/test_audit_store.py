@@ -0,0 +1,73 @@
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from libs.platform_lib.events import DATA_FIELD, TYPE_FIELD, EventEnvelope, encode_event
+
+# Stream ids carry their time: 12:00:10 and 12:00:40, then 12:01:05 on 2026-03-02 (UTC).
+MINUTE = 1_772_452_800_000
+
+
+@pytest.fixture
+def audit(load_service: Callable[..., Any]) -> Any:
+    module = load_service("audit-telemetry-service")
+    with Session(module.engine) as session:
+        session.execute(delete(module.AuditEvent))
+        session.execute(delete(module.AuditEventRollup))
+        session.commit()
+    return module
+
+
+def message(offset_ms: int, event_type: str) -> Tuple[str, Dict[str, Any]]:
+    envelope = EventEnvelope(
+        type=event_type,
+        payload={"case_id": str(uuid.uuid4()), "score": 0.5},
+        producer="case-service",
+    )
+    return f"{MINUTE + offset_ms}-0", {TYPE_FIELD: event_type, DATA_FIELD: encode_event(envelope)}
+
+
+def stored(audit: Any) -> Tuple[List[Tuple[str, str]], Dict[Tuple[datetime, str], int]]:
+    with Session(audit.engine) as session:
+        events = session.exec(select(audit.AuditEvent.message_id, audit.AuditEvent.event_type))
+        rollups = session.exec(select(audit.AuditEventRollup))
+        return sorted(events.all()), {
+            (rollup.bucket, rollup.event_type): rollup.event_count for rollup in rollups.all()
+        }
+
+
+def test_store_events_inserts_once_and_rolls_up_per_minute(audit: Any) -> None:
+    first = [
+        message(10_000, "score_updated"),
+        message(40_000, "score_updated"),
+        message(65_000, "score_pending"),
+        (f"{MINUTE + 70_000}-0", {}),
+        (f"{MINUTE + 75_000}-0", {DATA_FIELD: b"\xc1"}),
+    ]
+
+    assert audit.store_events("case-events", first) == 3
+
+    events, rollups = stored(audit)
+    assert events == [
+        (f"{MINUTE + 10_000}-0", "score_updated"),
+        (f"{MINUTE + 40_000}-0", "score_updated"),
+        (f"{MINUTE + 65_000}-0", "score_pending"),
+    ]
+    noon = datetime(2026, 3, 2, 12, 0)
+    one_past = datetime(2026, 3, 2, 12, 1)
+    assert rollups == {(noon, "score_updated"): 2, (one_past, "score_pending"): 1}
+
+    # A redelivered batch with one new entry adds only that entry, to rows and rollups.
+    assert audit.store_events("case-events", first[:3] + [message(90_000, "score_updated")]) == 1
+
+    events, rollups = stored(audit)
+    assert len(events) == 4
+    assert rollups == {
+        (noon, "score_updated"): 2,
+        (one_past, "score_pending"): 1,
+        (one_past, "score_updated"): 1,
+    }
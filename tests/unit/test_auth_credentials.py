@@ -0,0 +1,64 @@
+import asyncio
+from typing import Any, Callable, List
+
+import pytest
+
+COST = 4
+
+
+@pytest.fixture
+def credentials(load_service: Callable[..., Any]) -> Any:
+    return load_service("auth-service", "credentials")
+
+
+def test_hash_round_trip(credentials: Any) -> None:
+    password_hash = credentials.hash_password("correct horse", cost=COST)
+
+    assert password_hash.startswith(f"scrypt${COST}$8$1$")
+    assert credentials.verify_password("correct horse", password_hash)
+    assert password_hash != credentials.hash_password("correct horse", cost=COST)
+
+
+def test_wrong_password_is_rejected(credentials: Any) -> None:
+    password_hash = credentials.hash_password("correct horse", cost=COST)
+
+    assert not credentials.verify_password("battery staple", password_hash)
+
+
+@pytest.mark.parametrize(
+    "password_hash",
+    [
+        "",
+        "plain",
+        "bcrypt$4$8$1$c2FsdA$ZGlnZXN0",
+        "scrypt$x$8$1$c2FsdA$ZGlnZXN0",
+        "scrypt$4$8$1$a$b",
+    ],
+)
+def test_malformed_hash_is_rejected(credentials: Any, password_hash: str) -> None:
+    assert not credentials.verify_password("anything", password_hash)
+
+
+def test_unknown_user_pays_for_a_dummy_hash(
+    credentials: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    dummy = credentials.hash_password("unused", cost=COST)
+    calls: List[str] = []
+
+    def dummy_hash() -> str:
+        calls.append("dummy")
+        return dummy
+
+    monkeypatch.setattr(credentials, "_dummy_hash", dummy_hash)
+    store = credentials.StaticCredentialStore(
+        {"a@example.com": credentials.Credential("a@example.com", dummy, "analyst")}
+    )
+
+    assert asyncio.run(credentials.authenticate(store, "nobody@example.com", "unused")) is None
+    assert calls == ["dummy"]
+    assert asyncio.run(credentials.authenticate(store, "a@example.com", "unused")) is not None
+
+
+def test_credential_store_must_implement_get(credentials: Any) -> None:
+    with pytest.raises(TypeError):
+        credentials.CredentialStore()
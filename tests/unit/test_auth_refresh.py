@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any, Callable
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+CLAIMS = {"sub": "analyst@example.com", "role": "analyst"}
+
+
+@pytest.fixture
+def refresh(load_service: Callable[..., Any]) -> Any:
+    return load_service("auth-service", "refresh")
+
+
+def test_rotate_returns_a_new_token(refresh: Any) -> None:
+    async def scenario() -> None:
+        tokens = refresh.RefreshTokens(fakeredis.FakeAsyncRedis(decode_responses=True))
+        token, _ = await tokens.issue(CLAIMS)
+
+        claims, successor, ttl = await tokens.rotate(token)
+
+        assert claims == CLAIMS
+        assert successor != token
+        assert ttl == tokens.ttl_seconds
+        assert (await tokens.rotate(successor))[0] == CLAIMS
+
+    asyncio.run(scenario())
+
+
+def test_reused_token_revokes_the_family(refresh: Any) -> None:
+    async def scenario() -> None:
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        tokens = refresh.RefreshTokens(client)
+        token, _ = await tokens.issue(CLAIMS)
+        _, successor, _ = await tokens.rotate(token)
+
+        with pytest.raises(refresh.RefreshTokenReused):
+            await tokens.rotate(token)
+
+        assert await client.keys(refresh.FAMILY_KEY.format("*")) == []
+        with pytest.raises(refresh.InvalidRefreshToken):
+            await tokens.rotate(successor)
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_rotations_of_one_token(refresh: Any) -> None:
+    async def scenario() -> None:
+        tokens = refresh.RefreshTokens(fakeredis.FakeAsyncRedis(decode_responses=True))
+        token, _ = await tokens.issue(CLAIMS)
+
+        results = await asyncio.gather(
+            tokens.rotate(token), tokens.rotate(token), return_exceptions=True
+        )
+
+        (winner,) = [result for result in results if isinstance(result, tuple)]
+        (loser,) = [result for result in results if isinstance(result, Exception)]
+        assert isinstance(loser, refresh.RefreshTokenReused)
+        # The loser revoked the family, so the winner's successor is dead too.
+        with pytest.raises(refresh.InvalidRefreshToken):
+            await tokens.rotate(winner[1])
+
+    asyncio.run(scenario())
+
+
+def test_family_lifetime_caps_the_successor(refresh: Any) -> None:
+    async def scenario() -> None:
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        tokens = refresh.RefreshTokens(client, ttl_seconds=100, family_max_seconds=1000)
+        token, ttl = await tokens.issue(CLAIMS)
+        assert ttl == 100
+        [family_key] = await client.keys(refresh.FAMILY_KEY.format("*"))
+        await client.expire(family_key, 30)
+
+        _, successor, ttl = await tokens.rotate(token)
+
+        assert ttl == 30
+        assert 0 < await client.ttl(refresh.TOKEN_KEY.format(refresh._digest(successor))) <= 30
+
+    asyncio.run(scenario())
@@ -1,16 +1,21 @@
-import os
+import asyncio
 from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
 
+import httpx
 import pytest
+from fastapi import HTTPException
 
-from libs.platform_lib.auth import decode_jwt_token
+from libs.platform_lib import auth
+from libs.platform_lib.auth import KeySet, decode_jwt_token
 
 jose = pytest.importorskip("jose")
 jwt = jose.jwt
 
 
-def test_decode_jwt_token() -> None:
-    os.environ["JWT_SECRET"] = "test-secret"
+def test_decode_jwt_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(auth, "JWT_SECRET", "test-secret")
+    monkeypatch.setattr(auth, "JWT_ACCEPT_SHARED_SECRET", True)
     token = jwt.encode(
         {"sub": "user", "role": "admin", "exp": datetime.utcnow() + timedelta(minutes=5)},
         "test-secret",
@@ -19,3 +24,86 @@ def test_decode_jwt_token() -> None:
     payload = decode_jwt_token(token)
     assert payload["sub"] == "user"
     assert payload["role"] == "admin"
+
+
+def test_shared_secret_tokens_are_rejected_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(auth, "JWT_ACCEPT_SHARED_SECRET", False)
+    token = jwt.encode({"sub": "user"}, auth.JWT_SECRET, algorithm="HS256")
+
+    with pytest.raises(HTTPException):
+        decode_jwt_token(token)
+
+
+def es256_key(kid: str) -> Tuple[Any, Dict[str, Any]]:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    pem = ec.generate_private_key(ec.SECP256R1()).private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    private = jose.jwk.construct(pem, "ES256")
+    return private, {**private.public_key().to_dict(), "kid": kid, "alg": "ES256"}
+
+
+@pytest.fixture
+def keys(monkeypatch: pytest.MonkeyPatch) -> KeySet:
+    key_set = KeySet(url="http://auth-service:8000/v1/auth/.well-known/jwks.json")
+    monkeypatch.setattr(auth, "key_set", key_set)
+    return key_set
+
+
+def test_decode_selects_key_by_kid(keys: KeySet) -> None:
+    old, old_public = es256_key("2026-01")
+    new, new_public = es256_key("2026-02")
+    keys.load({"keys": [old_public, new_public]})
+
+    for kid, private in (("2026-01", old), ("2026-02", new)):
+        token = jwt.encode({"sub": kid, "role": "admin"}, private, "ES256", headers={"kid": kid})
+        assert decode_jwt_token(token)["sub"] == kid
+
+    forged = jwt.encode({"sub": "x"}, old, "ES256", headers={"kid": "2026-02"})
+    with pytest.raises(HTTPException):
+        decode_jwt_token(forged)
+
+
+def test_unknown_kid_is_rejected_and_refreshes_key_set(keys: KeySet) -> None:
+    private, public = es256_key("next")
+    published: List[Dict[str, Any]] = []
+    fetches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        fetches.append(request.url.path)
+        return httpx.Response(200, json={"keys": published})
+
+    async def scenario() -> None:
+        keys._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        keys.min_refresh_seconds = 0
+        await keys.open()
+        refresher = asyncio.create_task(keys.refresh_forever())
+        # Rotated in after this process fetched the key set.
+        published.append(public)
+        token = jwt.encode({"sub": "u"}, private, "ES256", headers={"kid": "next"})
+        with pytest.raises(HTTPException):
+            decode_jwt_token(token)
+        for _ in range(100):
+            if keys.get("next"):
+                break
+            await asyncio.sleep(0.01)
+        refresher.cancel()
+        await keys.close()
+        assert decode_jwt_token(token)["sub"] == "u"
+
+    asyncio.run(scenario())
+    assert fetches == ["/v1/auth/.well-known/jwks.json"] * 2
+
+
+def test_symmetric_jwks_entries_are_ignored(keys: KeySet, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(auth, "JWT_SECRET", "test-secret")
+    keys.load({"keys": [{"kty": "oct", "k": "dGVzdC1zZWNyZXQ", "kid": "k", "alg": "HS256"}]})
+    token = jwt.encode({"sub": "u"}, "test-secret", algorithm="HS256", headers={"kid": "k"})
+
+    assert keys.get("k") is None
+    with pytest.raises(HTTPException):
+        decode_jwt_token(token)
@@ -0,0 +1,86 @@
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+
+import httpx
+import pytest
+from sqlalchemy import delete
+from sqlmodel import Session
+
+
+@pytest.fixture
+def backfill(load_service: Callable[..., Any]) -> Any:
+    return load_service("case-service", "backfill")
+
+
+@pytest.fixture
+def case_ids(backfill: Any) -> List[uuid.UUID]:
+    ids = sorted(uuid.uuid4() for _ in range(5))
+    with Session(backfill.engine) as session:
+        session.execute(delete(backfill.Case))
+        for case_id in ids:
+            session.add(backfill.Case(id=case_id, title="t", owner_id=uuid.uuid4()))
+        session.commit()
+    return ids
+
+
+def scoring_transport(calls: List[List[str]]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids = json.loads(request.content)["case_ids"]
+        calls.append(ids)
+        scores = [{"case_id": case_id, "score": 0.5} for case_id in ids]
+        return httpx.Response(200, json={"model_version": "m2", "scores": scores})
+
+    return httpx.MockTransport(handler)
+
+
+def test_checkpoint_round_trip(backfill: Any, tmp_path: Path) -> None:
+    path = tmp_path / "checkpoint.json"
+    assert backfill.load_checkpoint(path) == (None, 0)
+    assert backfill.load_checkpoint(None) == (None, 0)
+    case_id = uuid.uuid4()
+    backfill.save_checkpoint(path, case_id, 42)
+    assert backfill.load_checkpoint(path) == (case_id, 42)
+    assert not path.with_suffix(".json.tmp").exists()
+    backfill.save_checkpoint(None, case_id, 1)
+
+
+def test_run_resumes_after_checkpoint(
+    backfill: Any, case_ids: List[uuid.UUID], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    updated: List[Tuple[uuid.UUID, float]] = []
+    monkeypatch.setattr(backfill, "bulk_update_scores", updated.extend)
+    checkpoint = tmp_path / "checkpoint.json"
+    backfill.save_checkpoint(checkpoint, case_ids[1], 2)
+    calls: List[List[str]] = []
+
+    processed = backfill.run(2, checkpoint, False, None, 5.0, scoring_transport(calls))
+
+    assert processed == 5
+    assert calls == [[str(case_ids[2]), str(case_ids[3])], [str(case_ids[4])]]
+    assert [case_id for case_id, _ in updated] == case_ids[2:]
+    assert backfill.load_checkpoint(checkpoint) == (case_ids[4], 5)
+
+
+def test_dry_run_writes_jsonl_without_checkpoint(
+    backfill: Any, case_ids: List[uuid.UUID], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(backfill, "bulk_update_scores", pytest.fail)
+    output, checkpoint = tmp_path / "scores.jsonl", tmp_path / "checkpoint.json"
+
+    backfill.run(3, checkpoint, True, output, 5.0, scoring_transport([]))
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [line["case_id"] for line in lines] == [str(case_id) for case_id in case_ids]
+    assert {line["model_version"] for line in lines} == {"m2"}
+    assert not checkpoint.exists()
+    with pytest.raises(SystemExit):
+        backfill.main(["--dry-run", "--output", str(output), "--checkpoint", str(checkpoint)])
+
+
+def test_batch_scoring_is_bounded(load_service: Callable[..., Any]) -> None:
+    scoring = load_service("scoring-service")
+    scoring.BatchScoreRequest(case_ids=[uuid.uuid4()] * 10000)
+    with pytest.raises(ValueError):
+        scoring.BatchScoreRequest(case_ids=[uuid.uuid4()] * 10001)
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from libs.platform_lib.broadcast import (
+    EventBroadcaster,
+    TooManySubscribers,
+    sse_message,
+    sse_stream,
+)
+from libs.platform_lib.events import EventEnvelope, EventProducer
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def envelope(case_id: str, owner_id: str, event_type: str = "score_updated") -> EventEnvelope:
+    return EventEnvelope(
+        type=event_type,
+        payload={"case_id": case_id, "owner_id": owner_id, "score": 0.5},
+        producer="test",
+    )
+
+
+def test_publish_routes_by_case_and_owner() -> None:
+    async def scenario() -> None:
+        broadcaster = EventBroadcaster(None, ["score_updated"], streams=["case-events"])
+        case_a, case_b, owner = str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4())
+        by_case = broadcaster.subscribe(case_id=case_a)
+        by_owner = broadcaster.subscribe(owner_id=owner)
+        by_both = broadcaster.subscribe(case_id=case_a, owner_id=str(uuid.uuid4()))
+        everything = broadcaster.subscribe()
+
+        broadcaster.publish(envelope(case_a, owner))
+        broadcaster.publish(envelope(case_b, str(uuid.uuid4())))
+
+        assert by_case.queue.qsize() == 1
+        assert by_owner.queue.qsize() == 1
+        assert by_both.queue.qsize() == 0
+        assert everything.queue.qsize() == 2
+
+        broadcaster.unsubscribe(by_case)
+        broadcaster.unsubscribe(by_case)
+        assert case_a in broadcaster._by_case
+        broadcaster.unsubscribe(by_both)
+        assert case_a not in broadcaster._by_case
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_is_dropped_without_blocking_others() -> None:
+    async def scenario() -> None:
+        broadcaster = EventBroadcaster(None, ["score_updated"], streams=["s"], queue_size=2)
+        slow, fast = broadcaster.subscribe(), broadcaster.subscribe()
+        case_id, owner = str(uuid.uuid4()), str(uuid.uuid4())
+        for _ in range(3):
+            broadcaster.publish(envelope(case_id, owner))
+            await fast.queue.get()
+        assert slow.overflowed and not fast.overflowed
+        assert [message async for message in sse_stream(broadcaster, slow)] == [
+            b"retry: 3000\n\n",
+            b"event: overflow\ndata: {}\n\n",
+        ]
+        assert broadcaster._all == {fast}
+
+    asyncio.run(scenario())
+
+
+def test_subscriber_limit() -> None:
+    broadcaster = EventBroadcaster(None, ["score_updated"], streams=["s"], max_subscribers=1)
+    broadcaster.subscribe()
+    with pytest.raises(TooManySubscribers):
+        broadcaster.subscribe()
+
+
+def test_sse_message_format() -> None:
+    message = sse_message(envelope("c1", "o1")).decode("utf-8")
+    event, data, blank, end = message.split("\n")
+    assert event == "event: score_updated"
+    assert json.loads(data[len("data: ") :])["case_id"] == "c1"
+    assert (blank, end) == ("", "")
+
+
+def test_one_reader_fans_out_new_stream_entries() -> None:
+    async def scenario() -> None:
+        server = fakeredis.FakeServer()
+        producer = EventProducer(fakeredis.FakeRedis(server=server), "case-service")
+        client = fakeredis.FakeAsyncRedis(server=server)
+        producer.publish("score_updated", {"case_id": "before", "score": 0.1})
+        broadcaster = EventBroadcaster(client, ["score_updated"], streams=["case-events"])
+        subscribers = [broadcaster.subscribe(case_id="c1") for _ in range(3)]
+        reader = asyncio.create_task(broadcaster.run())
+        try:
+            await asyncio.sleep(0.05)
+            producer.publish("case_created", {"case_id": "c1"})
+            producer.publish("score_updated", {"case_id": "c1", "score": 0.9})
+            received = [await asyncio.wait_for(s.queue.get(), 2) for s in subscribers]
+        finally:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+        assert all(event is not None and event.payload["score"] == 0.9 for event in received)
+        assert all(s.queue.get_nowait() is None for s in subscribers)
+
+    asyncio.run(scenario())
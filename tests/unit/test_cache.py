@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from libs.platform_lib.cache import CachedLoader, SingleFlight, TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries() -> None:
+    clock = FakeClock()
+    cache: TTLCache[str] = TTLCache(ttl_seconds=10, clock=clock)
+    cache.set("a", "value")
+    assert cache.get("a") == "value"
+    clock.now = 10.5
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_bounds_size() -> None:
+    cache: TTLCache[int] = TTLCache(ttl_seconds=60, max_entries=2)
+    for i in range(3):
+        cache.set(i, i)
+    assert cache.get(0) is None
+    assert cache.get(1) == 1
+    assert cache.get(2) == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_merges_concurrent_calls() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    async def compute() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(flight.do("case", compute) for _ in range(5)))
+    assert results == [42] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_a_cancelled_leader() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    async def compute() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    leader = asyncio.create_task(flight.do("case", compute))
+    await asyncio.sleep(0)
+    followers = [asyncio.create_task(flight.do("case", compute)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await asyncio.gather(*followers) == [2, 2, 2]
+    assert leader.cancelled()
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_follower_can_still_be_cancelled() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+
+    async def compute() -> int:
+        await asyncio.sleep(0.05)
+        return 1
+
+    leader = asyncio.create_task(flight.do("case", compute))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("case", compute))
+    await asyncio.sleep(0.01)
+    follower.cancel()
+
+    assert await leader == 1
+    assert follower.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_cached_loader_does_not_cache_failures() -> None:
+    loader: CachedLoader[int] = CachedLoader(TTLCache(ttl_seconds=60))
+    attempts = 0
+
+    async def flaky() -> int:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("unavailable")
+        return 7
+
+    with pytest.raises(RuntimeError):
+        await loader.get_or_load("case", flaky)
+    assert await loader.get_or_load("case", flaky) == 7
+    assert await loader.get_or_load("case", flaky) == 7
+    assert attempts == 2
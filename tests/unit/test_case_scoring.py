@@ -0,0 +1,44 @@
+import uuid
+from typing import Any, Callable, Dict, List
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from tenacity import wait_none
+
+from libs.platform_lib.timing import ServerTimingMiddleware
+
+
+def test_scoring_timings_are_merged_once_across_retries(
+    load_service: Callable[..., Any], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cases = load_service("case-service")
+    attempts: List[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(1)
+        headers = {"server-timing": "total;dur=2.00"}
+        if len(attempts) == 1:
+            return httpx.Response(503, headers=headers, request=request)
+        case_id = request.url.path.rsplit("/", 1)[1]
+        return httpx.Response(
+            200, json={"case_id": case_id, "score": 0.4}, headers=headers, request=request
+        )
+
+    monkeypatch.setattr(
+        cases.scoring_pool, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    monkeypatch.setattr(cases, "request_score", cases.request_score.retry_with(wait=wait_none()))
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, enabled=True)
+
+    @app.get("/")
+    async def score() -> Dict[str, float]:
+        return {"score": (await cases.call_scoring(uuid.uuid4())).score}
+
+    response = TestClient(app).get("/")
+
+    assert response.json() == {"score": 0.4}
+    assert len(attempts) == 2
+    assert response.headers["server-timing"].count("scoring-service.total") == 1
@@ -0,0 +1,45 @@
+import uuid
+from typing import Any, Callable, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlmodel import Session
+
+
+@pytest.fixture
+def cases(load_service: Callable[..., Any], monkeypatch: pytest.MonkeyPatch) -> Any:
+    module = load_service("case-service")
+    emitted: List[str] = []
+
+    async def emit_event(event_type: str, payload: dict) -> None:
+        emitted.append(event_type)
+
+    async def call_scoring(case_id: uuid.UUID) -> Any:
+        return module.ScoreResponse(case_id=case_id, score=0.7)
+
+    monkeypatch.setattr(module, "emit_event", emit_event)
+    monkeypatch.setattr(module, "call_scoring", call_scoring)
+    return module
+
+
+def test_scoring_bumps_the_version_despite_a_concurrent_backfill(
+    cases: Any, bearer: Callable[..., Dict[str, str]]
+) -> None:
+    def backfill_bump(mapper: Any, connection: Any, target: Any) -> None:
+        # Lands after the handler loaded the case, as a concurrent backfill UPDATE would.
+        connection.execute(
+            text('UPDATE "case" SET version = version + 1 WHERE id = :id'),
+            {"id": target.id.hex},
+        )
+
+    event.listen(cases.Case, "before_update", backfill_bump, once=True)
+    payload = {"title": "t", "owner_id": str(uuid.uuid4())}
+
+    response = TestClient(cases.app).post("/v1/cases", json=payload, headers=bearer("analyst"))
+
+    assert response.status_code == 200
+    with Session(cases.engine) as session:
+        stored = session.get(cases.Case, uuid.UUID(response.json()["id"]))
+        assert stored is not None
+        assert (stored.status, stored.score, stored.version) == ("SCORED", 0.7, 3)
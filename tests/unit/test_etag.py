@@ -0,0 +1,63 @@
+import uuid
+from datetime import datetime
+from typing import Any
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from libs.platform_lib.etag import (
+    collection_etag,
+    conditional_response,
+    entity_etag,
+    etag_matches,
+)
+
+
+def test_entity_etag_changes_with_version_and_resource() -> None:
+    entity_id = uuid.uuid4()
+    etag = entity_etag("case.v1", entity_id, 1)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == entity_etag("case.v1", entity_id, 1)
+    assert etag != entity_etag("case.v1", entity_id, 2)
+    assert etag != entity_etag("case.v2", entity_id, 1)
+
+
+def test_collection_etag_tracks_membership_and_order() -> None:
+    now = datetime(2026, 10, 19)
+    a, b = (uuid.uuid4(), now), (uuid.uuid4(), now)
+    etag = collection_etag("user", [a, b])
+    assert etag == collection_etag("user", iter([a, b]))
+    assert etag != collection_etag("user", [b, a])
+    assert etag != collection_etag("user", [a])
+    assert etag != collection_etag("user", [a, b], variant="limit=2")
+
+
+def test_etag_matches_uses_weak_comparison() -> None:
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"x", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+
+
+def test_conditional_response_short_circuits() -> None:
+    app = FastAPI()
+    built = []
+
+    @app.get("/thing")
+    def thing(request: Request, response: Response) -> Any:
+        not_modified = conditional_response(request, response, '"v1"')
+        if not_modified:
+            return not_modified
+        built.append(True)
+        return {"ok": True}
+
+    client = TestClient(app)
+    first = client.get("/thing")
+    assert first.status_code == 200
+    assert first.headers["etag"] == '"v1"'
+    second = client.get("/thing", headers={"If-None-Match": '"v1"'})
+    assert second.status_code == 304
+    assert second.headers["etag"] == '"v1"'
+    assert second.content == b""
+    assert len(built) == 1
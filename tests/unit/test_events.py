@@ -0,0 +1,68 @@
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+
+from libs.platform_lib.events import (
+    EventDecodeError,
+    EventEnvelope,
+    EventProducer,
+    decode_event,
+    encode_event,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def test_envelope_round_trip() -> None:
+    envelope = EventEnvelope(
+        type="score_updated",
+        payload={"case_id": str(uuid.uuid4()), "score": 0.42},
+        producer="scoring-service",
+        trace_id="0" * 32,
+    )
+    decoded = decode_event({b"event_type": b"score_updated", b"data": encode_event(envelope)})
+    assert decoded == envelope
+
+
+def test_encode_normalises_uuid_and_datetime() -> None:
+    case_id = uuid.uuid4()
+    now = datetime.utcnow()
+    envelope = EventEnvelope(
+        type="case_created", payload={"case_id": case_id, "at": now}, producer="test"
+    )
+    decoded = decode_event({"data": encode_event(envelope)})
+    assert decoded.payload == {"case_id": str(case_id), "at": now.isoformat()}
+
+
+def test_decodes_legacy_json_entries() -> None:
+    decoded = decode_event(
+        {
+            "event_type": "case_created",
+            "payload": json.dumps({"case_id": "abc"}),
+            "created_at": "2025-02-14T10:00:00",
+        }
+    )
+    assert decoded.type == "case_created"
+    assert decoded.payload == {"case_id": "abc"}
+    assert decoded.schema_version == 0
+
+
+def test_rejects_unknown_envelope_version() -> None:
+    import msgpack
+
+    with pytest.raises(EventDecodeError):
+        decode_event({b"data": msgpack.packb([99, "x"])})
+
+
+def test_producer_pipelines_batches() -> None:
+    client = fakeredis.FakeRedis()
+    producer = EventProducer(client, "case-service", stream_for=lambda key: "case-events")
+    case_ids = [str(uuid.uuid4()) for _ in range(3)]
+    producer.publish_many(("case_created", {"case_id": case_id}) for case_id in case_ids)
+    entries = client.xrange("case-events")
+    decoded = [decode_event(fields) for _, fields in entries]
+    assert [event.payload["case_id"] for event in decoded] == case_ids
+    assert all(event.producer == "case-service" for event in decoded)
+    assert all(event.schema_version == 1 for event in decoded)
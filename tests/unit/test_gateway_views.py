@@ -0,0 +1,113 @@
+import asyncio
+import uuid
+from typing import Any, Callable, Dict
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+CASE_ID = str(uuid.uuid4())
+OWNER_ID = str(uuid.uuid4())
+
+
+@pytest.fixture
+def gateway(load_service: Callable[..., Any], monkeypatch: pytest.MonkeyPatch) -> Any:
+    module = load_service("gateway")
+    # The views module is only reachable through the functions main imported from it.
+    views = module.case_view.__globals__
+    monkeypatch.setitem(views, "VIEW_CASE_TIMEOUT_SECONDS", 0.2)
+    monkeypatch.setitem(views, "VIEW_AUDIT_TIMEOUT_SECONDS", 0.2)
+    return module
+
+
+def upstreams(gateway: Any, monkeypatch: pytest.MonkeyPatch, **overrides: Any) -> None:
+    """Serves case, owner and audit from a MockTransport; overrides replace a branch's reply."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        branch = "case" if "/cases/" in path else "owner" if "/users/" in path else "audit"
+        reply = overrides.get(branch)
+        if callable(reply):
+            return await reply(request)
+        if reply is not None:
+            return reply
+        if branch == "case":
+            return httpx.Response(200, json={"id": CASE_ID, "owner_id": OWNER_ID})
+        if branch == "owner":
+            return httpx.Response(200, json={"id": OWNER_ID, "email": "owner@example.com"})
+        return httpx.Response(200, json={"items": [], "next_cursor": None})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(gateway.upstream_pool, "_client", client)
+
+
+async def hang(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(5)
+    return httpx.Response(200, json={})
+
+
+def get_view(gateway: Any, headers: Dict[str, str]) -> httpx.Response:
+    return TestClient(gateway.app).get(f"/v1/views/cases/{CASE_ID}", headers=headers)
+
+
+def test_view_composes_all_sections(
+    gateway: Any, monkeypatch: pytest.MonkeyPatch, bearer: Callable[..., Dict[str, str]]
+) -> None:
+    upstreams(gateway, monkeypatch)
+
+    response = get_view(gateway, bearer())
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "case": {"id": CASE_ID, "owner_id": OWNER_ID},
+        "owner": {"id": OWNER_ID, "email": "owner@example.com"},
+        "audit": {"items": [], "next_cursor": None},
+        "partial": False,
+        "errors": {},
+    }
+
+
+def test_slow_audit_gives_a_partial_view(
+    gateway: Any, monkeypatch: pytest.MonkeyPatch, bearer: Callable[..., Dict[str, str]]
+) -> None:
+    upstreams(gateway, monkeypatch, audit=hang)
+
+    body = get_view(gateway, bearer()).json()
+
+    assert body["audit"] is None
+    assert body["owner"]["id"] == OWNER_ID
+    assert body["partial"] is True
+    assert body["errors"] == {"audit": "timeout"}
+
+
+def test_case_not_found_passes_through(
+    gateway: Any, monkeypatch: pytest.MonkeyPatch, bearer: Callable[..., Dict[str, str]]
+) -> None:
+    upstreams(gateway, monkeypatch, case=httpx.Response(404, json={"detail": "Case not found"}))
+
+    response = get_view(gateway, bearer())
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Case not found"}
+
+
+def test_case_timeout_is_a_gateway_timeout(
+    gateway: Any, monkeypatch: pytest.MonkeyPatch, bearer: Callable[..., Dict[str, str]]
+) -> None:
+    upstreams(gateway, monkeypatch, case=hang)
+
+    response = get_view(gateway, bearer())
+
+    assert response.status_code == 504
+    assert response.json() == {"detail": "case-service timeout"}
+
+
+def test_case_that_is_not_json_is_a_bad_gateway(
+    gateway: Any, monkeypatch: pytest.MonkeyPatch, bearer: Callable[..., Dict[str, str]]
+) -> None:
+    upstreams(gateway, monkeypatch, case=httpx.Response(200, text="<html>maintenance</html>"))
+
+    response = get_view(gateway, bearer())
+
+    assert response.status_code == 502
+    assert response.json() == {"detail": "case-service invalid response"}
@@ -0,0 +1,155 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from libs.platform_lib import lifespan as lifespan_module
+from libs.platform_lib.lifespan import (
+    Dependency,
+    MigrationsPending,
+    ServiceLifespan,
+    check_migrations,
+)
+
+
+class FlakyDependency(Dependency):
+    def __init__(self, name: str, failures: int, events: List[str]) -> None:
+        self.name = name
+        self.failures = failures
+        self.events = events
+
+    async def open(self) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("not yet")
+        self.events.append(f"open {self.name}")
+
+    async def close(self) -> None:
+        self.events.append(f"close {self.name}")
+
+
+@pytest.fixture(autouse=True)
+def quiet_lifespan(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Process-wide logging and tracing setup is covered by their own tests.
+    monkeypatch.setattr(lifespan_module, "configure_logging", lambda: None)
+    monkeypatch.setattr(lifespan_module, "configure_tracing", lambda name: None)
+    monkeypatch.setattr(lifespan_module, "STARTUP_RETRY_INITIAL_SECONDS", 0.05)
+    monkeypatch.setattr(lifespan_module, "SHUTDOWN_RECANCEL_SECONDS", 0.05)
+
+
+def wait_for_status(client: TestClient, status_code: int) -> dict:
+    deadline = time.monotonic() + 5
+    while True:
+        response = client.get("/health/ready")
+        if response.status_code == status_code or time.monotonic() > deadline:
+            assert response.status_code == status_code
+            return response.json()
+        time.sleep(0.02)
+
+
+def test_readiness_waits_for_dependencies_and_background_starts_after() -> None:
+    events: List[str] = []
+
+    async def consumer() -> None:
+        events.append("background")
+
+    lifespan = ServiceLifespan(
+        "svc",
+        [FlakyDependency("database", 2, events), FlakyDependency("redis", 0, events)],
+        background=[consumer],
+    )
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(lifespan.router)
+
+    with TestClient(app) as client:
+        assert client.get("/health/live").status_code == 200
+        body = wait_for_status(client, 200)
+        assert body == {"status": "ready", "dependencies": {"database": "ready", "redis": "ready"}}
+        assert events.index("background") > events.index("open database")
+        assert set(lifespan.durations) == {"database", "redis", "ready"}
+
+    assert not lifespan.is_ready
+    assert events[-2:] == ["close redis", "close database"]
+
+
+def test_failing_dependency_keeps_service_live_but_unready() -> None:
+    lifespan = ServiceLifespan("svc", [FlakyDependency("database", 1000, [])])
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(lifespan.router)
+
+    with TestClient(app) as client:
+        assert client.get("/health/live").status_code == 200
+        time.sleep(0.1)
+        body = wait_for_status(client, 503)
+        assert body["dependencies"] == {"database": "failed: ConnectionError"}
+
+
+def test_failed_background_task_turns_service_unready() -> None:
+    async def consumer() -> None:
+        raise RuntimeError("stream gone")
+
+    lifespan = ServiceLifespan("svc", [FlakyDependency("database", 0, [])], background=[consumer])
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(lifespan.router)
+
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 5
+        while "consumer" not in lifespan.states and time.monotonic() < deadline:
+            time.sleep(0.02)
+        body = wait_for_status(client, 503)
+        assert body["dependencies"] == {"database": "ready", "consumer": "failed: RuntimeError"}
+    assert not lifespan.is_ready
+
+
+def test_shutdown_cancels_again_when_a_cancel_is_lost() -> None:
+    cancels: List[str] = []
+
+    async def consumer() -> None:
+        while True:
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancels.append("cancel")
+                if len(cancels) > 1:
+                    raise
+                # As if the cancel had landed while a read completed: the loop carries on.
+                asyncio.current_task().uncancel()  # type: ignore[union-attr]
+
+    lifespan = ServiceLifespan("svc", background=[consumer])
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(lifespan.router)
+
+    with TestClient(app) as client:
+        wait_for_status(client, 200)
+
+    assert cancels == ["cancel", "cancel"]
+
+
+def test_dependency_must_implement_open() -> None:
+    class Incomplete(Dependency):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()  # type: ignore[abstract]
+
+
+def test_check_migrations_compares_database_with_heads(tmp_path: Path) -> None:
+    pytest.importorskip("alembic")
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    from alembic.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    (tmp_path / "versions").mkdir()
+    (tmp_path / "versions" / "0001_init.py").write_text(
+        'revision = "0001"\ndown_revision = None\nbranch_labels = None\ndepends_on = None\n'
+    )
+    engine = sqlalchemy.create_engine("sqlite://")
+    with engine.begin() as connection:
+        with pytest.raises(MigrationsPending, match="revision none, expected 0001"):
+            check_migrations(connection, tmp_path)
+        MigrationContext.configure(connection).stamp(ScriptDirectory(str(tmp_path)), "heads")
+        check_migrations(connection, tmp_path)
@@ -0,0 +1,106 @@
+import json
+import logging
+import queue
+import sys
+import time
+from typing import Iterator
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from libs.platform_lib.http_logging import HttpLoggingMiddleware
+from libs.platform_lib.logging import (
+    DroppingQueueHandler,
+    JsonFormatter,
+    configure_logging,
+    stop_logging,
+)
+
+
+def make_record(msg: str = "hello %s", args: tuple = ("world",)) -> logging.LogRecord:
+    record = logging.LogRecord("svc", logging.INFO, __file__, 1, msg, args, None)
+    record.created = 1792411200.25
+    return record
+
+
+def test_json_formatter_renders_static_and_extra_fields() -> None:
+    record = make_record()
+    record.request_id = "req-1"
+    record.status_code = 200
+    line = json.loads(JsonFormatter(service_name="case-service").format(record))
+    assert line["message"] == "hello world"
+    assert line["service_name"] == "case-service"
+    assert line["request_id"] == "req-1"
+    assert line["status_code"] == 200
+    assert line["timestamp"] == "2026-10-19T12:00:00.250000"
+
+
+def test_queue_handler_resolves_message_and_drops_when_full() -> None:
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(1)
+    handler = DroppingQueueHandler(log_queue)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        failing = logging.LogRecord(
+            "svc", logging.ERROR, __file__, 1, "failed %d", (1,), sys.exc_info()
+        )
+    handler.handle(failing)
+    handler.handle(make_record())
+    queued = log_queue.get_nowait()
+    assert queued.msg == "failed 1" and queued.args is None
+    assert queued.exc_info is None
+    assert queued.exc_text and "ValueError: boom" in queued.exc_text
+    assert handler.dropped == 1
+
+
+@pytest.fixture
+def restore_root() -> Iterator[None]:
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    stop_logging()
+    root.handlers, root.level = handlers, level
+
+
+def test_configure_logging_writes_on_listener_thread(
+    restore_root: None, capsys: pytest.CaptureFixture[str]
+) -> None:
+    configure_logging()
+    logging.getLogger("svc").info("queued %s", "line", extra={"request_id": "r"})
+    stop_logging()
+    line = json.loads(capsys.readouterr().err.strip().splitlines()[-1])
+    assert line["message"] == "queued line"
+    assert line["request_id"] == "r"
+
+
+def test_http_logging_sampling_keeps_errors_and_slow_requests(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    app = FastAPI()
+    app.add_middleware(HttpLoggingMiddleware, sample_rate=0.0, slow_ms=50)
+
+    @app.get("/ok")
+    def ok() -> dict:
+        return {}
+
+    @app.get("/broken")
+    def broken() -> dict:
+        raise HTTPException(status_code=503)
+
+    @app.get("/slow")
+    def slow() -> dict:
+        time.sleep(0.06)
+        return {}
+
+    client = TestClient(app)
+    with caplog.at_level(logging.INFO, logger="http"):
+        client.get("/ok")
+        assert caplog.records == []
+        client.get("/broken")
+        client.get("/slow")
+    lines = [(r.getMessage(), r.__dict__["path"], r.levelno) for r in caplog.records]
+    assert lines == [
+        ("request_completed", "/broken", logging.WARNING),
+        ("request_completed", "/slow", logging.INFO),
+    ]
@@ -0,0 +1,20 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from libs.platform_lib.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    created_at = datetime(2026, 10, 19, 12, 30, 0, 123456)
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm8tc2VwYXJhdG9y", "MjAyNnxub3QtYS11dWlk"])
+def test_invalid_cursor_is_bad_request(cursor: str) -> None:
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any, Tuple
+
+import pytest
+from prometheus_client import REGISTRY
+
+from libs.platform_lib.events import EventProducer, decode_event
+from libs.platform_lib.redis_client import AutoPipeline, create_redis
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_concurrent_commands_share_one_pipeline() -> None:
+    async def scenario() -> None:
+        client = AutoPipeline(fakeredis.FakeAsyncRedis(), "test-batch").install()
+        results = await asyncio.gather(*(client.incr("counter") for _ in range(50)))
+        assert sorted(results) == list(range(1, 51))
+        assert sample("redis_autopipeline_commands_count", {"client": "test-batch"}) == 1
+        assert sample("redis_autopipeline_commands_sum", {"client": "test-batch"}) == 50
+        labels = {"client": "test-batch", "command": "INCRBY"}
+        assert sample("redis_command_duration_seconds_count", labels) == 50
+
+    asyncio.run(scenario())
+
+
+def test_errors_stay_with_their_command() -> None:
+    async def scenario() -> None:
+        client = AutoPipeline(fakeredis.FakeAsyncRedis(decode_responses=True), "test-err").install()
+        await client.lpush("list", "a")
+        results: Tuple[Any, Any] = await asyncio.gather(
+            client.llen("list"), client.incr("list"), return_exceptions=True
+        )
+        ok, failed = results
+        assert ok == 1
+        assert isinstance(failed, Exception) and "WRONGTYPE" in str(failed)
+        labels = {"client": "test-err", "command": "INCRBY"}
+        assert sample("redis_command_errors_total", labels) == 1
+
+    asyncio.run(scenario())
+
+
+def test_batches_are_capped_and_blocking_reads_bypass_them() -> None:
+    async def scenario() -> None:
+        client = AutoPipeline(fakeredis.FakeAsyncRedis(), "test-cap", max_commands=10).install()
+        await asyncio.gather(*(client.set(f"k{i}", i) for i in range(25)))
+        assert sample("redis_autopipeline_commands_count", {"client": "test-cap"}) == 3
+        assert await client.xread({"empty": "0-0"}, block=1) == []
+        assert sample("redis_autopipeline_commands_sum", {"client": "test-cap"}) == 25
+        labels = {"client": "test-cap", "command": "XREAD"}
+        assert sample("redis_command_duration_seconds_count", labels) == 1
+
+    asyncio.run(scenario())
+
+
+def test_explicit_pipelines_and_async_producer() -> None:
+    async def scenario() -> None:
+        client = AutoPipeline(fakeredis.FakeAsyncRedis(), "test-pipe").install()
+        producer = EventProducer(client, "test", stream_for=lambda key: "events")
+        await producer.publish("case_created", {"case_id": "c1"})
+        await producer.publish_many([("case_created", {"case_id": "c2"})])
+        entries = await client.xrange("events")
+        assert [decode_event(fields).payload["case_id"] for _, fields in entries] == ["c1", "c2"]
+        labels = {"client": "test-pipe", "command": "PIPELINE"}
+        assert sample("redis_command_duration_seconds_count", labels) == 1
+
+    asyncio.run(scenario())
+
+
+def test_create_redis_uses_a_bounded_health_checked_pool() -> None:
+    client = create_redis("redis://localhost:6379/0", "test-pool", max_connections=7)
+    pool = client.connection_pool
+    assert type(pool).__name__ == "BlockingConnectionPool"
+    assert pool.max_connections == 7
+    assert pool.connection_kwargs["health_check_interval"] > 0
+    assert pool.connection_kwargs["socket_keepalive"] is True
+    assert sample("redis_pool_connections", {"client": "test-pool", "state": "max"}) == 7
+    assert sample("redis_pool_connections", {"client": "test-pool", "state": "in_use"}) == 0
@@ -0,0 +1,162 @@
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from libs.platform_lib.replicas import (
+    READ_YOUR_WRITES_COOKIE,
+    ReadYourWritesMiddleware,
+    ReplicaRouter,
+    postgres_lag,
+)
+
+
+def database(path: Path, name: str):
+    engine = create_engine(f"sqlite:///{path / name}.sqlite")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE source (name TEXT)"))
+        connection.execute(text("INSERT INTO source VALUES (:name)"), {"name": name})
+    return engine
+
+
+def bearer(subject: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {jwt.encode({'sub': subject}, 'secret')}"}
+
+
+@pytest.fixture
+def lags() -> Dict[str, Optional[float]]:
+    return {"replica": 0.0}
+
+
+@pytest.fixture
+def now() -> List[float]:
+    return [1_700_000_000.0]
+
+
+@pytest.fixture
+def router(tmp_path: Path, lags: Dict[str, Optional[float]], now: List[float]) -> ReplicaRouter:
+    def probe(primary, replica) -> Optional[float]:
+        lag = lags["replica"]
+        if lag is None:
+            raise ConnectionError("replica unreachable")
+        return lag
+
+    return ReplicaRouter(
+        database(tmp_path, "primary"),
+        [database(tmp_path, "replica")],
+        max_lag_seconds=5,
+        read_your_writes_seconds=0.5,
+        lag_probe=probe,
+        clock=lambda: now[0],
+    )
+
+
+@pytest.fixture
+def client(router: ReplicaRouter) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, router=router)
+
+    @app.get("/source")
+    def source() -> str:
+        with router.read_engine().connect() as connection:
+            return connection.execute(
+                text("SELECT name FROM source ORDER BY rowid LIMIT 1")
+            ).scalar_one()
+
+    @app.post("/write")
+    def write() -> None:
+        with router.primary.begin() as connection:
+            connection.execute(text("INSERT INTO source VALUES ('written')"))
+
+    @app.post("/lookup")
+    def lookup() -> str:
+        # Read-only POST: no commit, so no read-your-writes window.
+        return source()
+
+    return TestClient(app)
+
+
+def test_reads_wait_for_first_lag_check(router: ReplicaRouter, client: TestClient) -> None:
+    assert client.get("/source").json() == "primary"
+    asyncio.run(router.check())
+    assert client.get("/source", headers=bearer("a")).json() == "replica"
+
+
+def test_own_write_reads_primary_for_the_window(
+    router: ReplicaRouter, client: TestClient, now: List[float]
+) -> None:
+    asyncio.run(router.check())
+    response = client.post("/write", headers=bearer("a"))
+    assert READ_YOUR_WRITES_COOKIE in response.headers["set-cookie"]
+    client.cookies.clear()
+
+    assert client.get("/source", headers=bearer("a")).json() == "primary"
+    assert client.get("/source", headers=bearer("b")).json() == "replica"
+    assert client.post("/lookup", headers=bearer("b")).json() == "replica"
+    now[0] += 0.6
+    assert client.get("/source", headers=bearer("a")).json() == "replica"
+
+
+def test_cookie_carries_the_window_to_other_processes(
+    router: ReplicaRouter, client: TestClient, now: List[float]
+) -> None:
+    asyncio.run(router.check())
+    client.post("/write", headers=bearer("a"))
+    router._writes.clear()  # as if the next request reached another replica of the service
+    assert client.get("/source", headers=bearer("a")).json() == "primary"
+    now[0] += 1.6  # past the window, rounded up to whole seconds
+    assert client.get("/source", headers=bearer("a")).json() == "replica"
+
+    client.cookies.set(READ_YOUR_WRITES_COOKIE, str(int(now[0]) + 3600))
+    assert client.get("/source", headers=bearer("c")).json() == "replica"
+
+
+def test_lagging_or_unreachable_replicas_leave_rotation(
+    router: ReplicaRouter, client: TestClient, lags: Dict[str, Optional[float]]
+) -> None:
+    for lag, expected in ((0.5, "replica"), (12.0, "primary"), (None, "primary"), (1.0, "replica")):
+        lags["replica"] = lag
+        asyncio.run(router.check())
+        assert client.get("/source", headers=bearer("a")).json() == expected
+
+
+class FakeEngine:
+    """Answers postgres_lag's two queries with fixed rows."""
+
+    def __init__(self, host: str, scalar: Any = None, row: Any = None) -> None:
+        self.url = make_url(f"postgresql://{host}/app")
+        self.scalar_value = scalar
+        self.row = row
+
+    def connect(self) -> "FakeEngine":
+        return self
+
+    def __enter__(self) -> "FakeEngine":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def execute(self, statement: Any, parameters: Any = None) -> "FakeEngine":
+        return self
+
+    def scalar(self) -> Any:
+        return self.scalar_value
+
+    def one(self) -> Any:
+        return self.row
+
+
+def test_postgres_lag_measures_standbys_and_rejects_primaries() -> None:
+    primary = FakeEngine("primary", scalar="0/3000000")
+
+    assert postgres_lag(primary, FakeEngine("standby", row=(4096, 2.5))) == 2.5
+    assert postgres_lag(primary, FakeEngine("standby", row=(0, 40.0))) == 0.0
+    # pg_last_wal_replay_lsn() is NULL on a server that is not replaying WAL.
+    assert postgres_lag(primary, FakeEngine("primary-copy", row=(None, None))) is None
@@ -0,0 +1,68 @@
+import json
+import uuid
+from pathlib import Path
+
+import pytest
+
+from libs.platform_lib.schemas import (
+    SchemaRegistry,
+    SchemaValidationError,
+    get_registry,
+    load_schema,
+)
+
+CASE_V2 = {
+    "id": str(uuid.uuid4()),
+    "title": "Case",
+    "description": "Desc",
+    "status": "OPEN",
+    "priority": "high",
+    "score": 0.5,
+    "owner_id": str(uuid.uuid4()),
+    "created_at": "2026-10-19T12:00:00",
+}
+
+
+def write_schema(directory: Path, name: str, required: list) -> None:
+    schema = {"type": "object", "required": required, "properties": {}}
+    (directory / f"{name}.json").write_text(json.dumps(schema), encoding="utf-8")
+
+
+def test_registry_resolves_versions(tmp_path: Path) -> None:
+    write_schema(tmp_path, "thing_v1", ["a"])
+    write_schema(tmp_path, "thing_v2", ["a", "b"])
+    registry = SchemaRegistry(tmp_path)
+    assert registry.schema("thing")["required"] == ["a", "b"]
+    assert registry.schema("thing", 1)["required"] == ["a"]
+    assert registry.schema("thing_v1")["required"] == ["a"]
+    registry.validate("thing", {"a": 1}, version=1)
+    with pytest.raises(SchemaValidationError):
+        registry.validate("thing", {"a": 1})
+    with pytest.raises(KeyError):
+        registry.schema("thing", 3)
+
+
+def test_validator_is_compiled_once() -> None:
+    registry = SchemaRegistry()
+    assert registry.validator("case", 2) is registry.validator("case_v2")
+    registry.validate("case", CASE_V2, version=2)
+
+
+def test_validate_batch_reports_failing_indexes() -> None:
+    registry = SchemaRegistry()
+    broken = dict(CASE_V2, priority="URGENT")
+    errors = registry.validate_batch("case", [CASE_V2, broken, CASE_V2], version=2)
+    assert [index for index, _ in errors] == [1]
+    assert errors[0][1].schema == "case"
+
+
+def test_validate_sampled_respects_rate() -> None:
+    registry = SchemaRegistry()
+    broken = dict(CASE_V2, priority="URGENT")
+    assert registry.validate_sampled("case", broken, rate=0, version=2) is False
+    with pytest.raises(SchemaValidationError):
+        registry.validate_sampled("case", broken, rate=1, version=2)
+
+
+def test_load_schema_uses_shared_registry() -> None:
+    assert load_schema("user") is get_registry().schema("user")
@@ -0,0 +1,38 @@
+import uuid
+from types import SimpleNamespace
+from typing import Any, Callable
+
+import httpx
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def scoring(load_service: Callable[..., Any], monkeypatch: pytest.MonkeyPatch) -> Any:
+    module = load_service("scoring-service")
+    # No simulated outages, the shortest simulated latency, and a fresh cache per test.
+    monkeypatch.setattr(module, "random", SimpleNamespace(random=lambda: 0.5, uniform=min))
+    monkeypatch.setattr(module, "score_cache", module.CachedLoader(module.TTLCache(ttl_seconds=60)))
+    monkeypatch.setattr(module.event_producer, "client", fakeredis.FakeAsyncRedis())
+    return module
+
+
+async def stream_lengths(client: Any) -> int:
+    return sum([await client.xlen(stream) for stream in await client.keys("*")])
+
+
+@pytest.mark.asyncio
+async def test_rescoring_an_unchanged_case_emits_one_event(scoring: Any) -> None:
+    case_id = uuid.uuid4()
+    headers = {"X-Internal-Token": "internal-dev-token"}
+    transport = httpx.ASGITransport(app=scoring.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://scoring") as client:
+        first = await client.post(f"/v1/scoring/{case_id}", headers=headers)
+        second = await client.post(f"/v1/scoring/{case_id}", headers=headers)
+        other = await client.post(f"/v1/scoring/{uuid.uuid4()}", headers=headers)
+
+    assert first.status_code == second.status_code == other.status_code == 200
+    assert second.json() == first.json()
+    # One score_updated for each distinct case, none for the repeat.
+    assert await stream_lengths(scoring.event_producer.client) == 2
@@ -0,0 +1,17 @@
+import uuid
+
+from libs.platform_lib.streams import CASE_EVENTS_STREAM, case_event_streams, stream_for_key
+
+
+def test_single_shard_uses_legacy_stream() -> None:
+    assert case_event_streams(1) == [CASE_EVENTS_STREAM]
+    assert stream_for_key(str(uuid.uuid4()), 1) == CASE_EVENTS_STREAM
+
+
+def test_sharded_streams_are_stable_and_spread() -> None:
+    streams = case_event_streams(4)
+    assert len(streams) == 4
+    keys = [str(uuid.uuid4()) for _ in range(200)]
+    assigned = [stream_for_key(key, 4) for key in keys]
+    assert set(assigned) == set(streams)
+    assert assigned == [stream_for_key(key, 4) for key in keys]
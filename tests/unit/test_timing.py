@@ -0,0 +1,151 @@
+import json
+import re
+import time
+from typing import Any, Dict
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from libs.platform_lib import auth
+from libs.platform_lib.profiling import ProfilingMiddleware
+from libs.platform_lib.timing import (
+    OPERATION_DURATION,
+    ServerTimingMiddleware,
+    instrument_engine,
+    merge_server_timing,
+    timed,
+    timed_call,
+)
+
+jose = pytest.importorskip("jose")
+
+
+def metrics(header: str) -> Dict[str, str]:
+    entries = [metric.strip() for metric in header.split(",")]
+    return {metric.split(";", 1)[0]: metric for metric in entries}
+
+
+def observations(operation: str) -> float:
+    for metric in OPERATION_DURATION.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count") and sample.labels["operation"] == operation:
+                return sample.value
+    return 0.0
+
+
+@timed_call("test_async")
+async def slow_async() -> int:
+    return 1
+
+
+@timed_call("test_sync")
+def slow_sync() -> int:
+    time.sleep(0.002)
+    return 2
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, service_name="test-service")
+    app.add_middleware(ServerTimingMiddleware, enabled=True)
+
+    @app.get("/sync")
+    def sync_route() -> Dict[str, Any]:
+        # Runs in the threadpool; timings must still reach the request's header.
+        for _ in range(2):
+            with timed("test_db"):
+                time.sleep(0.001)
+        return {"value": slow_sync()}
+
+    @app.get("/async")
+    async def async_route() -> Dict[str, Any]:
+        merge_server_timing('db;dur=1.50, total;dur=4.00;desc="x"', "case-service")
+        return {"value": await slow_async()}
+
+    return app
+
+
+def test_server_timing_header_collects_operations() -> None:
+    before = observations("test_db")
+    client = TestClient(make_app())
+
+    timings = metrics(client.get("/sync").headers["server-timing"])
+
+    assert re.fullmatch(r'test_db;dur=\d+\.\d{2};desc="2 calls"', timings["test_db"])
+    assert float(timings["test_sync"].split("dur=")[1]) >= 2
+    assert "total" in timings
+    assert observations("test_db") == before + 2
+
+
+def test_server_timing_merges_upstream_with_prefix() -> None:
+    response = TestClient(make_app()).get("/async")
+
+    timings = metrics(response.headers["server-timing"])
+    assert timings["case-service.db"] == "case-service.db;dur=1.50"
+    assert timings["case-service.total"] == 'case-service.total;dur=4.00;desc="x"'
+    assert "test_async" in timings and "total" in timings
+
+
+def test_server_timing_is_off_by_default() -> None:
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+    app.get("/")(lambda: {})
+
+    assert "server-timing" not in TestClient(app).get("/").headers
+
+
+def test_timing_outside_a_request_only_feeds_histogram() -> None:
+    before = observations("test_sync")
+    assert slow_sync() == 2
+    merge_server_timing("db;dur=1", "ignored")
+    assert observations("test_sync") == before + 1
+
+
+def test_instrument_engine_times_statements() -> None:
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    engine = sqlalchemy.create_engine("sqlite://")
+    instrument_engine(engine)
+    before = observations("db")
+    with engine.connect() as connection:
+        connection.execute(sqlalchemy.text("select 1"))
+    assert observations("db") == before + 1
+
+
+def bearer(role: str) -> Dict[str, str]:
+    token = jose.jwt.encode({"sub": "u", "role": role}, "test-secret", algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def jwt_secret(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(auth, "JWT_SECRET", "test-secret")
+    monkeypatch.setattr(auth, "JWT_ACCEPT_SHARED_SECRET", True)
+
+
+@pytest.mark.usefixtures("jwt_secret")
+def test_admin_profile_returns_flame_graph() -> None:
+    pytest.importorskip("pyinstrument")
+    client = TestClient(make_app())
+
+    response = client.get("/sync", headers={**bearer("admin"), "X-Profile": "test-service"})
+
+    assert response.status_code == 200
+    assert response.headers["x-profiled-status"] == "200"
+    assert "test-service.speedscope.json" in response.headers["content-disposition"]
+    assert "server-timing" in response.headers
+    profile = json.loads(response.content)
+    assert profile["$schema"].startswith("https://www.speedscope.app/")
+
+
+@pytest.mark.usefixtures("jwt_secret")
+def test_profile_header_ignored_for_other_services_and_non_admins() -> None:
+    client = TestClient(make_app())
+
+    other = client.get("/sync", headers={**bearer("admin"), "X-Profile": "gateway"})
+    analyst = client.get("/sync", headers={**bearer("analyst"), "X-Profile": "test-service"})
+    anonymous = client.get("/sync", headers={"X-Profile": "test-service"})
+
+    for response in (other, analyst, anonymous):
+        assert response.json() == {"value": 2}
+        assert "x-profiled-status" not in response.headers
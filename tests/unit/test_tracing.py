@@ -0,0 +1,145 @@
+import threading
+from typing import Sequence, Tuple
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ALWAYS_ON, Decision
+from opentelemetry.trace import NonRecordingSpan, SpanContext, Status, StatusCode, TraceFlags
+from prometheus_client import REGISTRY
+
+from libs.platform_lib.tracing import (
+    CountingSpanExporter,
+    QueueDepth,
+    RateLimitedSampler,
+    TailKeepSpanProcessor,
+    build_sampler,
+    build_tracer_provider,
+)
+
+MS = 1_000_000
+
+
+def tail_provider(ratio: float, slow_ms: float = 50) -> Tuple[TracerProvider, InMemorySpanExporter]:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(sampler=build_sampler(ratio, 0, True))
+    provider.add_span_processor(
+        TailKeepSpanProcessor(BatchSpanProcessor(CountingSpanExporter(exporter)), slow_ms=slow_ms)
+    )
+    return provider, exporter
+
+
+def exported_names(provider: TracerProvider, exporter: InMemorySpanExporter) -> list:
+    provider.force_flush()
+    return sorted(span.name for span in exporter.get_finished_spans())
+
+
+def test_provider_exports_sampled_spans() -> None:
+    exporter = InMemorySpanExporter()
+    provider = build_tracer_provider("test-service", exporter, sampler=ALWAYS_ON)
+    with provider.get_tracer("test").start_as_current_span("request"):
+        pass
+    provider.force_flush()
+    (span,) = exporter.get_finished_spans()
+    assert span.resource.attributes["service.name"] == "test-service"
+
+
+def test_unsampled_fast_requests_are_dropped() -> None:
+    provider, exporter = tail_provider(ratio=0.0)
+    tracer = provider.get_tracer("test")
+    with tracer.start_as_current_span("request") as span:
+        assert span.is_recording()
+        assert not span.get_span_context().trace_flags.sampled
+        with tracer.start_as_current_span("query"):
+            pass
+    assert exported_names(provider, exporter) == []
+
+
+def test_unsampled_errors_export_the_whole_local_trace() -> None:
+    provider, exporter = tail_provider(ratio=0.0)
+    tracer = provider.get_tracer("test")
+    with tracer.start_as_current_span("request"):
+        with tracer.start_as_current_span("query") as child:
+            child.set_status(Status(StatusCode.ERROR))
+    assert exported_names(provider, exporter) == ["query", "request"]
+    assert all(s.context.trace_flags.sampled for s in exporter.get_finished_spans())
+
+
+def test_unsampled_slow_requests_are_kept_under_remote_parent() -> None:
+    provider, exporter = tail_provider(ratio=1.0, slow_ms=50)
+    parent = SpanContext(0xABC, 0xDEF, is_remote=True, trace_flags=TraceFlags(0))
+    context = trace.set_span_in_context(NonRecordingSpan(parent))
+    tracer = provider.get_tracer("test")
+    fast = tracer.start_span("fast", context=context, start_time=0)
+    fast.end(end_time=10 * MS)
+    slow = tracer.start_span("slow", context=context, start_time=0)
+    slow.end(end_time=60 * MS)
+    assert exported_names(provider, exporter) == ["slow"]
+
+
+def test_rate_limited_sampler_caps_new_traces() -> None:
+    now = [0.0]
+    sampler = RateLimitedSampler(ALWAYS_ON, per_second=2, clock=lambda: now[0])
+    decisions = [sampler.should_sample(None, i, "span").decision for i in range(3)]
+    assert decisions == [Decision.RECORD_AND_SAMPLE, Decision.RECORD_AND_SAMPLE, Decision.DROP]
+    now[0] = 0.5
+    assert sampler.should_sample(None, 4, "span").decision is Decision.RECORD_AND_SAMPLE
+
+
+class FailingExporter(SpanExporter):
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        return SpanExportResult.FAILURE
+
+
+class BlockingExporter(SpanExporter):
+    def __init__(self) -> None:
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        self.entered.set()
+        self.release.wait(5)
+        return SpanExportResult.SUCCESS
+
+
+def dropped(reason: str) -> float:
+    return REGISTRY.get_sample_value("otel_spans_dropped_total", {"reason": reason}) or 0.0
+
+
+def test_failed_exports_are_counted() -> None:
+    before = dropped("export_failed")
+    provider = TracerProvider(sampler=ALWAYS_ON)
+    provider.add_span_processor(
+        TailKeepSpanProcessor(BatchSpanProcessor(CountingSpanExporter(FailingExporter())))
+    )
+    for name in ("a", "b"):
+        provider.get_tracer("test").start_span(name).end()
+    provider.force_flush()
+    assert dropped("export_failed") - before == 2
+
+
+def test_queue_overflow_is_counted() -> None:
+    before = dropped("queue_full")
+    exporter = BlockingExporter()
+    depth = QueueDepth(2)
+    processor = BatchSpanProcessor(
+        CountingSpanExporter(exporter, depth), max_queue_size=2, max_export_batch_size=1
+    )
+    provider = TracerProvider(sampler=ALWAYS_ON)
+    provider.add_span_processor(TailKeepSpanProcessor(processor, depth))
+    tracer = provider.get_tracer("test")
+    tracer.start_span("a").end()
+    assert exporter.entered.wait(5)
+    # The worker is stuck exporting "a": b and c fill the queue and d overflows it.
+    for name in ("b", "c", "d"):
+        tracer.start_span(name).end()
+    exporter.release.set()
+    provider.shutdown()
+    assert dropped("queue_full") - before == 1
+
+
+def test_unsampled_spans_are_not_recorded_by_default() -> None:
+    provider = TracerProvider(sampler=build_sampler(0.0, 0))
+    with provider.get_tracer("test").start_as_current_span("request") as span:
+        assert not span.is_recording()
@@ -0,0 +1,92 @@
+import uuid
+from typing import Any, Callable, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from sqlmodel import Session
+
+
+@pytest.fixture
+def users(load_service: Callable[..., Any]) -> Any:
+    return load_service("user-service")
+
+
+@pytest.fixture
+def user_ids(users: Any) -> List[uuid.UUID]:
+    with Session(users.engine) as session:
+        session.execute(delete(users.User))
+        created = [
+            users.User(email=f"user{i}@example.com", role="analyst", full_name=f"User {i}")
+            for i in range(3)
+        ]
+        session.add_all(created)
+        session.commit()
+        return [user.id for user in created]
+
+
+@pytest.fixture
+def client(users: Any) -> TestClient:
+    return TestClient(users.app)
+
+
+def test_by_email(
+    client: TestClient, user_ids: List[uuid.UUID], bearer: Callable[..., Dict[str, str]]
+) -> None:
+    response = client.get(
+        "/v1/users/by-email", params={"email": "user1@example.com"}, headers=bearer()
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == str(user_ids[1])
+    assert response.headers["ETag"]
+
+    missing = client.get(
+        "/v1/users/by-email", params={"email": "nobody@example.com"}, headers=bearer()
+    )
+    assert missing.status_code == 404
+    viewer = client.get(
+        "/v1/users/by-email", params={"email": "user1@example.com"}, headers=bearer("viewer")
+    )
+    assert viewer.status_code == 403
+
+
+def test_batch_lookup_keeps_request_order_and_omits_unknown_ids(
+    client: TestClient, user_ids: List[uuid.UUID], bearer: Callable[..., Dict[str, str]]
+) -> None:
+    ids = [str(user_ids[2]), str(uuid.uuid4()), str(user_ids[0]), str(user_ids[2])]
+
+    posted = client.post("/v1/users/lookup", json={"ids": ids}, headers=bearer())
+    by_query = client.get(
+        "/v1/users", params={"ids": [",".join(ids[:2]), ",".join(ids[2:])]}, headers=bearer()
+    )
+
+    expected = [str(user_ids[2]), str(user_ids[0])]
+    assert [user["id"] for user in posted.json()] == expected
+    assert [user["id"] for user in by_query.json()] == expected
+
+
+def test_batch_lookup_limits(
+    client: TestClient, users: Any, bearer: Callable[..., Dict[str, str]]
+) -> None:
+    too_many = ",".join(str(uuid.uuid4()) for _ in range(users.USER_LOOKUP_MAX_IDS_GET + 1))
+    response = client.get("/v1/users", params={"ids": too_many}, headers=bearer())
+    assert response.status_code == 400
+    assert "POST /v1/users/lookup" in response.json()["detail"]
+
+    invalid = client.get("/v1/users", params={"ids": "not-a-uuid"}, headers=bearer())
+    assert invalid.status_code == 400
+    oversized = {"ids": [str(uuid.uuid4())] * (users.USER_LOOKUP_MAX_IDS + 1)}
+    assert client.post("/v1/users/lookup", json=oversized, headers=bearer()).status_code == 422
+    assert client.post("/v1/users/lookup", json={"ids": []}, headers=bearer()).json() == []
+
+
+def test_listing_pages_with_a_cursor(
+    client: TestClient, user_ids: List[uuid.UUID], bearer: Callable[..., Dict[str, str]]
+) -> None:
+    first = client.get("/v1/users", params={"limit": 2}, headers=bearer())
+    assert len(first.json()) == 2
+    cursor = first.headers["X-Next-Cursor"]
+    rest = client.get("/v1/users", params={"limit": 2, "cursor": cursor}, headers=bearer())
+    assert "X-Next-Cursor" not in rest.headers
+    listed = [user["id"] for user in first.json() + rest.json()]
+    assert sorted(listed) == sorted(str(user_id) for user_id in user_ids)